@@ -0,0 +1,71 @@
+# benchmarks/bench_graph.py
+"""
+Synthetic benchmark for graph.build_identity_graph.
+
+Generates signal lists shaped like a large GitHub account (mostly
+follower/following usernames plus repos and contribution data) and
+reports build time per signal. Linear scaling shows up as a flat
+microseconds-per-signal column.
+
+    python benchmarks/bench_graph.py --sizes 10000 100000 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from git_identity_leak.graph import build_identity_graph
+
+
+def synthetic_signals(n, seed=0):
+    rng = random.Random(seed)
+    collected_at = "2026-01-01T00:00:00Z"
+    signals = []
+
+    def add(stype, value, **extra):
+        signals.append({"signal_type": stype, "value": value, "confidence": "HIGH",
+                        "source": "GitHub REST", "collected_at": collected_at, **extra})
+
+    add("USERNAME", "target")
+    add("NAME", "Target User")
+    add("EMAIL", "target@example.com")
+    add("CONTRIBUTION_TOTAL", "1234")
+    add("CONTRIBUTION_TIME_PATTERN", "Weekdays: 1000, Weekends: 234")
+    for year in range(2015, 2027):
+        add("CONTRIBUTIONS_YEAR", str(year), meta={"year": str(year), "count": rng.randrange(500)})
+    add("CONTRIBUTIONS_YEARLY_DATES", [{"date": f"2025-{m:02d}-{d:02d}", "count": rng.randrange(10)}
+                                       for m in range(1, 13) for d in range(1, 29)])
+    for i in range(max(1, n // 100)):
+        add("REPO_SUMMARY", f"repo{i} | Stars: {i} | demo | Lang: Python | Last Updated: 2025-01-01 | Inactivity: LOW | README: -")
+        add("INACTIVITY_SCORE", f"repo{i}: LOW")
+    social = ("FOLLOWER_USERNAME", "FOLLOWING_USERNAME", "MUTUAL_CONNECTION")
+    i = 0
+    while len(signals) < n:
+        add(social[i % 3], f"user{i}")
+        i += 1
+    return signals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark build_identity_graph")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'signals':>10} {'best (s)':>10} {'us/signal':>10} {'nodes':>10} {'edges':>10}")
+    for n in args.sizes:
+        signals = synthetic_signals(n)
+        best = None
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            G = build_identity_graph(signals)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        print(f"{n:>10} {best:>10.3f} {best / n * 1e6:>10.2f} {G.number_of_nodes():>10} {G.number_of_edges():>10}")
+
+
+if __name__ == "__main__":
+    main()
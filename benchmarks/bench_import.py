@@ -0,0 +1,61 @@
+# benchmarks/bench_import.py
+"""
+Import-time check for the CLI.
+
+Times `import <module>` in fresh interpreters (so nothing is already in
+sys.modules) and exits with status 1 when the best run exceeds the
+budget, which makes it usable as a regression check in CI. Modules that
+must stay lazy (plotting, networkx, numpy) are reported if the import
+pulled them in.
+
+    python benchmarks/bench_import.py --budget 0.5
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+# Only needed for plots, images, graph outputs, stylometry and network calls; importing them at startup is a regression
+HEAVY_MODULES = ("matplotlib", "seaborn", "numpy", "networkx", "svgwrite", "imageio", "PIL", "bs4", "requests")
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(elapsed, ",".join(heavy))
+"""
+
+
+def time_import(module):
+    """Seconds to import module in a new interpreter, and the heavy modules it loaded."""
+    code = PROBE.format(module=module, heavy=HEAVY_MODULES)
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout.split()
+    return float(out[0]), (out[1].split(",") if len(out) > 1 else [])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CLI import time")
+    parser.add_argument("--module", default="git_identity_leak.cli")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=0.5, help="Fail when the best import takes longer (seconds)")
+    args = parser.parse_args()
+
+    runs = [time_import(args.module) for _ in range(args.repeat)]
+    best = min(t for t, _ in runs)
+    heavy = sorted({m for _, loaded in runs for m in loaded})
+    print(f"{args.module}: best {best:.3f}s of {args.repeat}, budget {args.budget:.3f}s")
+    if heavy:
+        print(f"[!] Imported at startup: {', '.join(heavy)}")
+    if best > args.budget or heavy:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
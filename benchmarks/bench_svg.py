@@ -0,0 +1,74 @@
+# benchmarks/bench_svg.py
+"""
+Benchmark for the contribution calendar SVG renderer.
+
+Renders synthetic one-year calendars with visuals.github_svg.render_batch
+and, for comparison, with one svgwrite element per cell (the previous
+approach in cli.plot_contributions_heatmap). Reports calendars per
+second; --out-dir also measures writing the files (.svgz with --svgz).
+
+    python benchmarks/bench_svg.py --calendars 5000 --svgz --out-dir /tmp/svg
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from git_identity_leak.contributions import ContributionCalendar
+from git_identity_leak.visuals.github_svg import COLORS, render_batch
+
+
+def synthetic_calendars(n, days=365, seed=0):
+    rng = random.Random(seed)
+    start = date(2025, 1, 1)
+    dates = [(start + timedelta(i)).isoformat() for i in range(days)]
+    for i in range(n):
+        yield f"user{i}", [{"date": d, "count": rng.choice((0, 0, 0, 1, 2, 4, 7, 12, 25))} for d in dates]
+
+
+def render_svgwrite(days):
+    import svgwrite
+
+    grid, _ = ContributionCalendar.from_days(days).heatmap_grid()
+    dwg = svgwrite.Drawing(size=(grid.shape[1] * 15, 7 * 15 + 20), profile="tiny")
+    for week in range(grid.shape[1]):
+        for day in range(7):
+            dwg.add(dwg.rect(insert=(week * 15, day * 15), size=(13, 13), fill=COLORS[min(int(grid[day, week]), 4)]))
+    return dwg.tostring()
+
+
+def timed(label, n, fn):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:>8.3f}s {n / elapsed:>10.0f} calendars/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark contribution calendar SVG rendering")
+    parser.add_argument("--calendars", type=int, default=2000)
+    parser.add_argument("--out-dir", help="Also write the files here (default: a temporary directory)")
+    parser.add_argument("--svgz", action="store_true", help="Write gzip-compressed .svgz files")
+    parser.add_argument("--svgwrite", type=int, default=200, help="Calendars rendered with svgwrite (0 to skip)")
+    args = parser.parse_args()
+
+    n = args.calendars
+    # Parsing the day lists is shared by every renderer, so it is done up front
+    calendars = [(name, ContributionCalendar.from_days(days)) for name, days in synthetic_calendars(n)]
+
+    timed("render_svg (string)", n, lambda: list(render_batch(calendars)))
+    out_dir = args.out_dir or tempfile.mkdtemp(prefix="bench_svg_")
+    timed(f"render + write {'.svgz' if args.svgz else '.svg'}", n,
+          lambda: list(render_batch(calendars, out_dir=out_dir, compress=args.svgz)))
+    if args.svgwrite:
+        raw = list(synthetic_calendars(args.svgwrite))
+        timed("svgwrite, one rect per cell", args.svgwrite, lambda: [render_svgwrite(days) for _, days in raw])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,14 @@
 # git_identity_leak/analysis.py
 import datetime
-from .plugins import load_plugins
-from .images import fetch_images_from_urls
+from concurrent.futures import ThreadPoolExecutor
+from .plugins import load_plugins, run_plugins, PLUGIN_TIMEOUT, GLOBAL_TIMEOUT
 
-def full_analysis(username, image_dir=None, include_temporal=False, include_stylometry=False):
+DEFAULT_PLUGINS = ["github", "reddit", "x", "linkedin"]
+
+def full_analysis(username, image_dir=None, include_temporal=False, include_stylometry=False,
+                  plugin_timeout=PLUGIN_TIMEOUT, global_timeout=GLOBAL_TIMEOUT, plugin_options=None,
+                  phash_index=None, sink=None, signal_store=None, reuse_scanner=None, variant_budget=0,
+                  plugin_names=None, style_index=None, style_similarity=None, plugin_signals=None):
     """
     Perform full OSINT analysis on a username.
 
@@ -12,34 +17,118 @@ def full_analysis(username, image_dir=None, include_temporal=False, include_styl
         image_dir (str, optional): Directory to store downloaded images.
         include_temporal (bool): Whether to include temporal analysis.
         include_stylometry (bool): Whether to include stylometry analysis.
+        plugin_timeout (float): Per-plugin collection deadline in seconds.
+        global_timeout (float): Deadline for all plugins together in seconds.
+        plugin_options (dict, optional): Plugin name -> keyword arguments for its collect(),
+            e.g. {"github": {"max_repos": 200, "fetch_readmes": True}}.
+        phash_index (PerceptualIndex, optional): Index of earlier audits' images used to
+            find visually similar avatars; this user's images are added to it.
+        sink (ReportWriter, optional): Receives signals as they are collected,
+            so a streaming report is written while plugins are still running.
+        signal_store (SignalStore, optional): The signals are stored here, replacing
+            the username's earlier ones, for cross-account lookups.
+        reuse_scanner (ReuseScanner, optional): Checks the username across its site
+            catalog while the plugins run; accounts found become USERNAME_REUSE signals.
+        variant_budget (int): With reuse_scanner, also probe up to this many
+            (site, handle) pairs for variants built from the collected signals.
+        plugin_names (list[str], optional): Plugins to run, defaults to DEFAULT_PLUGINS;
+            see plugins.available_plugins().
+        style_index (StyleIndex, optional): Style vectors of earlier audits' posts used
+            to find accounts that write alike; this user's vector is added to it.
+        style_similarity (float, optional): Cosine similarity for a SIMILAR_WRITING
+            match, defaults to stylometry.MATCH_SIMILARITY.
+        plugin_signals (dict, optional): Filled with plugin name -> signals for every
+            plugin that finished cleanly; see plugins.run_plugins.
 
     Returns:
-        signals (list[dict]): List of signals found.
+        signals (SignalBatch): Signals found; iterating yields dict-like records.
         temporal_data (dict): Temporal analysis results.
         stylometry_data (dict): Stylometry analysis results.
     """
-    signals = []
+    # Username reuse scan runs alongside the plugins
+    reuse_executor = reuse_future = None
+    if reuse_scanner is not None:
+        reuse_executor = ThreadPoolExecutor(max_workers=1)
+        reuse_future = reuse_executor.submit(reuse_scanner.check, username)
+
+    # Public posts for stylometry are fetched alongside the plugins too
+    posts_executor = posts_future = None
+    if include_stylometry or style_index is not None:
+        from .posts import analyze_posts
+        posts_executor = ThreadPoolExecutor(max_workers=1)
+        posts_future = posts_executor.submit(analyze_posts, username)
 
-    # Load all available plugins
-    plugins = load_plugins(["github", "reddit", "x", "linkedin"])
-    for plugin in plugins:
+    # Load all available plugins and collect from them concurrently
+    plugins = load_plugins(plugin_names or DEFAULT_PLUGINS)
+    signals = run_plugins(plugins, username, plugin_timeout=plugin_timeout, global_timeout=global_timeout,
+                          plugin_options=plugin_options,
+                          on_result=sink.write_signals if sink else None, plugin_signals=plugin_signals)
+
+    if reuse_future is not None:
+        from .reuse import reuse_signals
         try:
-            plugin_signals = plugin.collect(username)
-            if plugin_signals:
-                signals.extend(plugin_signals)
+            results = reuse_future.result()
+            if variant_budget:
+                from .variants import probe_variants
+                results += probe_variants(reuse_scanner, signals, variant_budget, exclude=[username])
+            found = reuse_signals(results, datetime.datetime.utcnow().isoformat() + "Z")
+            signals.extend(found)
+            if sink:
+                sink.write_signals(found)
         except Exception as e:
-            print(f"[!] Error collecting from plugin {plugin.__name__}: {e}")
+            print(f"[!] Error checking username reuse: {e}")
+        finally:
+            reuse_executor.shutdown()
 
     # Extract IMAGE URLs for fetching
     image_urls = [s["value"] for s in signals if s.get("signal_type") == "IMAGE"]
 
     # Fetch images and save locally
     if image_dir and image_urls:
+        from .images import fetch_images_from_urls
         try:
             image_signals = fetch_images_from_urls(image_urls, image_dir)
-            signals.extend(image_signals)
         except Exception as e:
             print(f"[!] Error fetching images: {e}")
+            image_signals = []
+
+        # Perceptual hashes for near-duplicate matching across audits
+        similar = []
+        if image_signals:
+            try:
+                from .perceptual import annotate_image_signals
+                similar = annotate_image_signals(image_signals, username, phash_index)
+            except Exception as e:
+                print(f"[!] Error hashing images: {e}")
+        signals.extend(image_signals)
+        signals.extend(similar)
+        if sink:
+            sink.write_signals(image_signals + similar)
+
+    # Stylometry of the collected posts, matched against earlier audits
+    stylometry_data = {}
+    if posts_future is not None:
+        try:
+            from .stylometry import analyze_stylometry, match_styles
+            posts = posts_future.result()
+            if include_stylometry:
+                stylometry_data = analyze_stylometry(posts)
+            if style_index is not None:
+                similar = match_styles(username, posts, style_index, datetime.datetime.utcnow().isoformat() + "Z",
+                                       style_similarity)
+                signals.extend(similar)
+                if sink:
+                    sink.write_signals(similar)
+        except Exception as e:
+            print(f"[!] Error analyzing posts: {e}")
+        finally:
+            posts_executor.shutdown()
+
+    if signal_store is not None:
+        try:
+            signal_store.add_signals(username, signals)
+        except Exception as e:
+            print(f"[!] Error storing signals: {e}")
 
     # Temporal analysis (placeholder)
     temporal_data = {}
@@ -51,12 +140,56 @@ def full_analysis(username, image_dir=None, include_temporal=False, include_styl
             "duration_days": 0
         }
 
-    # Stylometry analysis (placeholder)
-    stylometry_data = {}
-    if include_stylometry:
-        stylometry_data = {
-            "top_words": [],
-            "note": "Experimental; do not rely solely on this for identity."
-        }
-
     return signals, temporal_data, stylometry_data
+
+
+def incremental_analysis(username, store, plugin_options=None, **analysis_kwargs):
+    """
+    Re-audit a username against its last snapshot, fetching only what can
+    have changed since then.
+
+    Plugins that keep incremental state (currently GitHub) receive a copy
+    of it as the "state" option and update it in place; it is saved back
+    only when the plugin finished cleanly, since a timed-out plugin thread
+    may still be writing to it. A plugin that timed out or raised keeps its
+    signals from the last snapshot, so its failure shows up as neither
+    removed nor (on the next good run) added signals.
+
+    Args:
+        username (str): Target username.
+        store (SnapshotStore): Snapshot store holding earlier runs.
+        plugin_options (dict, optional): As for full_analysis.
+        **analysis_kwargs: Passed on to full_analysis.
+
+    Returns:
+        signals (SignalBatch): Full, current signal set.
+        temporal_data (dict): Temporal analysis results.
+        stylometry_data (dict): Stylometry analysis results.
+        delta (dict): {"added": [...], "removed": [...]} compared with the last
+            snapshot; every signal counts as added on the first run.
+    """
+    from .plugins import FAILURE_SIGNAL_TYPES, failed_plugins
+    from .snapshots import diff_signals
+
+    github_state = dict(store.load(username, "github") or {})
+    options = {name: dict(opts) for name, opts in (plugin_options or {}).items()}
+    options.setdefault("github", {})["state"] = github_state
+
+    previous = store.load_signals(username)
+    plugin_signals = {}
+    signals, temporal_data, stylometry_data = full_analysis(username, plugin_options=options,
+                                                            plugin_signals=plugin_signals, **analysis_kwargs)
+
+    # Only plugins in plugin_signals finished; failed ones keep their last snapshot's signals
+    github_finished = "github" in plugin_signals
+    current = [s for s in signals if s["signal_type"] not in FAILURE_SIGNAL_TYPES]
+    for name, kept in store.load_plugin_signals(username, failed_plugins(signals)).items():
+        current += kept
+        plugin_signals[name] = kept
+    delta = diff_signals(previous, current)
+
+    if github_finished and github_state:
+        store.save(username, "github", github_state)
+    store.save_signals(username, current, collected_at=datetime.datetime.utcnow().isoformat() + "Z",
+                       plugin_signals=plugin_signals)
+    return signals, temporal_data, stylometry_data, delta
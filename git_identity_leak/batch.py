@@ -0,0 +1,182 @@
+# git_identity_leak/batch.py
+import json
+import os
+import sys
+import threading
+from contextlib import nullcontext, redirect_stdout
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+
+from .analysis import full_analysis, incremental_analysis, DEFAULT_PLUGINS
+from .plugins import failed_plugins, load_plugins, prefetch_plugins
+from .report import dumps_line
+
+DEFAULT_WORKERS = 4
+PREFETCH_CHUNK = 10     # targets handed to plugin prefetch hooks at once
+INDEX_SAVE_EVERY = 25   # audits written between saves of cross-audit indexes
+
+
+def read_usernames(path):
+    """
+    Yield usernames from a file (one per line), or from stdin when path is "-".
+    Blank lines and lines starting with "#" are ignored.
+    """
+    f = sys.stdin if path == "-" else open(path, "r", encoding="utf-8")
+    try:
+        for line in f:
+            name = line.strip()
+            if name and not name.startswith("#"):
+                yield name
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def load_checkpoint(path):
+    """
+    Return the usernames already written to an NDJSON output file.
+
+    Users whose record is an error, or is "incomplete" because some plugins
+    timed out or failed, are left out, so a resumed run retries them; the
+    retry's record is appended after the earlier line. A partially
+    written last line (from a crash mid-write) is cut off so appending can
+    continue cleanly.
+    """
+    done = set()
+    if not path or not os.path.exists(path):
+        return done
+
+    with open(path, "rb+") as f:
+        good_end = 0
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(line)
+                if "error" not in record and "incomplete" not in record:
+                    done.add(record["username"])
+            except (ValueError, KeyError, TypeError):
+                break
+            good_end += len(line)
+        f.truncate(good_end)
+    return done
+
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _audit(username, analysis_kwargs, snapshots=None, svg_dir=None, svg_compress=False):
+    try:
+        if snapshots is not None:
+            signals, temporal_data, stylometry_data, delta = incremental_analysis(username, snapshots, **analysis_kwargs)
+        else:
+            signals, temporal_data, stylometry_data = full_analysis(username, **analysis_kwargs)
+            delta = None
+        record = {
+            "username": username,
+            "signals": [dict(s) for s in signals],
+            "temporal_data": temporal_data,
+            "stylometry_data": stylometry_data,
+        }
+        if delta is not None:
+            record["delta"] = delta
+        failed = failed_plugins(signals)
+        if failed:
+            record["incomplete"] = failed
+        if svg_dir:
+            from .visuals.github_svg import save_calendar_svg
+            save_calendar_svg(username, signals, svg_dir, compress=svg_compress)
+        return record
+    except Exception as e:
+        return {"username": username, "error": str(e)}
+
+
+def run_batch(usernames, output=None, workers=DEFAULT_WORKERS, resume=True, snapshots=None,
+              svg_dir=None, svg_compress=False, **analysis_kwargs):
+    """
+    Audit many usernames in one process with bounded concurrency.
+
+    One JSON line per user is written to output as soon as that audit
+    finishes. When output is a file it doubles as the checkpoint: with
+    resume=True, usernames already audited successfully are skipped.
+    Without an output file the records go to stdout, and everything else
+    printed during the batch goes to stderr so the stream stays parseable.
+    Cross-audit indexes in analysis_kwargs (phash_index, style_index) are
+    saved every INDEX_SAVE_EVERY audits and when the batch ends or is
+    interrupted, so checkpointed users are not missing from them after a
+    resume.
+
+    Args:
+        usernames (iterable[str]): Target usernames.
+        output (str, optional): NDJSON output path, stdout if omitted.
+        workers (int): Number of audits running at the same time.
+        resume (bool): Skip usernames already audited successfully in output.
+        snapshots (SnapshotStore, optional): Re-audit incrementally against earlier
+            snapshots; each record then also carries a "delta".
+        svg_dir (str, optional): Save each account's contribution calendar as
+            svg_dir/<username>.svg.
+        svg_compress (bool): Write .svgz files instead.
+        **analysis_kwargs: Passed on to full_analysis.
+
+    Returns:
+        int: Number of audits written in this run.
+    """
+    done = load_checkpoint(output) if resume else set()
+    out = open(output, "ab" if resume else "wb") if output else sys.stdout.buffer
+    write_lock = threading.Lock()
+    written = 0
+    indexes = [i for i in (analysis_kwargs.get("phash_index"), analysis_kwargs.get("style_index")) if i is not None]
+
+    def save_indexes():
+        for index in indexes:
+            index.save()
+
+    def write(record):
+        nonlocal written
+        line = dumps_line(record)
+        with write_lock:
+            out.write(line)
+            out.flush()
+            if out is not sys.stdout.buffer:
+                os.fsync(out.fileno())
+        written += 1
+        if written % INDEX_SAVE_EVERY == 0:
+            save_indexes()
+
+    # Diagnostics from plugins and analysis are printed; keep them out of NDJSON on stdout
+    diagnostics = redirect_stdout(sys.stderr) if out is sys.stdout.buffer else nullcontext()
+
+    try:
+        with diagnostics, ThreadPoolExecutor(max_workers=workers, thread_name_prefix="audit") as executor:
+            plugins = load_plugins(analysis_kwargs.get("plugin_names") or DEFAULT_PLUGINS)
+            pending = set()
+            for chunk in _chunks((u for u in usernames if u not in done), PREFETCH_CHUNK):
+                chunk = [u for u in dict.fromkeys(chunk) if u not in done]
+                done.update(chunk)
+                # e.g. one aliased GitHub GraphQL query for the whole chunk
+                prefetch_plugins(plugins, chunk)
+                for username in chunk:
+                    # Keep a bounded window in flight so huge rosters are streamed, not queued
+                    if len(pending) >= workers * 2:
+                        finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for f in finished:
+                            write(f.result())
+                    pending.add(executor.submit(_audit, username, analysis_kwargs, snapshots, svg_dir, svg_compress))
+
+            for f in as_completed(pending):
+                write(f.result())
+    finally:
+        try:
+            save_indexes()
+        finally:
+            if out is not sys.stdout.buffer:
+                out.close()
+
+    return written
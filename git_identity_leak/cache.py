@@ -0,0 +1,179 @@
+# git_identity_leak/cache.py
+"""
+Disk-backed HTTP response cache with ETag / Last-Modified revalidation.
+
+Cached GET responses are revalidated with If-None-Match / If-Modified-Since
+on later runs. GitHub answers unchanged resources with 304 Not Modified,
+which does not count against the rate limit, and the stored body is
+returned in its place.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+    "git-identity-leak",
+)
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+MAX_CACHE_AGE = 30 * 24 * 3600          # seconds
+CACHEABLE_HOSTS = ("api.github.com",)
+EVICT_EVERY = 200                       # stores between eviction passes
+
+# Headers that describe the wire encoding of the original body, not the body itself
+_DROP_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+
+class HTTPCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=MAX_CACHE_BYTES, max_age=MAX_CACHE_AGE,
+                 hosts=CACHEABLE_HOSTS):
+        self.cache_dir = cache_dir
+        self.root = os.path.join(cache_dir, "http")
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hosts = tuple(hosts)
+        self._stores = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+        self.evict()
+
+    def cacheable(self, method, url, kwargs):
+        return (
+            method.upper() == "GET"
+            and not kwargs.get("stream")
+            and urlparse(url).hostname in self.hosts
+        )
+
+    def key(self, url, headers, authenticated=False):
+        from requests.structures import CaseInsensitiveDict
+
+        headers = CaseInsensitiveDict(headers or {})
+        # Responses differ between anonymous and authenticated requests, but
+        # not between tokens, so only whether a token is sent is part of the key
+        authenticated = authenticated or bool(headers.get("Authorization"))
+        parts = [url, headers.get("Accept", ""), "auth" if authenticated else "anon"]
+        return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+    def _paths(self, key):
+        base = os.path.join(self.root, key[:2], key)
+        return base + ".json", base + ".body"
+
+    def lookup(self, key):
+        meta_path, body_path = self._paths(key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - meta.get("stored_at", 0) > self.max_age or not os.path.exists(body_path):
+            return None
+        return meta
+
+    def conditional_headers(self, meta):
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def store(self, key, resp):
+        """Store a 200 response if it carries a validator."""
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        if resp.status_code != 200 or not (etag or last_modified):
+            return
+
+        meta_path, body_path = self._paths(key)
+        meta = {
+            "url": resp.url,
+            "status": resp.status_code,
+            "etag": etag,
+            "last_modified": last_modified,
+            "encoding": resp.encoding,
+            "headers": {k: v for k, v in resp.headers.items() if k.lower() not in _DROP_HEADERS},
+            "stored_at": time.time(),
+        }
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        _atomic_write(body_path, resp.content)
+        _atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+
+        with self._lock:
+            self._stores += 1
+            evict = self._stores % EVICT_EVERY == 0
+        if evict:
+            self.evict()
+
+    def revalidated(self, key, meta, resp):
+        """Build a 200 response from the cached body after a 304."""
+        import requests
+        from requests.structures import CaseInsensitiveDict
+
+        meta_path, body_path = self._paths(key)
+        with open(body_path, "rb") as f:
+            body = f.read()
+
+        headers = CaseInsensitiveDict(meta["headers"])
+        headers.update({k: v for k, v in resp.headers.items() if k.lower() not in _DROP_HEADERS})
+        meta["headers"] = dict(headers)
+        meta["etag"] = headers.get("ETag", meta.get("etag"))
+        meta["stored_at"] = time.time()
+        _atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+        os.utime(body_path)
+
+        cached = requests.Response()
+        cached.status_code = meta["status"]
+        cached.reason = "OK"
+        cached._content = body
+        cached.headers = headers
+        cached.encoding = meta.get("encoding")
+        cached.url = meta.get("url") or resp.url
+        cached.request = resp.request
+        cached.from_cache = True
+        return cached
+
+    def evict(self):
+        """Drop entries older than max_age, then the least recently used ones until under max_bytes."""
+        entries = []
+        now = time.time()
+        for dirpath, _, files in os.walk(self.root):
+            for name in files:
+                if not name.endswith(".body"):
+                    continue
+                body_path = os.path.join(dirpath, name)
+                meta_path = body_path[:-len(".body")] + ".json"
+                try:
+                    st = os.stat(body_path)
+                except OSError:
+                    continue
+                if now - st.st_mtime > self.max_age:
+                    _remove(body_path, meta_path)
+                    continue
+                entries.append((st.st_mtime, st.st_size, body_path, meta_path))
+
+        total = sum(e[1] for e in entries)
+        if total <= self.max_bytes:
+            return
+        for _, size, body_path, meta_path in sorted(entries):
+            _remove(body_path, meta_path)
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+
+def _atomic_write(path, data):
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _remove(*paths):
+    for p in paths:
+        try:
+            os.remove(p)
+        except OSError:
+            pass
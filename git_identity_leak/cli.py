@@ -1,18 +1,26 @@
 # git_identity_leak/cli.py
 
+import time
+_STARTED = time.perf_counter()
+
 import argparse
+import json
 import os
-from datetime import datetime
-import calendar
-import matplotlib.pyplot as plt
-import seaborn as sns
-import numpy as np
-import svgwrite
-from svgwrite.animate import Animate
-
-from git_identity_leak.analysis import full_analysis
-from git_identity_leak.graph import build_identity_graph, save_graph_json
-from git_identity_leak.report import save_report
+import sys
+from contextlib import contextmanager, nullcontext
+
+# Heavy dependencies (plotting, networkx, numpy) are imported where they are
+# used, so runs that do not need them start quickly.
+from git_identity_leak.analysis import full_analysis, incremental_analysis, DEFAULT_PLUGINS
+from git_identity_leak.report import save_report, is_ndjson_path, ReportWriter
+from git_identity_leak.batch import run_batch, read_usernames, DEFAULT_WORKERS
+from git_identity_leak.plugins import PLUGIN_TIMEOUT, GLOBAL_TIMEOUT, available_plugins, load_plugins
+from git_identity_leak import http_client, ratelimit
+from git_identity_leak.cache import DEFAULT_CACHE_DIR
+from git_identity_leak.reuse import REUSE_WORKERS
+from git_identity_leak.variants import PROBE_BUDGET
+
+IMPORT_TIME = time.perf_counter() - _STARTED
 
 TRUNCATE_LEN = 120
 
@@ -51,7 +59,7 @@ def pretty_print_signals(signals, temporal_data=None, stylometry_data=None):
             count = s.get("meta", {}).get("count", 0)
             contrib_years[year] = count
             continue
-        elif stype in ("REPO_SUMMARY", "CONTRIBUTIONS_YEARLY_DATES"):
+        elif stype in ("REPO_SUMMARY", "CONTRIBUTIONS_YEARLY_DATES", "CONTRIBUTIONS_HISTORY_DATES"):
             if isinstance(value, list):
                 value = str(value)[:TRUNCATE_LEN] + "..."
             print(f"{stype:<{widths[0]}} {value:<{widths[1]}} {conf:<{widths[2]}}")
@@ -82,39 +90,25 @@ def pretty_print_signals(signals, temporal_data=None, stylometry_data=None):
         print(stylometry_data)
 
 def plot_contributions_heatmap(signals, image_dir=None):
-    daily = next((s["value"] for s in signals if s["signal_type"]=="CONTRIBUTIONS_YEARLY_DATES"), None)
-    if not daily:
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    from git_identity_leak.contributions import ContributionCalendar
+    from git_identity_leak.visuals.github_svg import render_svg, save_svg
+
+    days = ContributionCalendar.from_signals(signals)
+    if not days:
         print("[!] No daily contributions found.")
         return
 
-    daily = sorted(daily, key=lambda x: x["date"])
-    start = datetime.strptime(daily[0]["date"],"%Y-%m-%d")
-    end = datetime.strptime(daily[-1]["date"],"%Y-%m-%d")
-    weeks = ((end-start).days // 7)+1
-    heatmap = np.zeros((7,weeks), dtype=int)
-
-    for d in daily:
-        dt = datetime.strptime(d["date"],"%Y-%m-%d")
-        week = (dt-start).days // 7
-        weekday = (dt.weekday()+1)%7
-        heatmap[weekday, week] = d["count"]
+    heatmap, _ = days.heatmap_grid()
+    weeks = heatmap.shape[1]
+    month_ticks = days.month_ticks()
 
     # --- PNG heatmap ---
     plt.figure(figsize=(weeks/2,3))
     sns.heatmap(heatmap, cmap="Greens", cbar=True, linewidths=0.5, square=True)
     plt.yticks([1,3,5], ["Mon","Wed","Fri"], rotation=0)
-    month_positions = []
-    month_labels = []
-    for m in range(1,13):
-        try:
-            month_date = datetime(start.year, m, 1)
-            week_index = (month_date-start).days // 7
-            if 0<=week_index<weeks:
-                month_positions.append(week_index)
-                month_labels.append(calendar.month_abbr[m])
-        except ValueError:
-            continue
-    plt.xticks(month_positions, month_labels, rotation=0, ha='center', fontsize=8, position=(0,1.02))
+    plt.xticks([c for c, _ in month_ticks], [m for _, m in month_ticks], rotation=0, ha='center', fontsize=8, position=(0,1.02))
     plt.title("GitHub Contributions")
     plt.tight_layout()
     if image_dir:
@@ -128,66 +122,297 @@ def plot_contributions_heatmap(signals, image_dir=None):
 
     # --- Static SVG ---
     svg_path = os.path.join(image_dir,"contributions.svg") if image_dir else "contributions.svg"
-    dwg = svgwrite.Drawing(svg_path, profile='tiny', size=(weeks*15, 7*15+20))
-    color_levels = ["#ebedf0","#9be9a8","#40c463","#30a14e","#216e39"]
+    save_svg(render_svg(days), svg_path)
+    print(f"[+] SVG contributions graph saved to {svg_path}")
 
-    for week in range(weeks):
-        for day in range(7):
-            count = heatmap[day, week]
-            color = color_levels[min(count, len(color_levels)-1)]
-            dwg.add(dwg.rect(insert=(week*15, day*15), size=(13,13), fill=color))
+class Timings:
+    """Wall-clock time per phase of a run, printed with --timing."""
 
-    # Weekday labels (optional)
-    for i, label in enumerate(["Sun","Mon","Tue","Wed","Thu","Fri","Sat"]):
-        dwg.add(dwg.text(label, insert=(-10, i*15+12), font_size="10px"))
+    def __init__(self):
+        self.phases = [("imports", IMPORT_TIME)]
 
-    # Month labels
-    for m in range(1,13):
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
         try:
-            month_date = datetime(start.year, m, 1)
-            week_index = (month_date-start).days // 7
-            if 0<=week_index<weeks:
-                dwg.add(dwg.text(calendar.month_abbr[m], insert=(week_index*15, -2), font_size="10px"))
-        except ValueError:
-            continue
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
 
-    dwg.save()
-    print(f"[+] SVG contributions graph saved to {svg_path}")
+    def print(self, file=None):
+        print("\n[DEBUG] Timing:", file=file)
+        for name, seconds in self.phases:
+            print(f"  {name:<16} {seconds:8.3f}s", file=file)
+        print(f"  {'total':<16} {time.perf_counter() - _STARTED:8.3f}s", file=file)
+
+def print_rate_limit_status(file=None):
+    state = ratelimit.quota_state()
+    if not state:
+        print("[!] No GitHub tokens configured (set GITHUB_TOKEN or GITHUB_TOKENS).", file=file)
+        return
+    print("\n[DEBUG] GitHub rate limits:", file=file)
+    for s in state:
+        print(f"  {s['token']:<14} {s['resource']:<8} {s['remaining']}/{s['limit']} reset {s['reset']}", file=file)
 
 def main():
     parser = argparse.ArgumentParser(description="Git Identity Leak OSINT Tool")
-    parser.add_argument("--username", required=True, help="GitHub username")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--username", help="GitHub username")
+    target.add_argument("--usernames-file", help="Batch mode: file with one username per line ('-' for stdin)")
+    target.add_argument("--lookup", metavar="TYPE:VALUE", help="With --signal-db: list stored accounts exposing a value, e.g. EMAIL:a@b.c")
+    target.add_argument("--correlate", action="store_true", help="With --signal-db: list values shared by several stored accounts")
+    target.add_argument("--style-pairs", action="store_true", help="With --style-index: list pairs of indexed accounts that write alike")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Batch mode: concurrent audits")
+    parser.add_argument("--batch-output", help="Batch mode: NDJSON output file, also used as resume checkpoint")
+    parser.add_argument("--no-resume", action="store_true", help="Batch mode: overwrite the output instead of resuming")
     parser.add_argument("--images", help="Directory to save images")
-    parser.add_argument("--graph-output", help="Save graph JSON")
-    parser.add_argument("--output", help="Save report JSON")
+    parser.add_argument("--graph-output", help="Save graph JSON (.npz for a compact binary archive)")
+    parser.add_argument("--neo4j-output", help="Save graph as a batched cypher-shell script")
+    parser.add_argument("--neo4j-batch-size", type=int, help="Rows per UNWIND batch in --neo4j-output (default 1000)")
+    parser.add_argument("--neo4j-csv-dir", help="Save graph as neo4j-admin import CSV files in this directory")
+    parser.add_argument("--svg-dir", help="Save each account's contribution calendar as <username>.svg in this directory")
+    parser.add_argument("--svgz", action="store_true", help="With --svg-dir: write gzip-compressed .svgz files")
+    parser.add_argument("--animation", help="Save a sliding one-year contribution timeline (.gif, or .mp4 with imageio-ffmpeg)")
+    parser.add_argument("--animation-workers", type=int, default=0, help="Threads building animation frames ahead of the encoder")
+    parser.add_argument("--output", help="Save report JSON (.ndjson/.jsonl streams one signal per line, optionally .gz/.zst)")
     parser.add_argument("--verbose", action="store_true")
     parser.add_argument("--temporal", action="store_true")
     parser.add_argument("--stylometry", action="store_true")
+    parser.add_argument("--plugin-timeout", type=float, default=PLUGIN_TIMEOUT, help="Per-plugin deadline in seconds")
+    parser.add_argument("--timeout", type=float, default=GLOBAL_TIMEOUT, help="Deadline for all plugins in seconds")
+    parser.add_argument("--pool-size", type=int, default=http_client.POOL_MAXSIZE, help="Keep-alive connections per host")
+    parser.add_argument("--retries", type=int, default=http_client.MAX_RETRIES, help="Retries on 429/5xx and connection errors")
+    parser.add_argument("--max-repos", type=int, help="Stop collecting GitHub repositories after this many (default: the plugin's MAX_REPOS)")
+    parser.add_argument("--readmes", action="store_true", help="Fetch each repository's README from its default branch")
+    parser.add_argument("--rate-limit-status", action="store_true", help="Print GitHub quota per token when done")
+    parser.add_argument("--phash-index", help="Perceptual hash index file for matching similar avatars across audits")
+    parser.add_argument("--style-index", help="Writing style index file (.npz) for matching similar posts across audits")
+    parser.add_argument("--style-similarity", type=float, help="Cosine similarity for writing style matches (default 0.85)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Directory for the HTTP response cache")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the HTTP response cache")
+    parser.add_argument("--snapshot-dir", help="Re-audit incrementally against snapshots of earlier runs kept here")
+    parser.add_argument("--delta-output", help="With --snapshot-dir: save new/removed signals as JSON")
+    parser.add_argument("--check-username", action="store_true", help="Check the username across the reuse site catalog")
+    parser.add_argument("--sites-file", help="Site catalog for --check-username (default: bundled data/sites.json)")
+    parser.add_argument("--variants", action="store_true", help="With --check-username: also probe username variants")
+    parser.add_argument("--variant-budget", type=int, default=PROBE_BUDGET, help="Probes spent on username variants per account")
+    parser.add_argument("--reuse-workers", type=int, default=REUSE_WORKERS, help="Concurrent reuse probes")
+    parser.add_argument("--signal-db", help="SQLite database collecting every audit's signals for cross-account lookups")
+    parser.add_argument("--plugins", help=f"Comma-separated plugins to run (default: {','.join(DEFAULT_PLUGINS)})")
+    parser.add_argument("--timing", action="store_true", help="Print time spent on imports, collection and outputs")
 
     args = parser.parse_args()
+    if (args.lookup or args.correlate) and not args.signal_db:
+        parser.error("--lookup and --correlate need --signal-db")
+    if args.style_pairs and not args.style_index:
+        parser.error("--style-pairs needs --style-index")
+    plugin_names = [p.strip() for p in args.plugins.split(",") if p.strip()] if args.plugins else DEFAULT_PLUGINS
+    unknown = sorted(set(plugin_names) - set(available_plugins()))
+    if unknown:
+        parser.error(f"unknown plugin(s): {', '.join(unknown)} (available: {', '.join(available_plugins())})")
+    timings = Timings() if args.timing else None
+    signal_store = None
+    if args.signal_db:
+        from git_identity_leak.signal_store import SignalStore
+        signal_store = SignalStore(args.signal_db)
+
+    if args.lookup:
+        signal_type, _, value = args.lookup.partition(":")
+        for match in signal_store.lookup(signal_type.upper(), value):
+            print(f"{match['username']}\t{match['source']}\t{match['confidence']}\t{match['collected_at']}")
+        return
+    if args.correlate:
+        for match in signal_store.correlate():
+            print(f"{match['signal_type']}\t{match['value']}\t{', '.join(match['usernames'])}")
+        return
+
+    style_index = None
+    if args.style_index:
+        from git_identity_leak.stylometry import StyleIndex, MATCH_SIMILARITY
+        style_index = StyleIndex(args.style_index)
+    if args.style_pairs:
+        for similarity, first, second in style_index.pairs(args.style_similarity or MATCH_SIMILARITY):
+            print(f"{similarity:.4f}\t{first}\t{second}")
+        return
+
+    http_client.configure(pool_maxsize=args.pool_size, max_retries=args.retries)
+    if not args.no_cache:
+        http_client.enable_cache(args.cache_dir)
+
+    plugin_options = {"github": {"fetch_readmes": args.readmes}}
+    if args.max_repos is not None:
+        plugin_options["github"]["max_repos"] = args.max_repos
+    phash_index = None
+    if args.phash_index:
+        from git_identity_leak.perceptual import PerceptualIndex
+        phash_index = PerceptualIndex(args.phash_index)
+
+    snapshots = None
+    if args.snapshot_dir:
+        from git_identity_leak.snapshots import SnapshotStore
+        snapshots = SnapshotStore(args.snapshot_dir)
+    reuse_scanner = None
+    variant_budget = args.variant_budget if args.variants else 0
+    if args.check_username:
+        from git_identity_leak.reuse import ReuseScanner, NegativeCache, default_sites, load_sites
+        from git_identity_leak.variants import BloomFilter, SeenSet
+        sites = load_sites(args.sites_file) if args.sites_file else default_sites()
+        # One filter for the whole run, so batch audits never probe a pair twice; sized
+        # for the roster when it is a file (stdin gets the default capacity)
+        seen = SeenSet()
+        if args.usernames_file == "-":
+            seen = BloomFilter()
+        elif args.usernames_file:
+            accounts = sum(1 for _ in read_usernames(args.usernames_file))
+            seen = BloomFilter.for_batch(accounts, len(sites) + variant_budget)
+        reuse_scanner = ReuseScanner(
+            sites,
+            workers=args.reuse_workers,
+            negative_cache=NegativeCache(None if args.no_cache else os.path.join(args.cache_dir, "reuse-negative.json")),
+            seen=seen,
+        )
+
+    if timings:
+        # Plugins are cached once imported, so the collection phase below is network and parsing only
+        with timings.phase("plugin imports"):
+            load_plugins(plugin_names)
 
-    signals, temporal_data, stylometry_data = full_analysis(
-        username=args.username,
+    if args.usernames_file:
+        with timings.phase("batch") if timings else nullcontext():
+            written = run_batch(
+                read_usernames(args.usernames_file),
+                output=args.batch_output,
+                workers=args.workers,
+                resume=not args.no_resume,
+                include_temporal=args.temporal,
+                include_stylometry=args.stylometry,
+                plugin_timeout=args.plugin_timeout,
+                global_timeout=args.timeout,
+                plugin_options=plugin_options,
+                plugin_names=plugin_names,
+                image_dir=args.images,
+                phash_index=phash_index,
+                style_index=style_index,
+                style_similarity=args.style_similarity,
+                snapshots=snapshots,
+                svg_dir=args.svg_dir,
+                svg_compress=args.svgz,
+                signal_store=signal_store,
+                reuse_scanner=reuse_scanner,
+                variant_budget=variant_budget,
+            )
+        if reuse_scanner:
+            reuse_scanner.negative_cache.save()
+        print(f"[+] Batch audit finished: {written} accounts", file=sys.stderr)
+        if args.rate_limit_status:
+            print_rate_limit_status(file=sys.stderr)
+        if timings:
+            timings.print(file=sys.stderr)
+        return
+
+    sink = None
+    if args.output and is_ndjson_path(args.output):
+        sink = ReportWriter(args.output, username=args.username)
+
+    analysis_kwargs = dict(
         image_dir=args.images,
         include_temporal=args.temporal,
-        include_stylometry=args.stylometry
+        include_stylometry=args.stylometry,
+        plugin_timeout=args.plugin_timeout,
+        global_timeout=args.timeout,
+        plugin_options=plugin_options,
+        plugin_names=plugin_names,
+        phash_index=phash_index,
+        style_index=style_index,
+        style_similarity=args.style_similarity,
+        sink=sink,
+        signal_store=signal_store,
+        reuse_scanner=reuse_scanner,
+        variant_budget=variant_budget,
     )
+    delta = None
+    with timings.phase("collection") if timings else nullcontext():
+        if snapshots:
+            signals, temporal_data, stylometry_data, delta = incremental_analysis(args.username, snapshots, **analysis_kwargs)
+        else:
+            signals, temporal_data, stylometry_data = full_analysis(args.username, **analysis_kwargs)
+    if phash_index:
+        phash_index.save()
+    if style_index is not None:
+        style_index.save()
+    if reuse_scanner:
+        reuse_scanner.negative_cache.save()
 
     if args.verbose:
         pretty_print_signals(signals, temporal_data, stylometry_data)
 
-    if args.graph_output:
-        graph = build_identity_graph(signals)
-        save_graph_json(args.graph_output, graph)
-        print(f"[+] Graph saved to {args.graph_output}")
+    if signal_store:
+        shared = signal_store.shared_with(args.username)
+        print(f"[+] Signals stored in {args.signal_db}; {len(shared)} shared with other stored accounts")
+        for match in shared:
+            print(f"    {match['signal_type']}: {match['value']} <-> {match['username']}")
+
+    if delta is not None:
+        print(f"[+] Since last snapshot: {len(delta['added'])} new, {len(delta['removed'])} removed signals")
+        if args.delta_output:
+            with open(args.delta_output, "w") as f:
+                json.dump(delta, f, indent=2, default=str)
+            print(f"[+] Delta saved to {args.delta_output}")
+
+    if args.graph_output or args.neo4j_output or args.neo4j_csv_dir:
+        with timings.phase("graph") if timings else nullcontext():
+            from git_identity_leak.graph import (
+                build_identity_graph,
+                export_neo4j_admin_csv,
+                export_neo4j_batched,
+                save_graph,
+            )
+            graph = build_identity_graph(signals)
+            if args.graph_output:
+                save_graph(args.graph_output, graph)
+                print(f"[+] Graph saved to {args.graph_output}")
+            if args.neo4j_output:
+                batch_kwargs = {"batch_size": args.neo4j_batch_size} if args.neo4j_batch_size else {}
+                export_neo4j_batched(graph, args.neo4j_output, **batch_kwargs)
+                print(f"[+] Neo4j script saved to {args.neo4j_output} (run with cypher-shell -f)")
+            if args.neo4j_csv_dir:
+                nodes_path, rels_path = export_neo4j_admin_csv(graph, args.neo4j_csv_dir)
+                print(f"[+] Neo4j import files saved to {nodes_path} and {rels_path}")
+
+    with timings.phase("report") if timings else nullcontext():
+        if sink:
+            sink.close(temporal_data, stylometry_data)
+            print(f"[+] Report streamed to {args.output} ({sink.count} signals)")
+        elif args.output:
+            save_report(args.output, signals, temporal_data, stylometry_data)
+            print(f"[+] Report saved to {args.output}")
+
+    if args.svg_dir:
+        from git_identity_leak.visuals.github_svg import save_calendar_svg
+        path = save_calendar_svg(args.username, signals, args.svg_dir, compress=args.svgz)
+        if path:
+            print(f"[+] Contribution calendar saved to {path}")
 
-    if args.output:
-        save_report(args.output, signals, temporal_data, stylometry_data)
-        print(f"[+] Report saved to {args.output}")
+    if args.animation:
+        with timings.phase("animation") if timings else nullcontext():
+            from git_identity_leak.contributions import ContributionCalendar
+            from git_identity_leak.visuals.animate import animate_contributions
+            days = (ContributionCalendar.from_signals(signals, "CONTRIBUTIONS_HISTORY_DATES")
+                    or ContributionCalendar.from_signals(signals))
+            frames = animate_contributions(days, args.animation, workers=args.animation_workers) if days else 0
+        if frames:
+            print(f"[+] Contribution timeline saved to {args.animation} ({frames} frames)")
+        else:
+            print("[!] No daily contributions found.")
 
     if args.images:
-        plot_contributions_heatmap(signals, args.images)
+        with timings.phase("plots") if timings else nullcontext():
+            plot_contributions_heatmap(signals, args.images)
 
+    if args.rate_limit_status:
+        print_rate_limit_status()
+    if timings:
+        timings.print(file=sys.stderr)
 
 if __name__ == "__main__":
     main()
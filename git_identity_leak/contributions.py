@@ -0,0 +1,236 @@
+# git_identity_leak/contributions.py
+"""
+Contribution calendar analytics.
+
+A ContributionCalendar holds a contribution history as one dense NumPy
+array of daily counts starting at a datetime64[D] date, built once from
+either a GraphQL contributionCalendar or CONTRIBUTIONS_YEARLY_DATES
+signal values. Dates are parsed by NumPy in one call rather than per day
+with strptime, and weekday histograms, yearly totals, streaks, rolling
+sums, bursts and the heatmap grid are all array operations on the same
+counts, so the GitHub plugin and the plotting code share one
+representation.
+"""
+import calendar as _calendar
+
+import numpy as np
+
+WEEKDAY_NAMES = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+ROLLING_WINDOW = 7          # days
+BURST_THRESHOLD = 3.0       # standard deviations of the rolling sum above its mean
+MAX_BURSTS = 10             # strongest bursts kept in signal meta
+YEAR_DAYS = 365             # window of CONTRIBUTIONS_YEARLY_DATES, as on a GitHub profile
+
+_EPOCH_WEEKDAY = 3          # 1970-01-01 was a Thursday (Mon = 0)
+_MONTH_ABBR = tuple(_calendar.month_abbr)    # month_abbr formats a date on every lookup
+
+
+class ContributionCalendar:
+    """
+    Daily contribution counts from start to start + len(counts) - 1.
+
+    Days missing from the input count as zero; days given more than once
+    are summed.
+    """
+
+    def __init__(self, dates, counts):
+        dates = np.asarray(dates, dtype="datetime64[D]")
+        counts = np.asarray(counts, dtype=np.int64)
+        if dates.size == 0:
+            self.start = None
+            self.counts = np.zeros(0, dtype=np.int64)
+            return
+        self.start = dates.min()
+        offsets = (dates - self.start).astype(np.int64)
+        self.counts = np.bincount(offsets, weights=counts, minlength=int(offsets.max()) + 1).astype(np.int64)
+
+    @classmethod
+    def from_days(cls, days):
+        """From [{"date": "YYYY-MM-DD", "count": n}, ...] (a CONTRIBUTIONS_YEARLY_DATES value)."""
+        days = list(days or ())
+        return cls([d["date"] for d in days], [d["count"] for d in days])
+
+    @classmethod
+    def from_graphql(cls, calendar):
+        """From a GraphQL contributionCalendar with weeks { contributionDays { date contributionCount } }."""
+        days = [day for week in (calendar or {}).get("weeks", ()) for day in week.get("contributionDays", ())]
+        return cls([d["date"] for d in days], [d["contributionCount"] for d in days])
+
+    @classmethod
+    def from_signals(cls, signals, signal_type="CONTRIBUTIONS_YEARLY_DATES"):
+        """
+        From the first signal_type signal, or None if there is none.
+        CONTRIBUTIONS_YEARLY_DATES holds the last year; CONTRIBUTIONS_HISTORY_DATES
+        the whole history, when it is longer than that.
+        """
+        days = next((s["value"] for s in signals if s["signal_type"] == signal_type), None)
+        return cls.from_days(days) if days else None
+
+    def __len__(self):
+        return len(self.counts)
+
+    @property
+    def dates(self):
+        if self.start is None:
+            return np.zeros(0, dtype="datetime64[D]")
+        return self.start + np.arange(len(self.counts))
+
+    @property
+    def end(self):
+        return None if self.start is None else self.start + (len(self.counts) - 1)
+
+    @property
+    def lead(self):
+        """Days from the Sunday before (or on) start to start."""
+        return 0 if self.start is None else (int(self.start.astype(np.int64)) + _EPOCH_WEEKDAY + 1) % 7
+
+    @property
+    def weekdays(self):
+        """Weekday of each day, Mon = 0 ... Sun = 6."""
+        return (self.dates.astype(np.int64) + _EPOCH_WEEKDAY) % 7
+
+    @property
+    def years(self):
+        return self.dates.astype("datetime64[Y]").astype(np.int64) + 1970
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def last(self, days=YEAR_DAYS):
+        """Calendar of the last days days (all of it when shorter)."""
+        tail = type(self)([], [])
+        if len(self):
+            tail.counts = self.counts[-days:]
+            tail.start = self.end - (len(tail.counts) - 1)
+        return tail
+
+    def days(self):
+        """The calendar as [{"date", "count"}, ...], one entry per day."""
+        return [{"date": d, "count": c} for d, c in zip(np.datetime_as_string(self.dates).tolist(), self.counts.tolist())]
+
+    def weekday_histogram(self):
+        """Contributions per weekday, Mon first (length 7)."""
+        return np.bincount(self.weekdays, weights=self.counts, minlength=7).astype(np.int64)
+
+    def weekday_weekend(self):
+        hist = self.weekday_histogram()
+        return int(hist[:5].sum()), int(hist[5:].sum())
+
+    def yearly_totals(self):
+        """{"2024": n, ...} in year order."""
+        if not len(self):
+            return {}
+        years = self.years
+        first = int(years[0])
+        totals = np.bincount(years - first, weights=self.counts).astype(np.int64)
+        return {str(first + i): int(n) for i, n in enumerate(totals)}
+
+    def _active_runs(self):
+        # (start index, length) of every run of consecutive active days
+        active = np.concatenate(([0], (self.counts > 0).astype(np.int8), [0]))
+        edges = np.flatnonzero(np.diff(active))
+        starts, stops = edges[::2], edges[1::2]
+        return starts, stops - starts
+
+    def streaks(self):
+        """
+        Longest and current runs of days with at least one contribution.
+
+        Returns:
+            dict: {"longest", "longest_start", "longest_end", "current"}; the
+                current streak is the run that includes the last day
+        """
+        starts, lengths = self._active_runs()
+        if not lengths.size:
+            return {"longest": 0, "longest_start": None, "longest_end": None, "current": 0}
+        i = int(lengths.argmax())
+        current = int(lengths[-1]) if starts[-1] + lengths[-1] == len(self.counts) else 0
+        return {
+            "longest": int(lengths[i]),
+            "longest_start": str(self.start + int(starts[i])),
+            "longest_end": str(self.start + int(starts[i] + lengths[i] - 1)),
+            "current": current,
+        }
+
+    def rolling(self, window=ROLLING_WINDOW):
+        """Sum of the window days ending at each day (shorter at the start)."""
+        cumsum = np.cumsum(self.counts)
+        out = cumsum.copy()
+        out[window:] -= cumsum[:-window]
+        return out
+
+    def bursts(self, window=ROLLING_WINDOW, threshold=BURST_THRESHOLD):
+        """
+        Periods whose rolling sum is more than threshold standard deviations
+        above its mean.
+
+        Returns:
+            list[dict]: {"start", "end", "total", "peak"} per burst, strongest first
+        """
+        if len(self) < window:
+            return []
+        roll = self.rolling(window)
+        std = roll.std()
+        if std == 0:
+            return []
+        hot = np.concatenate(([0], (roll > roll.mean() + threshold * std).astype(np.int8), [0]))
+        edges = np.flatnonzero(np.diff(hot))
+        busy = self.counts > self.counts.mean() + threshold * self.counts.std()
+        bursts = []
+        for first, stop in zip(edges[::2], edges[1::2]):
+            # A hot rolling sum at day i covers days i - window + 1 ... i; narrow
+            # that to the unusually busy days in it when there are any
+            peak = int(roll[first:stop].max())
+            lo, hi = max(0, int(first) - window + 1), int(stop)
+            busy_days = np.flatnonzero(busy[lo:hi])
+            if busy_days.size:
+                lo, hi = lo + int(busy_days[0]), lo + int(busy_days[-1]) + 1
+            bursts.append({
+                "start": str(self.start + lo),
+                "end": str(self.start + hi - 1),
+                "total": int(self.counts[lo:hi].sum()),
+                "peak": peak,
+            })
+        bursts.sort(key=lambda b: b["peak"], reverse=True)
+        return bursts
+
+    def heatmap_grid(self):
+        """
+        Counts laid out like GitHub's calendar: 7 rows (Sun first) by one
+        column per week, weeks starting on Sunday. Cells outside the
+        history are zero.
+
+        Returns:
+            (np.ndarray, np.datetime64): The grid and the Sunday of column 0
+        """
+        if not len(self):
+            return np.zeros((7, 0), dtype=np.int64), None
+        lead = self.lead
+        weeks = -(-(lead + len(self.counts)) // 7)
+        cells = np.zeros(weeks * 7, dtype=np.int64)
+        cells[lead:lead + len(self.counts)] = self.counts
+        return cells.reshape(weeks, 7).T, self.start - lead
+
+    def month_ticks(self):
+        """(column, "Jan") for each month that starts inside the heatmap grid."""
+        if not len(self):
+            return []
+        origin = self.start - self.lead
+        months = np.arange(self.start.astype("datetime64[M]"), self.end.astype("datetime64[M]") + 1)
+        firsts = months.astype("datetime64[D]")
+        inside = firsts >= self.start
+        columns = ((firsts[inside] - origin).astype(np.int64) // 7).tolist()
+        numbers = (months[inside].astype(np.int64) % 12 + 1).tolist()
+        return [(c, _MONTH_ABBR[m]) for c, m in zip(columns, numbers)]
+
+    def summary(self):
+        """Analytics kept on the CONTRIBUTION_TIME_PATTERN signal."""
+        return {
+            "weekdays": dict(zip(WEEKDAY_NAMES, self.weekday_histogram().tolist())),
+            "streaks": self.streaks(),
+            "bursts": self.bursts()[:MAX_BURSTS],
+            "active_days": int(np.count_nonzero(self.counts)),
+            "first_day": None if self.start is None else str(self.start),
+            "last_day": None if self.start is None else str(self.end),
+        }
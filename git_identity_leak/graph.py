@@ -1,223 +1,182 @@
 # git_identity_leak/graph.py
 import os
+import csv
 import json
+import math
+import numpy as np
 import networkx as nx
 from networkx.readwrite import json_graph
 
 
+# Signal types that are not linked to the username as plain profile info
+NON_PROFILE_TYPES = frozenset((
+    "REPO_SUMMARY",
+    "INACTIVITY_SCORE",
+    "CONTRIBUTIONS_YEAR",
+    "CONTRIBUTION_TOTAL",
+    "CONTRIBUTION_TIME_PATTERN",
+    "CONTRIBUTION_HOURLY_PATTERN",
+    "FOLLOWER_USERNAME",
+    "FOLLOWING_USERNAME",
+    "MUTUAL_CONNECTION",
+))
+SOCIAL_TYPES = ("FOLLOWER_USERNAME", "FOLLOWING_USERNAME", "MUTUAL_CONNECTION")
+EXTRA_TYPES = ("GITHUB_PAGES", "PROFILE_PLATFORM", "PRONOUNS")
+
+GRAPH_FORMAT_VERSION = 1
+NEO4J_LABEL = "Signal"
+NEO4J_BATCH_SIZE = 1000
+
+
 def build_identity_graph(signals):
+    """
+    Build the identity graph from collected signals.
+
+    Signals are bucketed by type in a single pass and nodes/edges are added
+    in bulk, so the cost is linear in the number of signals. Node attribute
+    values are shared with the signals, not copied.
+    """
     G = nx.Graph()
-    username = next((s["value"] for s in signals if s["signal_type"] == "USERNAME"), None)
 
     # -------------------------
-    # Base profile nodes
+    # One pass: base nodes + buckets by type
     # -------------------------
+    base_nodes = []
+    profile_ids = []
+    by_type = {}
     for s in signals:
         stype, value = s.get("signal_type"), s.get("value")
+        if stype is None:
+            continue
+        by_type.setdefault(stype, []).append(s)
         if not stype or value is None:
             continue
 
         node_id = f"{stype}:{value}"
-        G.add_node(node_id, **s)
-
-        if (
-            username
-            and stype
-            not in (
-                "REPO_SUMMARY",
-                "INACTIVITY_SCORE",
-                "CONTRIBUTIONS_YEAR",
-                "CONTRIBUTION_TOTAL",
-                "CONTRIBUTION_TIME_PATTERN",
-                "CONTRIBUTION_HOURLY_PATTERN",
-                "FOLLOWER_USERNAME",
-                "FOLLOWING_USERNAME",
-                "MUTUAL_CONNECTION",
-            )
-        ):
-            G.add_edge(
-                f"USERNAME:{username}",
-                node_id,
-                relation="PROFILE_INFO",
-            )
+        base_nodes.append((node_id, s))
+        if stype not in NON_PROFILE_TYPES:
+            profile_ids.append(node_id)
+
+    usernames = by_type.get("USERNAME")
+    username = usernames[0]["value"] if usernames else None
+    user_node = f"USERNAME:{username}"
+    first = lambda stype: by_type[stype][0] if by_type.get(stype) else None
+
+    # -------------------------
+    # Base profile nodes
+    # -------------------------
+    G.add_nodes_from(base_nodes)
+    if username:
+        G.add_edges_from(((user_node, node_id) for node_id in profile_ids), relation="PROFILE_INFO")
 
     # -------------------------
     # Followers / Following
     # -------------------------
     if username:
-        for s in signals:
-            if s["signal_type"] in (
-                "FOLLOWER_USERNAME",
-                "FOLLOWING_USERNAME",
-                "MUTUAL_CONNECTION",
-            ):
-                G.add_edge(
-                    f"USERNAME:{username}",
-                    f"{s['signal_type']}:{s['value']}",
-                    relation="SOCIAL_LINK",
-                )
+        G.add_edges_from(
+            ((user_node, f"{s['signal_type']}:{s['value']}") for stype in SOCIAL_TYPES for s in by_type.get(stype, ())),
+            relation="SOCIAL_LINK",
+        )
 
     # -------------------------
     # Repo nodes
     # -------------------------
-    repo_sigs = [s for s in signals if s.get("signal_type") == "REPO_SUMMARY"]
     inactivity_sigs = {
         s["value"].split(":")[0]: s
-        for s in signals
-        if s.get("signal_type") == "INACTIVITY_SCORE"
+        for s in by_type.get("INACTIVITY_SCORE", ())
     }
 
-    for repo in repo_sigs:
+    repo_nodes = []
+    for repo in by_type.get("REPO_SUMMARY", ()):
         repo_name = repo["value"].split("|")[0].strip()
-        node_id = f"REPO:{repo_name}"
-        node_data = repo.copy()
+        repo_nodes.append((repo_name, f"REPO:{repo_name}", repo))
 
+    G.add_nodes_from((node_id, repo) for _, node_id, repo in repo_nodes)
+    for repo_name, node_id, _ in repo_nodes:
         if repo_name in inactivity_sigs:
-            node_data["inactivity_score"] = inactivity_sigs[repo_name]["value"]
-
-        G.add_node(node_id, **node_data)
-
-        if username:
-            G.add_edge(
-                f"USERNAME:{username}",
-                node_id,
-                relation="OWNS_REPO",
-            )
+            G.nodes[node_id]["inactivity_score"] = inactivity_sigs[repo_name]["value"]
+    if username:
+        G.add_edges_from(((user_node, node_id) for _, node_id, _ in repo_nodes), relation="OWNS_REPO")
 
     # -------------------------
     # Contribution years (temporal)
     # -------------------------
-    contrib_years = [
-        s for s in signals if s.get("signal_type") == "CONTRIBUTIONS_YEAR" and "meta" in s
-    ]
+    contrib_years = [s for s in by_type.get("CONTRIBUTIONS_YEAR", ()) if "meta" in s]
     contrib_years.sort(key=lambda s: int(s["meta"]["year"]))
+    year_ids = [f"CONTRIBUTIONS_YEAR:{s['meta']['year']}" for s in contrib_years]
 
-    prev_node = None
-    for s in contrib_years:
-        year = s["meta"]["year"]
-        node_id = f"CONTRIBUTIONS_YEAR:{year}"
-        G.add_node(node_id, **s)
-
-        if prev_node:
-            G.add_edge(prev_node, node_id, relation="TEMPORAL_NEXT")
-
-        prev_node = node_id
+    G.add_nodes_from(zip(year_ids, contrib_years))
+    G.add_edges_from(zip(year_ids, year_ids[1:]), relation="TEMPORAL_NEXT")
 
     # -------------------------
     # Total contributions
     # -------------------------
-    total_signal = next(
-        (s for s in signals if s["signal_type"] == "CONTRIBUTION_TOTAL"), None
-    )
+    total_signal = first("CONTRIBUTION_TOTAL")
 
     if total_signal:
         G.add_node("CONTRIBUTION_TOTAL", **total_signal)
 
         if username:
-            G.add_edge(
-                f"USERNAME:{username}",
-                "CONTRIBUTION_TOTAL",
-                relation="TOTAL_CONTRIBUTIONS",
-            )
+            G.add_edge(user_node, "CONTRIBUTION_TOTAL", relation="TOTAL_CONTRIBUTIONS")
 
-        for y in contrib_years:
-            G.add_edge(
-                "CONTRIBUTION_TOTAL",
-                f"CONTRIBUTIONS_YEAR:{y['meta']['year']}",
-                relation="YEARLY",
-            )
+        G.add_edges_from((("CONTRIBUTION_TOTAL", y) for y in year_ids), relation="YEARLY")
 
     # -------------------------
     # Weekday / weekend pattern
     # -------------------------
-    pattern_signal = next(
-        (s for s in signals if s["signal_type"] == "CONTRIBUTION_TIME_PATTERN"), None
-    )
+    pattern_signal = first("CONTRIBUTION_TIME_PATTERN")
 
     if pattern_signal:
         G.add_node("CONTRIBUTION_TIME_PATTERN", **pattern_signal)
 
         if total_signal:
-            G.add_edge(
-                "CONTRIBUTION_TOTAL",
-                "CONTRIBUTION_TIME_PATTERN",
-                relation="PATTERN_REL",
-            )
+            G.add_edge("CONTRIBUTION_TOTAL", "CONTRIBUTION_TIME_PATTERN", relation="PATTERN_REL")
 
     # -------------------------
     # Hourly contributions
     # -------------------------
-    hourly_signal = next(
-        (s for s in signals if s["signal_type"] == "CONTRIBUTION_HOURLY_PATTERN"), None
-    )
+    hourly_signal = first("CONTRIBUTION_HOURLY_PATTERN")
 
     if hourly_signal:
         hourly_counts = hourly_signal.get("value", {})
-        prev_hour_node = None
-
-        for h in range(24):
-            node_id = f"CONTRIBUTION_HOUR:{h}"
-            G.add_node(
-                node_id,
-                count=hourly_counts.get(str(h), 0),
-                signal_type="CONTRIBUTION_HOURLY_PATTERN",
-            )
-
-            if prev_hour_node:
-                G.add_edge(prev_hour_node, node_id, relation="HOUR_NEXT")
+        hour_ids = [f"CONTRIBUTION_HOUR:{h}" for h in range(24)]
 
-            prev_hour_node = node_id
+        G.add_nodes_from(
+            (node_id, {"count": hourly_counts.get(str(h), 0), "signal_type": "CONTRIBUTION_HOURLY_PATTERN"})
+            for h, node_id in enumerate(hour_ids)
+        )
+        G.add_edges_from(zip(hour_ids, hour_ids[1:]), relation="HOUR_NEXT")
 
         if total_signal:
-            G.add_edge(
-                "CONTRIBUTION_TOTAL",
-                "CONTRIBUTION_HOUR:0",
-                relation="HOURLY_PATTERN_START",
-            )
+            G.add_edge("CONTRIBUTION_TOTAL", "CONTRIBUTION_HOUR:0", relation="HOURLY_PATTERN_START")
 
     # -------------------------
     # Daily contributions
     # -------------------------
-    daily_signal = next(
-        (s for s in signals if s["signal_type"] == "CONTRIBUTIONS_YEARLY_DATES"), None
-    )
+    daily_signal = first("CONTRIBUTIONS_YEARLY_DATES")
 
     if daily_signal:
-        for d in daily_signal["value"]:
-            node_id = f"CONTRIBUTION_DAY:{d['date']}"
-            G.add_node(
-                node_id,
-                count=d["count"],
-                date=d["date"],
-                signal_type="CONTRIBUTIONS_YEARLY_DATES",
-            )
+        day_ids = [f"CONTRIBUTION_DAY:{d['date']}" for d in daily_signal["value"]]
+        G.add_nodes_from(
+            (node_id, {"count": d["count"], "date": d["date"], "signal_type": "CONTRIBUTIONS_YEARLY_DATES"})
+            for node_id, d in zip(day_ids, daily_signal["value"])
+        )
 
-            if username:
-                G.add_edge(
-                    f"USERNAME:{username}",
-                    node_id,
-                    relation="DAILY_CONTRIBUTION",
-                )
+        if username:
+            G.add_edges_from(((user_node, node_id) for node_id in day_ids), relation="DAILY_CONTRIBUTION")
 
     # -------------------------
     # Extra profile info
     # -------------------------
-    extra_signals = [
-        s
-        for s in signals
-        if s["signal_type"] in ("GITHUB_PAGES", "PROFILE_PLATFORM", "PRONOUNS")
+    extra_nodes = [
+        (f"{s['signal_type']}:{s['value']}", s)
+        for stype in EXTRA_TYPES
+        for s in by_type.get(stype, ())
     ]
 
-    for s in extra_signals:
-        node_id = f"{s['signal_type']}:{s['value']}"
-        G.add_node(node_id, **s)
-
-        if username:
-            G.add_edge(
-                f"USERNAME:{username}",
-                node_id,
-                relation="EXTRA_PROFILE_INFO",
-            )
+    G.add_nodes_from(extra_nodes)
+    if username:
+        G.add_edges_from(((user_node, node_id) for node_id, _ in extra_nodes), relation="EXTRA_PROFILE_INFO")
 
     return G
 
@@ -235,6 +194,200 @@ def save_graph_json(path, G):
         json.dump(data, f, indent=2)
 
 
+def load_graph_json(path):
+    """Load a graph written by save_graph_json."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json_graph.node_link_graph(json.load(f))
+
+
+# ============================================================
+# Compact binary persistence (.npz)
+# ============================================================
+
+def _pack_strings(strings):
+    """Encode strings as one UTF-8 byte array plus an offsets array (n + 1 entries)."""
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _unpack_strings(blob, offsets):
+    data = blob.tobytes()
+    offsets = offsets.tolist()
+    return [data[a:b].decode("utf-8") for a, b in zip(offsets, offsets[1:])]
+
+
+def _dump_attrs(attrs):
+    return json.dumps(dict(attrs), default=str, separators=(",", ":")) if attrs else ""
+
+
+def save_graph_npz(path, G):
+    """
+    Save a graph as a compressed NumPy archive.
+
+    Nodes become an integer-indexed table of ids and edges become two int32
+    index arrays plus an int16 relation code per edge, so reopening the
+    structure does not need any JSON parsing. Node attributes are stored as
+    one JSON document per node in a single byte blob with offsets, which
+    GraphArchive decodes only for the nodes that are actually read.
+    """
+    if not isinstance(G, nx.Graph):
+        raise TypeError("G must be a NetworkX graph")
+    if G.is_multigraph():
+        raise TypeError("multigraphs are not supported")
+
+    node_ids = list(G.nodes)
+    if not all(isinstance(n, str) for n in node_ids):
+        raise TypeError("node ids must be strings")
+    index = {n: i for i, n in enumerate(node_ids)}
+
+    relations = {}
+    src, dst, codes, edge_attrs = [], [], [], []
+    for u, v, attrs in G.edges(data=True):
+        src.append(index[u])
+        dst.append(index[v])
+        rel = attrs.get("relation")
+        codes.append(-1 if rel is None else relations.setdefault(rel, len(relations)))
+        edge_attrs.append({k: val for k, val in attrs.items() if k != "relation"})
+
+    id_blob, id_offsets = _pack_strings(node_ids)
+    attr_blob, attr_offsets = _pack_strings(_dump_attrs(a) for _, a in G.nodes(data=True))
+    rel_blob, rel_offsets = _pack_strings(relations)
+    meta = {
+        "version": GRAPH_FORMAT_VERSION,
+        "directed": G.is_directed(),
+        "graph": G.graph,
+    }
+    arrays = {
+        "meta": np.frombuffer(json.dumps(meta, default=str).encode("utf-8"), dtype=np.uint8),
+        "node_ids": id_blob,
+        "node_offsets": id_offsets,
+        "node_attrs": attr_blob,
+        "node_attr_offsets": attr_offsets,
+        "src": np.asarray(src, dtype=np.int32),
+        "dst": np.asarray(dst, dtype=np.int32),
+        "relation": np.asarray(codes, dtype=np.int16),
+        "relations": rel_blob,
+        "relation_offsets": rel_offsets,
+    }
+    # Edge attributes other than relation are rare, only store them when present
+    if any(edge_attrs):
+        arrays["edge_attrs"], arrays["edge_attr_offsets"] = _pack_strings(_dump_attrs(a) for a in edge_attrs)
+
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez_compressed(tmp_path, **arrays)
+    os.replace(tmp_path, path)
+
+
+class GraphArchive:
+    """
+    A graph saved by save_graph_npz, reopened lazily.
+
+    Only the node table is decoded on open. Edges are read when graph() is
+    called, and node attributes are read from the archive the first time
+    attrs() or graph(attributes=True) needs them, then decoded per node.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._npz = np.load(path, allow_pickle=False)
+        self.meta = json.loads(self._npz["meta"].tobytes().decode("utf-8"))
+        if self.meta.get("version") != GRAPH_FORMAT_VERSION:
+            raise ValueError(f"Unsupported graph archive version: {self.meta.get('version')}")
+        self.nodes = _unpack_strings(self._npz["node_ids"], self._npz["node_offsets"])
+        self._index = None
+        self._attrs = None
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __contains__(self, node):
+        return node in self.index
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = {n: i for i, n in enumerate(self.nodes)}
+        return self._index
+
+    def _attr_data(self):
+        if self._attrs is None:
+            self._attrs = (self._npz["node_attrs"].tobytes(), self._npz["node_attr_offsets"].tolist())
+        return self._attrs
+
+    def attrs(self, node):
+        """Decode the attributes of one node."""
+        data, offsets = self._attr_data()
+        i = self.index[node]
+        raw = data[offsets[i]:offsets[i + 1]]
+        return json.loads(raw) if raw else {}
+
+    def graph(self, attributes=True):
+        """Rebuild the NetworkX graph, with or without node attributes."""
+        G = nx.DiGraph() if self.meta.get("directed") else nx.Graph()
+        G.graph.update(self.meta.get("graph") or {})
+
+        if attributes:
+            data, offsets = self._attr_data()
+            G.add_nodes_from(
+                (n, json.loads(data[a:b]) if b > a else {})
+                for n, a, b in zip(self.nodes, offsets, offsets[1:])
+            )
+        else:
+            G.add_nodes_from(self.nodes)
+
+        nodes = self.nodes
+        src, dst, codes = self._npz["src"], self._npz["dst"], self._npz["relation"]
+        relations = _unpack_strings(self._npz["relations"], self._npz["relation_offsets"])
+        # One bulk insert per relation type, so no per-edge attribute dict is built here
+        for code in np.unique(codes).tolist():
+            mask = codes == code
+            edges = ((nodes[u], nodes[v]) for u, v in zip(src[mask].tolist(), dst[mask].tolist()))
+            if code < 0:
+                G.add_edges_from(edges)
+            else:
+                G.add_edges_from(edges, relation=relations[code])
+
+        if "edge_attrs" in self._npz.files:
+            extra = _unpack_strings(self._npz["edge_attrs"], self._npz["edge_attr_offsets"])
+            for u, v, raw in zip(src.tolist(), dst.tolist(), extra):
+                if raw:
+                    G.edges[nodes[u], nodes[v]].update(json.loads(raw))
+        return G
+
+    def close(self):
+        self._npz.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_graph_npz(path, attributes=True):
+    with GraphArchive(path) as archive:
+        return archive.graph(attributes=attributes)
+
+
+def save_graph(path, G):
+    """Save a graph, as a compact .npz archive or node-link JSON depending on the extension."""
+    if path.endswith(".npz"):
+        save_graph_npz(path, G)
+    else:
+        save_graph_json(path, G)
+
+
+def load_graph(path, attributes=True):
+    """Load a graph saved by save_graph."""
+    if path.endswith(".npz"):
+        return load_graph_npz(path, attributes=attributes)
+    return load_graph_json(path)
+
+
 # ============================================================
 # 🧠 Neo4j EXPORT
 # ============================================================
@@ -277,3 +430,127 @@ MERGE (a)-[:{rel}]->(b);
 
     with open(path, "w") as f:
         f.write("\n".join(lines))
+
+
+def _neo4j_props(node_id, attrs):
+    """Node properties Neo4j can store: the id plus scalar attributes."""
+    props = {"id": node_id}
+    for k, v in attrs.items():
+        if isinstance(v, float) and not math.isfinite(v):
+            continue
+        if isinstance(v, (str, int, float)) and k != "id":
+            props[k] = v
+    return props
+
+
+def _cypher_literal(value):
+    """Render a parameter value as a Cypher literal (maps use backticked keys)."""
+    if isinstance(value, dict):
+        items = ", ".join(f"`{str(k).replace('`', '``')}`: {_cypher_literal(v)}" for k, v in value.items())
+        return "{" + items + "}"
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(_cypher_literal(v) for v in value) + "]"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if value is None:
+        return "null"
+    # JSON string escapes (\", \\, \n, \uXXXX) are valid in Cypher string literals
+    return json.dumps(value)
+
+
+def _batches(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def export_neo4j_batched(G, path="graph.cypher", batch_size=NEO4J_BATCH_SIZE):
+    """
+    Export the graph as a cypher-shell script that loads in bulk.
+
+    A uniqueness constraint on :Signal(id) is created first, so every MERGE
+    is an index lookup. Nodes and relationships are then written as
+    `:param rows => [...]` batches of batch_size rows, each followed by one
+    `UNWIND $rows` statement. Relationship types cannot be parameterized,
+    so edges are grouped by relation. Run with `cypher-shell -f graph.cypher`.
+    """
+    if not isinstance(G, nx.Graph):
+        raise TypeError("G must be a NetworkX graph")
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    nodes = [_neo4j_props(node_id, attrs) for node_id, attrs in G.nodes(data=True)]
+    by_relation = {}
+    for u, v, attrs in G.edges(data=True):
+        by_relation.setdefault(attrs.get("relation", "RELATED_TO"), []).append({"a": u, "b": v})
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(
+            f"CREATE CONSTRAINT signal_id IF NOT EXISTS "
+            f"FOR (n:{NEO4J_LABEL}) REQUIRE n.id IS UNIQUE;\n"
+        )
+        for batch in _batches(nodes, batch_size):
+            f.write(f":param rows => {_cypher_literal(batch)}\n")
+            f.write(f"UNWIND $rows AS row MERGE (n:{NEO4J_LABEL} {{id: row.id}}) SET n += row;\n")
+        for rel, edges in by_relation.items():
+            for batch in _batches(edges, batch_size):
+                f.write(f":param rows => {_cypher_literal(batch)}\n")
+                f.write(
+                    f"UNWIND $rows AS row "
+                    f"MATCH (a:{NEO4J_LABEL} {{id: row.a}}) MATCH (b:{NEO4J_LABEL} {{id: row.b}}) "
+                    f"MERGE (a)-[:`{rel}`]->(b);\n"
+                )
+
+
+def _csv_type(values):
+    """neo4j-admin column type for a property: long/double when every value is numeric."""
+    if all(isinstance(v, int) and not isinstance(v, bool) for v in values):
+        return ":long"
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+        return ":double"
+    return ""
+
+
+def export_neo4j_admin_csv(G, out_dir="neo4j-import"):
+    """
+    Export the graph as nodes.csv / relationships.csv for offline import:
+
+        neo4j-admin database import full --multiline-fields=true \\
+            --nodes=nodes.csv --relationships=relationships.csv neo4j
+
+    This bypasses transactions entirely and is the fastest way to load a
+    large graph into an empty database.
+
+    Returns:
+        tuple: (nodes_path, relationships_path)
+    """
+    if not isinstance(G, nx.Graph):
+        raise TypeError("G must be a NetworkX graph")
+
+    os.makedirs(out_dir, exist_ok=True)
+    nodes_path = os.path.join(out_dir, "nodes.csv")
+    rels_path = os.path.join(out_dir, "relationships.csv")
+
+    nodes = [_neo4j_props(node_id, attrs) for node_id, attrs in G.nodes(data=True)]
+    columns = {}
+    for props in nodes:
+        for k, v in props.items():
+            if k != "id":
+                columns.setdefault(k, []).append(v)
+
+    with open(nodes_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id:ID"] + [f"{k}{_csv_type(vs)}" for k, vs in columns.items()] + [":LABEL"])
+        writer.writerows(
+            [props["id"]] + [props.get(k, "") for k in columns] + [NEO4J_LABEL]
+            for props in nodes
+        )
+
+    with open(rels_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([":START_ID", ":END_ID", ":TYPE"])
+        writer.writerows((u, v, attrs.get("relation", "RELATED_TO")) for u, v, attrs in G.edges(data=True))
+
+    return nodes_path, rels_path
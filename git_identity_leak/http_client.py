@@ -0,0 +1,210 @@
+# git_identity_leak/http_client.py
+"""
+Shared HTTP client used by every plugin and collector.
+
+All requests go through one requests.Session with per-host connection
+pools, so TCP/TLS connections are kept alive and reused between calls.
+Transient failures (connection errors, 429 and 5xx responses) are retried
+with jittered exponential backoff. When a cache is enabled, GET requests to
+cacheable hosts are revalidated against it (see cache.py). Requests to the
+GitHub API are signed with a token from the rate-limit-aware pool in
+ratelimit.py unless the caller sets Authorization itself.
+"""
+import random
+import threading
+import time
+
+from . import ratelimit
+
+# requests is imported on first use, so importing this module (and the CLI) stays cheap
+
+USER_AGENT = "git-identity-leak"
+
+# Pool and retry defaults, see configure()
+POOL_CONNECTIONS = 20       # number of hosts to keep pools for
+POOL_MAXSIZE = 20           # keep-alive connections per host
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5          # seconds
+BACKOFF_MAX = 30.0          # seconds
+DEFAULT_TIMEOUT = 10
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_config = {
+    "pool_connections": POOL_CONNECTIONS,
+    "pool_maxsize": POOL_MAXSIZE,
+    "max_retries": MAX_RETRIES,
+    "backoff_base": BACKOFF_BASE,
+    "backoff_max": BACKOFF_MAX,
+}
+_session = None
+_cache = None
+_lock = threading.Lock()
+
+
+def configure(pool_connections=None, pool_maxsize=None, max_retries=None, backoff_base=None, backoff_max=None):
+    """
+    Change pool sizes and retry policy. Takes effect on the next request.
+
+    Args:
+        pool_connections (int, optional): Number of per-host pools to keep.
+        pool_maxsize (int, optional): Maximum keep-alive connections per host.
+        max_retries (int, optional): Retries for 429/5xx and connection errors.
+        backoff_base (float, optional): Base delay of the exponential backoff.
+        backoff_max (float, optional): Upper bound for a single backoff delay.
+    """
+    global _session
+    updates = {
+        "pool_connections": pool_connections,
+        "pool_maxsize": pool_maxsize,
+        "max_retries": max_retries,
+        "backoff_base": backoff_base,
+        "backoff_max": backoff_max,
+    }
+    with _lock:
+        _config.update({k: v for k, v in updates.items() if v is not None})
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def enable_cache(cache_dir=None, max_bytes=None, max_age=None):
+    """
+    Enable the on-disk response cache for GET requests to cacheable hosts.
+
+    Args:
+        cache_dir (str, optional): Cache root, defaults to cache.DEFAULT_CACHE_DIR.
+        max_bytes (int, optional): Size limit before least recently used entries are evicted.
+        max_age (float, optional): Seconds after which entries are dropped.
+    """
+    global _cache
+    from .cache import HTTPCache, DEFAULT_CACHE_DIR, MAX_CACHE_BYTES, MAX_CACHE_AGE
+    _cache = HTTPCache(
+        cache_dir or DEFAULT_CACHE_DIR,
+        max_bytes=max_bytes or MAX_CACHE_BYTES,
+        max_age=max_age or MAX_CACHE_AGE,
+    )
+    return _cache
+
+
+def disable_cache():
+    global _cache
+    _cache = None
+
+
+def cache_dir():
+    """Root directory of the enabled cache, or None when caching is off."""
+    cache = _cache
+    return cache.cache_dir if cache is not None else None
+
+
+def get_session():
+    """Return the shared session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=_config["pool_connections"],
+                    pool_maxsize=_config["pool_maxsize"],
+                    max_retries=0,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers["User-Agent"] = USER_AGENT
+                _session = session
+    return _session
+
+
+def _backoff_delay(attempt, resp=None):
+    """Full-jitter exponential backoff, honouring Retry-After when present."""
+    if resp is not None:
+        retry_after = resp.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), _config["backoff_max"])
+    cap = min(_config["backoff_max"], _config["backoff_base"] * (2 ** attempt))
+    return random.uniform(0, cap)
+
+
+def request(method, url, **kwargs):
+    """
+    Send a request through the shared session, retrying transient failures.
+
+    Accepts the same keyword arguments as requests.request, plus retries
+    to override the configured retry count for this call. The last
+    response is returned even if it still has a retryable status, so
+    callers keep checking status_code as before.
+    """
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    pool = None
+    if not any(k.lower() == "authorization" for k in kwargs.get("headers") or {}):
+        pool = ratelimit.pool_for(url)
+
+    cache = _cache
+    if cache is not None and cache.cacheable(method, url, kwargs):
+        key = cache.key(url, kwargs.get("headers"), authenticated=pool is not None)
+        meta = cache.lookup(key)
+        if meta:
+            kwargs["headers"] = {**(kwargs.get("headers") or {}), **cache.conditional_headers(meta)}
+        resp = _send(method, url, pool, **kwargs)
+        if resp.status_code == 304 and meta:
+            return cache.revalidated(key, meta, resp)
+        cache.store(key, resp)
+        return resp
+    return _send(method, url, pool, **kwargs)
+
+
+def _send(method, url, pool=None, **kwargs):
+    import requests
+
+    retries = kwargs.pop("retries", None)
+    if retries is None:
+        retries = _config["max_retries"]
+    headers = kwargs.pop("headers", None) or {}
+
+    for attempt in range(retries + 1):
+        token = None
+        if pool is not None:
+            token = pool.acquire(url)
+            kwargs["headers"] = {**headers, "Authorization": f"Bearer {token}"}
+        else:
+            kwargs["headers"] = headers
+
+        try:
+            resp = get_session().request(method, url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt >= retries:
+                raise
+            time.sleep(_backoff_delay(attempt))
+            continue
+
+        if token is not None:
+            pool.update(token, url, resp)
+            # Quota ran out under us: reroute to another token (acquire waits if none is left)
+            if resp.status_code in (403, 429) and pool.exhausted(token, url) and attempt < retries:
+                resp.close()
+                continue
+
+        if resp.status_code not in RETRY_STATUSES or attempt >= retries:
+            return resp
+
+        delay = _backoff_delay(attempt, resp)
+        resp.close()
+        time.sleep(delay)
+
+    return resp
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def head(url, **kwargs):
+    return request("HEAD", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
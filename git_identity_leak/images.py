@@ -1,10 +1,17 @@
 # git_identity_leak/images.py
 import os
-import requests
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from . import http_client
 from urllib.parse import urlparse
 from datetime import datetime
 import hashlib
 
+IMAGE_WORKERS = 8
+CHUNK_SIZE = 64 * 1024
+INDEX_FILE = "index.json"
+
 def sanitize_filename(url):
     parsed = urlparse(url)
     path = parsed.path.lstrip("/").replace("/", "_")
@@ -13,33 +20,144 @@ def sanitize_filename(url):
     ext = path.split(".")[-1] if "." in path else "jpg"
     return f"{path}.{ext}"
 
-def fetch_images_from_urls(urls, output_dir):
-    signals = []
 
-    for url in urls:
+class ImageStore:
+    """
+    Content-addressed image store: files live at <root>/<sha1[:2]>/<sha1>.<ext>,
+    so identical images downloaded for different users are stored once.
+    index.json maps each source URL to its file and validators (ETag /
+    Last-Modified) so later runs can skip unchanged images with a 304.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.index_path = os.path.join(root, INDEX_FILE)
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()     # one read-merge-write of index.json at a time
+        os.makedirs(root, exist_ok=True)
         try:
-            filename = sanitize_filename(url)
-            full_path = os.path.join(output_dir, filename)
-            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            self.index = {}
+
+    def path_for(self, sha1, ext):
+        return os.path.join(self.root, sha1[:2], f"{sha1}.{ext}")
+
+    def fetch(self, url):
+        """
+        Download url into the store unless the stored copy is still current.
+
+        Returns:
+            tuple: (path, sha1, cached)
+        """
+        with self._lock:
+            entry = self.index.get(url)
+        headers = {}
+        if entry and os.path.exists(entry["path"]):
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
 
-            resp = requests.get(url, timeout=10)
+        resp = http_client.get(url, headers=headers, stream=True, timeout=10)
+        try:
+            if resp.status_code == 304 and headers:
+                return entry["path"], entry["sha1"], True
             resp.raise_for_status()
-            with open(full_path, "wb") as f:
-                f.write(resp.content)
 
-            # Optional: compute SHA1 hash for deduplication
-            hash_val = hashlib.sha1(resp.content).hexdigest()
+            # Hash while streaming to a temp file, then move into place by hash
+            ext = sanitize_filename(url).rsplit(".", 1)[-1]
+            tmp_path = os.path.join(self.root, f".{os.getpid()}.{threading.get_ident()}.part")
+            sha1 = hashlib.sha1()
+            try:
+                with open(tmp_path, "wb") as f:
+                    for chunk in resp.iter_content(CHUNK_SIZE):
+                        sha1.update(chunk)
+                        f.write(chunk)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+        finally:
+            resp.close()
+
+        digest = sha1.hexdigest()
+        path = self.path_for(digest, ext)
+        if os.path.exists(path):
+            os.remove(tmp_path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+
+        with self._lock:
+            self.index[url] = {
+                "path": path,
+                "sha1": digest,
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+            }
+        return path, digest, False
+
+    def save_index(self):
+        """
+        Write the index, merged with whatever is on disk so entries saved
+        by other processes since this store was opened are kept.
+        """
+        tmp_path = f"{self.index_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with self._save_lock:
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    merged = json.load(f)
+            except (OSError, ValueError):
+                merged = {}
+            with self._lock:
+                merged.update(self.index)
+                self.index = merged
+                data = json.dumps(merged)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, self.index_path)
+
+
+_stores = {}
+_stores_lock = threading.Lock()
 
+
+def image_store(root):
+    """The process-wide ImageStore for root, shared by concurrent audits."""
+    key = os.path.abspath(root)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = ImageStore(root)
+        return _stores[key]
+
+
+def fetch_images_from_urls(urls, output_dir, workers=IMAGE_WORKERS):
+    signals = []
+    store = image_store(output_dir)
+
+    def fetch(url):
+        try:
+            return url, store.fetch(url)
+        except Exception as e:
+            print(f"[!] Image fetch failed: {e}")
+            return url, None
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for url, result in executor.map(fetch, dict.fromkeys(urls)):
+            if result is None:
+                continue
+            full_path, hash_val, cached = result
             signals.append({
                 "signal_type": "IMAGE_FILE",
                 "value": full_path,
                 "confidence": "HIGH",
                 "source": "Image",
                 "collected_at": datetime.utcnow().isoformat() + "Z",
-                "hash": hash_val
+                "hash": hash_val,
+                "meta": {"url": url, "cached": cached},
             })
 
-        except Exception as e:
-            print(f"[!] Image fetch failed: {e}")
-
+    store.save_index()
     return signals
@@ -1,4 +1,4 @@
-from schemas import Signal
+from .schemas import Signal
 
 def apply_inference(signals: list[Signal]) -> list[Signal]:
     """
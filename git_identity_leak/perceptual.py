@@ -0,0 +1,212 @@
+# git_identity_leak/perceptual.py
+"""
+Perceptual image hashes and a BK-tree index for near-duplicate lookup.
+
+The SHA1 on IMAGE_FILE signals only matches byte-identical files. aHash,
+dHash and pHash stay (nearly) the same when an avatar is re-encoded,
+resized or slightly recoloured, so two images are "visually similar" when
+the Hamming distance between their hashes is small. The BK-tree answers
+"which stored hashes are within distance d" without a pairwise scan.
+"""
+import json
+import os
+import threading
+
+import numpy as np
+from PIL import Image
+
+HASH_SIZE = 8               # 8x8 -> 64-bit hashes
+PHASH_HIGHFREQ = 4          # pHash DCT input is HASH_SIZE * PHASH_HIGHFREQ square
+MATCH_DISTANCE = 10         # max pHash Hamming distance for a SIMILAR_AVATAR match
+
+
+def _bits_to_int(bits):
+    value = 0
+    for bit in bits.flatten():
+        value = (value << 1) | int(bit)
+    return value
+
+
+def _grey(img, width, height):
+    return np.asarray(img.convert("L").resize((width, height), Image.LANCZOS), dtype=np.float64)
+
+
+def average_hash(img, size=HASH_SIZE):
+    pixels = _grey(img, size, size)
+    return _bits_to_int(pixels > pixels.mean())
+
+
+def difference_hash(img, size=HASH_SIZE):
+    pixels = _grey(img, size + 1, size)
+    return _bits_to_int(pixels[:, 1:] > pixels[:, :-1])
+
+
+def _dct_matrix(n):
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    m = np.cos(np.pi * (2 * i + 1) * k / (2 * n))
+    m[0] *= 1 / np.sqrt(2)
+    return m * np.sqrt(2 / n)
+
+
+def phash(img, size=HASH_SIZE, highfreq=PHASH_HIGHFREQ):
+    n = size * highfreq
+    pixels = _grey(img, n, n)
+    d = _dct_matrix(n)
+    low = (d @ pixels @ d.T)[:size, :size]
+    return _bits_to_int(low > np.median(low))
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+def hash_file(path):
+    """
+    Compute all three hashes of an image file.
+
+    Returns:
+        dict: {"ahash", "dhash", "phash"} as 16-digit hex strings, or None if unreadable
+    """
+    try:
+        with Image.open(path) as img:
+            img.load()
+            return {
+                "ahash": f"{average_hash(img):016x}",
+                "dhash": f"{difference_hash(img):016x}",
+                "phash": f"{phash(img):016x}",
+            }
+    except Exception as e:
+        print(f"[!] Perceptual hash failed for {path}: {e}")
+        return None
+
+
+def hash_files(paths):
+    """
+    Hash many files in this thread. An audit has only a few images;
+    concurrent batch audits hash theirs on their own threads, and Pillow
+    releases the GIL while decoding and resizing.
+    """
+    return [hash_file(p) for p in paths]
+
+
+class BKTree:
+    """
+    Burkhard-Keller tree over 64-bit hashes with Hamming distance.
+
+    Nodes are kept in a flat list, each [hash, items, {distance: child index}],
+    which keeps both lookups and JSON persistence free of recursion.
+    """
+
+    def __init__(self, nodes=None):
+        self.nodes = nodes or []
+
+    def add(self, h, item):
+        if not self.nodes:
+            self.nodes.append([h, [item], {}])
+            return
+        i = 0
+        while True:
+            node = self.nodes[i]
+            d = hamming(h, node[0])
+            if d == 0:
+                if item not in node[1]:
+                    node[1].append(item)
+                return
+            child = node[2].get(d)
+            if child is None:
+                node[2][d] = len(self.nodes)
+                self.nodes.append([h, [item], {}])
+                return
+            i = child
+
+    def search(self, h, max_distance):
+        """Return [(distance, item)] for every stored hash within max_distance of h."""
+        results = []
+        stack = [0] if self.nodes else []
+        while stack:
+            node = self.nodes[stack.pop()]
+            d = hamming(h, node[0])
+            if d <= max_distance:
+                results.extend((d, item) for item in node[1])
+            # Triangle inequality: only children at distance d +- max_distance can match
+            for dist, child in node[2].items():
+                if d - max_distance <= dist <= d + max_distance:
+                    stack.append(child)
+        results.sort(key=lambda r: r[0])
+        return results
+
+    def __len__(self):
+        return len(self.nodes)
+
+
+class PerceptualIndex:
+    """
+    Persistent pHash index of audited identities' images.
+
+    Items are {"username", "path"} dicts; the tree is stored as JSON.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.tree = BKTree()
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.tree = BKTree([[int(h, 16), items, {int(d): c for d, c in children.items()}]
+                                for h, items, children in data["nodes"]])
+
+    def add(self, phash_hex, username, path):
+        with self._lock:
+            self.tree.add(int(phash_hex, 16), {"username": username, "path": path})
+
+    def similar(self, phash_hex, max_distance=MATCH_DISTANCE):
+        with self._lock:
+            return self.tree.search(int(phash_hex, 16), max_distance)
+
+    def save(self, path=None):
+        path = path or self.path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._lock:
+            data = {"nodes": [[f"{h:016x}", items, children] for h, items, children in self.tree.nodes]}
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+
+def annotate_image_signals(signals, username, index=None, max_distance=MATCH_DISTANCE):
+    """
+    Add perceptual hashes to IMAGE_FILE signals and, with an index, look up
+    other audited identities using a visually similar image.
+
+    Returns:
+        list[dict]: SIMILAR_AVATAR signals for matches belonging to other usernames
+    """
+    image_signals = [s for s in signals if s.get("signal_type") == "IMAGE_FILE"]
+    hashes = hash_files([s["value"] for s in image_signals])
+
+    matches = []
+    for s, hashes_ in zip(image_signals, hashes):
+        if not hashes_:
+            continue
+        s["phash"] = hashes_
+        if index is None:
+            continue
+        seen = set()
+        for distance, item in index.similar(hashes_["phash"], max_distance):
+            if item["username"] == username or item["username"] in seen:
+                continue
+            seen.add(item["username"])
+            matches.append({
+                "signal_type": "SIMILAR_AVATAR",
+                "value": item["username"],
+                "confidence": "HIGH" if distance <= max_distance // 2 else "MEDIUM",
+                "source": "Image",
+                "collected_at": s.get("collected_at"),
+                "meta": {"distance": distance, "image": s["value"], "other_image": item["path"]},
+            })
+        index.add(hashes_["phash"], username, s["value"])
+    return matches
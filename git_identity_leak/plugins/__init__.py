@@ -1,4 +1,10 @@
 import importlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+
+from ..schemas import SignalBatch
 
 # Map internal plugin names to display names
 PLUGIN_NAME_MAP = {
@@ -8,13 +14,80 @@ PLUGIN_NAME_MAP = {
     "linkedin": "LinkedIn",
 }
 
+# Built-in plugins: name -> module, imported on first use
+PLUGIN_REGISTRY = {
+    "github": "git_identity_leak.plugins.github",
+    "reddit": "git_identity_leak.plugins.reddit",
+    "x": "git_identity_leak.plugins.x",
+    "linkedin": "git_identity_leak.plugins.linkedin",
+}
+# Other packages can add plugins under this entry point group, e.g. in pyproject.toml:
+#   [project.entry-points."git_identity_leak.plugins"]
+#   gitlab = "my_package.gitlab_plugin"
+ENTRY_POINT_GROUP = "git_identity_leak.plugins"
+
+# Default deadlines (seconds) for concurrent collection
+PLUGIN_TIMEOUT = 30
+GLOBAL_TIMEOUT = 60
+
+_loaded = {}                # name -> imported plugin module
+_names = {}                 # module name -> plugin name
+_entry_points = None
+_registry_lock = threading.Lock()
+
+
+def register_plugin(name, module_path, display_name=None):
+    """Make a plugin module available under name without importing it yet."""
+    PLUGIN_REGISTRY[name] = module_path
+    if display_name:
+        PLUGIN_NAME_MAP[name] = display_name
+
+
+def _discover_entry_points():
+    """Plugins published by installed packages; looked up once, and only when needed."""
+    global _entry_points
+    if _entry_points is None:
+        try:
+            from importlib.metadata import entry_points
+            _entry_points = {ep.name: ep for ep in entry_points(group=ENTRY_POINT_GROUP)}
+        except Exception:
+            _entry_points = {}
+    return _entry_points
+
+
+def available_plugins():
+    """Names of all registered and entry point plugins."""
+    return sorted(set(PLUGIN_REGISTRY) | set(_discover_entry_points()))
+
+
+def get_plugin(name):
+    """
+    Import a plugin by name on first use and cache it.
+
+    Raises:
+        ModuleNotFoundError: If no registered or entry point plugin has that name.
+    """
+    with _registry_lock:
+        if name in _loaded:
+            return _loaded[name]
+    if name in PLUGIN_REGISTRY:
+        module = importlib.import_module(PLUGIN_REGISTRY[name])
+    elif name in _discover_entry_points():
+        module = _discover_entry_points()[name].load()
+    else:
+        raise ModuleNotFoundError(f"No plugin named {name}")
+    with _registry_lock:
+        _loaded[name] = module
+        _names[module.__name__] = name
+    return module
+
 
 def load_plugins(plugin_names):
     """
-    Dynamically load plugins by name.
+    Load plugins by name, importing each one on first use.
 
     Args:
-        plugin_names (list[str]): Plugin module names
+        plugin_names (list[str]): Plugin names, see available_plugins()
 
     Returns:
         list[module]: Loaded plugin modules
@@ -22,10 +95,8 @@ def load_plugins(plugin_names):
     plugins = []
 
     for name in plugin_names:
-        module_path = f"git_identity_leak.plugins.{name}"
         try:
-            module = importlib.import_module(module_path)
-            plugins.append(module)
+            plugins.append(get_plugin(name))
         except ModuleNotFoundError:
             display = PLUGIN_NAME_MAP.get(name, name)
             print(f"[!] Plugin {display} not found. Skipping.")
@@ -34,3 +105,120 @@ def load_plugins(plugin_names):
             print(f"[!] Error loading plugin {display}: {e}")
 
     return plugins
+
+
+def plugin_name(plugin):
+    """Short plugin name, e.g. "github" for git_identity_leak.plugins.github."""
+    return _names.get(plugin.__name__) or plugin.__name__.rsplit(".", 1)[-1]
+
+
+def prefetch_plugins(plugins, usernames):
+    """
+    Give plugins that support it (a module-level prefetch(usernames)) the
+    chance to fetch data for several upcoming targets in one go.
+    """
+    for plugin in plugins:
+        hook = getattr(plugin, "prefetch", None)
+        if hook is None:
+            continue
+        try:
+            hook(usernames)
+        except Exception as e:
+            print(f"[!] Error prefetching for plugin {plugin.__name__}: {e}")
+
+
+# Signals standing in for a plugin's results when it timed out or raised
+FAILURE_SIGNAL_TYPES = ("PLUGIN_TIMEOUT", "PLUGIN_ERROR")
+
+
+def _failure_signal(signal_type, name, reason):
+    return {
+        "signal_type": signal_type,
+        "value": name,
+        "confidence": "LOW",
+        "source": PLUGIN_NAME_MAP.get(name, name),
+        "collected_at": datetime.utcnow().isoformat() + "Z",
+        "meta": {"plugin": name, "reason": reason},
+    }
+
+
+def failed_plugins(signals):
+    """Names of the plugins that timed out or raised, from their failure signals."""
+    return sorted({s["value"] for s in signals if s["signal_type"] in FAILURE_SIGNAL_TYPES})
+
+
+def run_plugins(plugins, username, plugin_timeout=PLUGIN_TIMEOUT, global_timeout=GLOBAL_TIMEOUT, plugin_options=None,
+                on_result=None, plugin_signals=None):
+    """
+    Run every plugin's collect() concurrently.
+
+    Each plugin gets its own deadline (plugin_timeout) and the whole run is
+    bounded by global_timeout. Plugins that miss their deadline are abandoned
+    and reported with a PLUGIN_TIMEOUT signal instead of their results, so
+    the audit takes as long as the slowest source at most; plugins that
+    raise are reported with a PLUGIN_ERROR signal.
+
+    Args:
+        plugins (list[module]): Loaded plugin modules
+        username (str): Target username
+        plugin_timeout (float): Per-plugin deadline in seconds
+        global_timeout (float): Deadline for the whole run in seconds
+        plugin_options (dict, optional): Plugin name -> keyword arguments for its collect()
+        on_result (callable, optional): Called with each plugin's signals as soon as it finishes
+        plugin_signals (dict, optional): Filled with plugin name -> signals for every
+            plugin that finished without timing out or raising
+
+    Returns:
+        SignalBatch: Signals from all plugins, in plugin order
+    """
+    if not plugins:
+        return SignalBatch()
+
+    start = time.monotonic()
+    global_deadline = start + global_timeout
+    results = {}
+    plugin_options = plugin_options or {}
+
+    executor = ThreadPoolExecutor(max_workers=len(plugins), thread_name_prefix="plugin")
+    try:
+        futures = {
+            executor.submit(p.collect, username, **plugin_options.get(plugin_name(p), {})): p
+            for p in plugins
+        }
+        deadlines = {f: min(start + plugin_timeout, global_deadline) for f in futures}
+        pending = set(futures)
+
+        while pending:
+            now = time.monotonic()
+            for f in [f for f in pending if deadlines[f] <= now]:
+                name = plugin_name(futures[f])
+                reason = "global" if deadlines[f] >= global_deadline else "plugin"
+                f.cancel()
+                pending.discard(f)
+                results[f] = [_failure_signal("PLUGIN_TIMEOUT", name, reason)]
+                if on_result:
+                    on_result(results[f])
+                print(f"[!] Plugin {PLUGIN_NAME_MAP.get(name, name)} timed out. Skipping.")
+            if not pending:
+                break
+
+            next_deadline = min(deadlines[f] for f in pending)
+            done, pending = wait(pending, timeout=max(0, next_deadline - now), return_when=FIRST_COMPLETED)
+            for f in done:
+                try:
+                    results[f] = f.result() or []
+                    if plugin_signals is not None:
+                        plugin_signals[plugin_name(futures[f])] = list(results[f])
+                except Exception as e:
+                    print(f"[!] Error collecting from plugin {futures[f].__name__}: {e}")
+                    results[f] = [_failure_signal("PLUGIN_ERROR", plugin_name(futures[f]), str(e))]
+                if on_result and results[f]:
+                    on_result(results[f])
+    finally:
+        # Do not block on stragglers; their threads finish in the background
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    signals = SignalBatch()
+    for f in futures:
+        signals.extend(results.get(f, []))
+    return signals
@@ -1,188 +1,749 @@
 # git_identity_leak/plugins/github.py
+import json
 import os
-import requests
+import threading
+from .. import http_client, ratelimit
+from ..schemas import SignalBatch
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from bs4 import BeautifulSoup
-import re
+from urllib.parse import parse_qs, urlparse
 
 GITHUB_GRAPHQL = "https://api.github.com/graphql"
+PER_PAGE = 100
+PAGE_WORKERS = 8    # concurrent page requests per paginated list
+GRAPHQL_BATCH_SIZE = 10    # users aliased into one GraphQL query
+MAX_REPOS = 1000    # stop collecting repositories after this many
+README_WORKERS = 8    # concurrent README downloads
+README_EXCERPT = 2000    # characters of README text kept on REPO_SUMMARY
+STATE_VERSION = 1    # layout of the incremental state dict
+CONTRIBUTION_YEARS_PER_QUERY = 4    # calendar years aliased into one contributions query
+CONTRIBUTION_WORKERS = 4    # concurrent contribution queries
+CONTRIBUTION_CACHE_VERSION = 1    # layout of the per-user contribution year cache
 
-def collect(username):
+# (REST field, signal type, confidence)
+PROFILE_FIELDS = [
+    ("name", "NAME", "HIGH"),
+    ("login", "USERNAME", "HIGH"),
+    ("avatar_url", "IMAGE", "HIGH"),
+    ("bio", "BIO", "MEDIUM"),
+    ("email", "EMAIL", "HIGH"),
+    ("company", "COMPANY", "MEDIUM"),
+    ("location", "LOCATION", "MEDIUM"),
+    ("blog", "URL", "MEDIUM"),
+]
+
+USER_FRAGMENT = """
+fragment UserFields on User {
+  login
+  createdAt
+  name
+  avatarUrl
+  bio
+  email
+  company
+  location
+  websiteUrl
+  followers(first: 100) { totalCount pageInfo { hasNextPage endCursor } nodes { login } }
+  following(first: 100) { totalCount pageInfo { hasNextPage endCursor } nodes { login } }
+  repositories(first: 100, privacy: PUBLIC, ownerAffiliations: OWNER, orderBy: {field: UPDATED_AT, direction: DESC}) {
+    totalCount
+    pageInfo { hasNextPage endCursor }
+    nodes { %s }
+  }
+  contributionsCollection {
+    contributionCalendar {
+      totalContributions
+      weeks { contributionDays { date contributionCount } }
+    }
+  }
+}
+"""
+CALENDAR_FIELDS = "contributionCalendar { totalContributions weeks { contributionDays { date contributionCount } } }"
+REPO_FIELDS = "name description stargazerCount primaryLanguage { name } updatedAt defaultBranchRef { name }"
+
+# Connection name -> fields selected on each node
+CONNECTIONS = {
+    "followers": "login",
+    "following": "login",
+    "repositories": REPO_FIELDS,
+}
+
+_prefetched = {}
+_prefetch_lock = threading.Lock()
+
+
+def _signal(signal_type, value, confidence, source, collected_at):
+    return {
+        "signal_type": signal_type,
+        "value": value,
+        "confidence": confidence,
+        "source": source,
+        "collected_at": collected_at,
+    }
+
+
+def _page_url(url, page):
+    sep = "&" if "?" in url else "?"
+    return f"{url}{sep}per_page={PER_PAGE}&page={page}"
+
+
+def fetch_all_pages(url, headers=None, page_workers=PAGE_WORKERS, max_pages=None):
+    """
+    Fetch every page of a paginated REST list endpoint.
+
+    The first page is fetched on its own; its Link rel="last" header tells
+    how many pages there are, and the rest are then fetched concurrently.
+    Each page body is parsed once.
+
+    Args:
+        url (str): List endpoint without paging parameters.
+        headers (dict, optional): Request headers.
+        page_workers (int): Maximum concurrent page requests.
+        max_pages (int, optional): Stop after this many pages.
+
+    Returns:
+        list: Items from all pages, in page order.
+    """
+    resp = http_client.get(_page_url(url, 1), headers=headers, timeout=10)
+    if resp.status_code != 200:
+        return []
+    items = resp.json()
+    last = resp.links.get("last")
+    if not items or not last:
+        return items
+
+    last_page = int(parse_qs(urlparse(last["url"]).query).get("page", ["1"])[0])
+    if max_pages:
+        last_page = min(last_page, max_pages)
+
+    def fetch(page):
+        r = http_client.get(_page_url(url, page), headers=headers, timeout=10)
+        return r.json() if r.status_code == 200 else []
+
+    with ThreadPoolExecutor(max_workers=max(1, page_workers)) as executor:
+        for page_items in executor.map(fetch, range(2, last_page + 1)):
+            items.extend(page_items)
+    return items
+
+
+def fetch_pages_since(url, headers=None, known=None, max_pages=None):
+    """
+    Fetch pages of a list endpoint in order until known(item) is true.
+
+    Used with lists sorted newest first, so everything after the first
+    known item was already seen on an earlier run.
+
+    Returns:
+        tuple: (items before the first known one, whether a known item was reached)
+    """
+    items = []
+    page = 1
+    while True:
+        resp = http_client.get(_page_url(url, page), headers=headers, timeout=10)
+        if resp.status_code != 200:
+            return items, False
+        for item in resp.json():
+            if known and known(item):
+                return items, True
+            items.append(item)
+        if "next" not in resp.links or (max_pages and page >= max_pages):
+            return items, False
+        page += 1
+
+
+# ------------------------------------------------------------
+# Signal builders shared by the REST and GraphQL paths
+# ------------------------------------------------------------
+
+def _profile_signals(data, source, collected_at):
     signals = []
-    collected_at = datetime.utcnow().isoformat() + "Z"
+    for field, signal_name, confidence in PROFILE_FIELDS:
+        value = data.get(field)
+        if value:
+            signals.append(_signal(signal_name, value, confidence, source, collected_at))
+    # Followers / following counts
+    for f in ["followers", "following", "public_repos"]:
+        signals.append(_signal(f.upper(), str(data.get(f, 0)), "HIGH", source, collected_at))
+    return signals
+
+
+def _connection_signals(followers, following, source, collected_at):
+    # Follower lists can be huge; add them column-wise instead of one dict each
+    signals = SignalBatch()
+    signals.extend_values("FOLLOWER_USERNAME", sorted(followers - following), "MEDIUM", source, collected_at)
+    signals.extend_values("FOLLOWING_USERNAME", sorted(following - followers), "MEDIUM", source, collected_at)
+    signals.extend_values("MUTUAL_CONNECTION", sorted(followers & following), "HIGH", source, collected_at)
+    return signals
 
-    token = os.environ.get("GITHUB_TOKEN")
-    headers = {"Authorization": f"Bearer {token}"} if token else {}
 
-    # --- 1) REST API for profile, followers, repos, etc ---
+def fetch_readme(owner, repo):
+    """Fetch README.md from the repo's default branch, or None."""
+    branch = repo.get("default_branch") or "HEAD"
+    url = f"https://raw.githubusercontent.com/{owner}/{repo.get('name')}/{branch}/README.md"
     try:
-        r = requests.get(f"https://api.github.com/users/{username}", headers=headers, timeout=10)
+        r = http_client.get(url, timeout=10)
         if r.status_code == 200:
-            data = r.json()
-            # Basic profile
-            for field, signal_name, confidence in [
-                ("name", "NAME", "HIGH"),
-                ("login", "USERNAME", "HIGH"),
-                ("avatar_url", "IMAGE", "HIGH"),
-                ("bio", "BIO", "MEDIUM"),
-                ("email", "EMAIL", "HIGH"),
-                ("company", "COMPANY", "MEDIUM"),
-                ("location", "LOCATION", "MEDIUM"),
-                ("blog", "URL", "MEDIUM"),
-            ]:
-                value = data.get(field)
-                if value:
-                    signals.append({
-                        "signal_type": signal_name,
-                        "value": value,
-                        "confidence": confidence,
-                        "source": "GitHub REST",
-                        "collected_at": collected_at,
-                    })
-            # Followers / following counts
-            for f in ["followers", "following", "public_repos"]:
-                signals.append({
-                    "signal_type": f.upper(),
-                    "value": str(data.get(f, 0)),
-                    "confidence": "HIGH",
-                    "source": "GitHub REST",
-                    "collected_at": collected_at,
-                })
-
-            # Followers / following usernames
-            def get_all_users(url):
-                users = set()
-                page = 1
-                while True:
-                    resp = requests.get(f"{url}?per_page=100&page={page}", headers=headers, timeout=10)
-                    if resp.status_code != 200 or not resp.json():
-                        break
-                    for u in resp.json():
-                        login = u.get("login")
-                        if login:
-                            users.add(login)
-                    page += 1
-                return users
-
-            followers = get_all_users(f"https://api.github.com/users/{username}/followers")
-            following = get_all_users(f"https://api.github.com/users/{username}/following")
-
-            for u in sorted(followers - following):
-                signals.append({"signal_type": "FOLLOWER_USERNAME","value": u,"confidence":"MEDIUM","source":"GitHub REST","collected_at":collected_at})
-            for u in sorted(following - followers):
-                signals.append({"signal_type": "FOLLOWING_USERNAME","value": u,"confidence":"MEDIUM","source":"GitHub REST","collected_at":collected_at})
-            for u in sorted(followers & following):
-                signals.append({"signal_type": "MUTUAL_CONNECTION","value": u,"confidence":"HIGH","source":"GitHub REST","collected_at":collected_at})
-
-            # Repos
-            repos_resp = requests.get(data["repos_url"], headers=headers, timeout=10)
-            if repos_resp.status_code == 200:
-                for repo in repos_resp.json():
-                    repo_name = repo.get("name")
-                    description = repo.get("description") or ""
-                    stars = repo.get("stargazers_count",0)
-                    language = repo.get("language") or "Unknown"
-                    updated = repo.get("updated_at","").split("T")[0]
-                    risk = "LOW"
-                    try:
-                        dt = datetime.strptime(updated, "%Y-%m-%d")
-                        days_since = (datetime.utcnow() - dt).days
-                        if days_since > 365:
-                            risk = "HIGH"
-                        elif days_since > 90:
-                            risk = "MEDIUM"
-                    except:
-                        pass
-                    readme_url = f"https://raw.githubusercontent.com/{username}/{repo_name}/master/README.md"
-                    signals.append({
-                        "signal_type": "REPO_SUMMARY",
-                        "value": f"{repo_name} | Stars: {stars} | {description} | Lang: {language} | Last Updated: {updated} | Inactivity: {risk} | README: {readme_url}",
-                        "confidence": "HIGH",
-                        "source": "GitHub REST",
-                        "collected_at": collected_at,
-                    })
-                    signals.append({
-                        "signal_type": "INACTIVITY_SCORE",
-                        "value": f"{repo_name}: {risk}",
-                        "confidence": "MEDIUM",
-                        "source": "GitHub REST",
-                        "collected_at": collected_at,
-                    })
+            return r.text
     except Exception as e:
-        print("[!] REST API error:", e)
+        print(f"[!] README fetch failed for {repo.get('name')}: {e}")
+    return None
+
+
+def _repo_summary(repo, username, source, collected_at, readme=None):
+    repo_name = repo.get("name")
+    description = repo.get("description") or ""
+    stars = repo.get("stargazers_count",0)
+    language = repo.get("language") or "Unknown"
+    updated = (repo.get("updated_at") or "").split("T")[0]
+    branch = repo.get("default_branch") or "HEAD"
+    risk = "LOW"
+    try:
+        dt = datetime.strptime(updated, "%Y-%m-%d")
+        days_since = (datetime.utcnow() - dt).days
+        if days_since > 365:
+            risk = "HIGH"
+        elif days_since > 90:
+            risk = "MEDIUM"
+    except:
+        pass
+    readme_url = f"https://raw.githubusercontent.com/{username}/{repo_name}/{branch}/README.md"
+    summary = _signal(
+        "REPO_SUMMARY",
+        f"{repo_name} | Stars: {stars} | {description} | Lang: {language} | Last Updated: {updated} | Inactivity: {risk} | README: {readme_url}",
+        "HIGH", source, collected_at,
+    )
+    if readme is not None:
+        summary["meta"] = {"repo": repo_name, "default_branch": branch, "readme": readme[:README_EXCERPT]}
+    return [summary, _signal("INACTIVITY_SCORE", f"{repo_name}: {risk}", "MEDIUM", source, collected_at)]
+
+
+def _repo_signals(repos, username, source, collected_at, fetch_readmes=False, readme_workers=README_WORKERS):
+    """
+    Build REPO_SUMMARY / INACTIVITY_SCORE signals from REST-shaped repo dicts.
+
+    With fetch_readmes, READMEs are downloaded concurrently and each repo's
+    signals are emitted as soon as its README arrives.
+    """
+    signals = []
+    if not fetch_readmes:
+        for repo in repos:
+            signals.extend(_repo_summary(repo, username, source, collected_at))
+        return signals
+
+    # READMEs kept from an earlier run (incremental state) are not fetched again
+    missing = []
+    for repo in repos:
+        if repo.get("readme") is not None:
+            signals.extend(_repo_summary(repo, username, source, collected_at, readme=repo["readme"]))
+        else:
+            missing.append(repo)
+
+    with ThreadPoolExecutor(max_workers=max(1, readme_workers)) as executor:
+        futures = {executor.submit(fetch_readme, username, repo): repo for repo in missing}
+        for f in as_completed(futures):
+            repo, readme = futures[f], f.result()
+            if readme is not None:
+                repo["readme"] = readme[:README_EXCERPT]
+            signals.extend(_repo_summary(repo, username, source, collected_at, readme=readme))
+    return signals
+
+
+# ------------------------------------------------------------
+# Incremental state
+# ------------------------------------------------------------
+# A caller-owned dict carried between runs (see snapshots.SnapshotStore):
+#   {"version", "repos": [REST-shaped repo dicts, newest first], "since": newest updated_at,
+#    "followers"/"following": {"fingerprint": [...], "logins": [...]}}
+# collect() reads it to skip unchanged data and writes the new state back into it.
+
+REPO_KEYS = ("name", "description", "stargazers_count", "language", "updated_at", "default_branch", "readme")
+
+
+def _slim_repo(repo):
+    return {k: repo.get(k) for k in REPO_KEYS if repo.get(k) is not None}
+
+
+def _usable_state(state):
+    return state if state and state.get("version") == STATE_VERSION else {}
+
+
+def _merge_repos(fresh, stored):
+    """Repos updated since the last run replace their stored copies; newest first."""
+    merged = {r["name"]: r for r in stored}
+    for repo in fresh:
+        old = merged.get(repo["name"])
+        # An unchanged README excerpt is kept when only metadata moved
+        if old and "readme" in old and old.get("updated_at") == repo.get("updated_at"):
+            repo.setdefault("readme", old["readme"])
+        merged[repo["name"]] = repo
+    return sorted(merged.values(), key=lambda r: r.get("updated_at") or "", reverse=True)
+
+
+def _still_listed(stored, fresh):
+    """Stored repos that are still present in a full listing (only their READMEs are reused)."""
+    names = {r["name"] for r in fresh}
+    return [r for r in stored if r["name"] in names]
+
+
+def _save_state(state, repos, connections=None):
+    if state is None:
+        return
+    state.clear()
+    state.update({
+        "version": STATE_VERSION,
+        "repos": [_slim_repo(r) for r in repos],
+        "since": max((r.get("updated_at") or "" for r in repos), default=""),
+    })
+    state.update(connections or {})
+
+
+def _contribution_signals(days, collected_at):
+    """Contribution signals from a contributions.ContributionCalendar."""
+    from ..contributions import YEAR_DAYS
+
+    signals = []
+    signals.append(_signal("CONTRIBUTION_TOTAL", str(days.total), "HIGH", "GitHub GraphQL", collected_at))
+    weekday, weekend = days.weekday_weekend()
+    s = _signal("CONTRIBUTION_TIME_PATTERN", f"Weekdays: {weekday}, Weekends: {weekend}", "MEDIUM", "GitHub GraphQL", collected_at)
+    s["meta"] = days.summary()
+    signals.append(s)
+    for year,count in days.yearly_totals().items():
+        s = _signal("CONTRIBUTIONS_YEAR", year, "HIGH", "GitHub GraphQL", collected_at)
+        s["meta"] = {"year":year,"count":count}
+        signals.append(s)
+    # Per-day values stay at a year like the profile calendar (plots and graph nodes
+    # scale with them); a longer history gets its own signal
+    signals.append(_signal("CONTRIBUTIONS_YEARLY_DATES", days.last().days(), "HIGH", "GitHub GraphQL", collected_at))
+    if len(days) > YEAR_DAYS:
+        signals.append(_signal("CONTRIBUTIONS_HISTORY_DATES", days.days(), "HIGH", "GitHub GraphQL", collected_at))
+    return signals
+
+
+# ------------------------------------------------------------
+# GraphQL collection
+# ------------------------------------------------------------
+
+def _graphql(query, variables, headers):
+    r = http_client.post(GITHUB_GRAPHQL, headers=headers, json={"query": query, "variables": variables}, timeout=15)
+    if r.status_code != 200:
+        raise RuntimeError(f"GraphQL HTTP {r.status_code}")
+    payload = r.json()
+    if payload.get("errors") and not payload.get("data"):
+        raise RuntimeError(payload["errors"][0].get("message", "GraphQL error"))
+    return payload.get("data") or {}
+
+
+def fetch_users_graphql(usernames, headers):
+    """
+    Fetch profile, first pages of followers/following/repositories and the
+    contribution calendar for several users in one aliased query
+    (u0: user(login: $l0) ... u1: user(login: $l1) ...).
+
+    Returns:
+        dict: username -> raw GraphQL user object (None if not found)
+    """
+    usernames = list(usernames)
+    params = ", ".join(f"$l{i}: String!" for i in range(len(usernames)))
+    aliases = "\n".join(f"  u{i}: user(login: $l{i}) {{ ...UserFields }}" for i in range(len(usernames)))
+    query = f"query({params}) {{\n{aliases}\n}}\n" + USER_FRAGMENT % REPO_FIELDS
+    data = _graphql(query, {f"l{i}": u for i, u in enumerate(usernames)}, headers)
+    return {u: data.get(f"u{i}") for i, u in enumerate(usernames)}
+
+
+def fetch_contribution_years(login, years, headers):
+    """
+    Fetch the contribution calendars of several calendar years in one aliased
+    query (y2019: contributionsCollection(from: ..., to: ...) ...).
+
+    Returns:
+        dict: year -> {"first": "YYYY-MM-DD", "counts": [...]} for each year returned
+    """
+    fields = "\n".join(
+        f'    y{y}: contributionsCollection(from: "{y}-01-01T00:00:00Z", to: "{y}-12-31T23:59:59Z") {{ {CALENDAR_FIELDS} }}'
+        for y in years
+    )
+    query = f"query($login: String!) {{\n  user(login: $login) {{\n{fields}\n  }}\n}}"
+    user = _graphql(query, {"login": login}, headers).get("user") or {}
+    calendars = {}
+    for y in years:
+        calendar = (user.get(f"y{y}") or {}).get("contributionCalendar")
+        if calendar is None:
+            continue
+        days = sorted(
+            (d["date"], d["contributionCount"])
+            for week in calendar.get("weeks", ()) for d in week.get("contributionDays", ())
+        )
+        calendars[y] = {"first": days[0][0] if days else f"{y}-01-01", "counts": [c for _, c in days]}
+    return calendars
+
 
-    # --- 2) GraphQL for contributions ---
-    if token:
+def _year_cache_path(login):
+    root = http_client.cache_dir()
+    return os.path.join(root, "contributions", f"{login.lower()}.json") if root else None
+
+
+def _load_years(login):
+    path = _year_cache_path(login)
+    if not path:
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != CONTRIBUTION_CACHE_VERSION:
+        return {}
+    return data.get("years") or {}
+
+
+def _save_years(login, years):
+    path = _year_cache_path(login)
+    if not path:
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": CONTRIBUTION_CACHE_VERSION, "login": login, "years": years}, f)
+    os.replace(tmp_path, path)
+
+
+def _contribution_history(user, headers):
+    """
+    Daily contributions from the year the account was created through today.
+
+    Finished calendar years never change, so they are fetched once (aliased
+    per-year queries, chunks in parallel) and kept in the cache directory
+    for good. The current year comes from the default contributionsCollection
+    window already in the user query, so after the first run no extra
+    request is needed. Years that fail to load are left out and retried on
+    the next run.
+
+    Returns:
+        contributions.ContributionCalendar
+    """
+    import numpy as np
+    from ..contributions import ContributionCalendar
+
+    recent = ContributionCalendar.from_graphql(
+        (user.get("contributionsCollection") or {}).get("contributionCalendar")
+    )
+    this_year = datetime.utcnow().year
+    created = user.get("createdAt") or ""
+    first_year = int(created[:4]) if created[:4].isdigit() else this_year
+    login = user["login"]
+
+    years = _load_years(login)
+    missing = [y for y in range(first_year, this_year) if str(y) not in years]
+    if missing:
+        chunks = [missing[i:i + CONTRIBUTION_YEARS_PER_QUERY] for i in range(0, len(missing), CONTRIBUTION_YEARS_PER_QUERY)]
+
+        def fetch(chunk):
+            try:
+                return fetch_contribution_years(login, chunk, headers)
+            except Exception as e:
+                print(f"[!] Contribution history {chunk[0]}-{chunk[-1]} failed:", e)
+                return {}
+
+        with ThreadPoolExecutor(max_workers=min(CONTRIBUTION_WORKERS, len(chunks))) as executor:
+            for calendars in executor.map(fetch, chunks):
+                years.update((str(y), c) for y, c in calendars.items())
+        _save_years(login, years)
+
+    dates, counts = [], []
+    for y in range(first_year, this_year):
+        entry = years.get(str(y))
+        if entry:
+            dates.append(np.datetime64(entry["first"], "D") + np.arange(len(entry["counts"])))
+            counts.append(np.asarray(entry["counts"], dtype=np.int64))
+    # The default window reaches into last year; keep only days no finished year covers
+    covered = [int(y) for y in years if first_year <= int(y) < this_year]
+    keep = ~np.isin(recent.years, covered)
+    dates.append(recent.dates[keep])
+    counts.append(recent.counts[keep])
+    return ContributionCalendar(np.concatenate(dates), np.concatenate(counts))
+
+
+def _complete_connections(user, headers, max_repos=MAX_REPOS, skip=(), since=None):
+    """
+    Follow the cursors of every connection that has more pages. All
+    unfinished connections advance together, one query per round.
+    Repositories stop once max_repos have been collected, or, with since,
+    once a page reaches repositories not updated after it. Connections
+    named in skip are left at their first page.
+    """
+    def more(name, conn):
+        if name in skip:
+            return False
+        if name == "repositories":
+            if max_repos and len(user[name]["nodes"]) >= max_repos:
+                return False
+            last = conn["nodes"][-1] if conn["nodes"] else None
+            if since and last and (last.get("updatedAt") or "") <= since:
+                return False
+        return conn["pageInfo"]["hasNextPage"]
+
+    pending = {name: user[name]["pageInfo"]["endCursor"] for name in CONNECTIONS if more(name, user[name])}
+    while pending:
+        params = ", ".join(["$login: String!"] + [f"$after_{name}: String" for name in pending])
+        fields = "\n".join(
+            f"    {name}(first: 100, after: $after_{name}"
+            + (", privacy: PUBLIC, ownerAffiliations: OWNER, orderBy: {field: UPDATED_AT, direction: DESC}" if name == "repositories" else "")
+            + f") {{ pageInfo {{ hasNextPage endCursor }} nodes {{ {CONNECTIONS[name]} }} }}"
+            for name in pending
+        )
+        query = f"query({params}) {{\n  user(login: $login) {{\n{fields}\n  }}\n}}"
+        variables = {"login": user["login"], **{f"after_{name}": cursor for name, cursor in pending.items()}}
+        page = _graphql(query, variables, headers).get("user") or {}
+
+        next_pending = {}
+        for name in pending:
+            conn = page.get(name)
+            if not conn:
+                continue
+            user[name]["nodes"].extend(conn["nodes"])
+            if more(name, conn):
+                next_pending[name] = conn["pageInfo"]["endCursor"]
+        pending = next_pending
+    if max_repos:
+        del user["repositories"]["nodes"][max_repos:]
+    return user
+
+
+def _repo_from_node(n):
+    return {
+        "name": n.get("name"),
+        "description": n.get("description"),
+        "stargazers_count": n.get("stargazerCount", 0),
+        "language": (n.get("primaryLanguage") or {}).get("name"),
+        "updated_at": n.get("updatedAt") or "",
+        "default_branch": (n.get("defaultBranchRef") or {}).get("name"),
+    }
+
+
+def _connection_fingerprint(conn):
+    return [conn["totalCount"], [n.get("login") for n in conn["nodes"] if n]]
+
+
+def _complete_incremental(user, headers, max_repos, state):
+    """
+    Complete a user's connections, fetching only what changed since state.
+
+    Follower / following lists whose total count and first page are
+    unchanged are taken from state instead of being paged again.
+    Repositories are paged (newest first) only until the previous run's
+    newest updated_at and merged with the stored ones; if the merged count
+    does not match GitHub's total, repos were deleted or made private and
+    the list is paged in full.
+    """
+    first_repos = {"nodes": list(user["repositories"]["nodes"]), "pageInfo": dict(user["repositories"]["pageInfo"])}
+    connections = {}
+    skip = set()
+    for name in ("followers", "following"):
+        fingerprint = _connection_fingerprint(user[name])
+        stored = state.get(name) or {}
+        if stored.get("fingerprint") == fingerprint and stored.get("logins") is not None:
+            user[name]["nodes"] = [{"login": login} for login in stored["logins"]]
+            skip.add(name)
+        connections[name] = {"fingerprint": fingerprint}
+
+    since = state.get("since") or None
+    _complete_connections(user, headers, max_repos, skip=skip, since=since)
+
+    fresh = [_repo_from_node(n) for n in user["repositories"]["nodes"] if n]
+    if since:
+        fresh = [r for r in fresh if r["updated_at"] > since]
+        merged = _merge_repos(fresh, state.get("repos") or [])
+        expected = user["repositories"]["totalCount"]
+        if max_repos:
+            expected = min(expected, max_repos)
+        if len(merged) != expected:
+            user["repositories"].update(first_repos)
+            _complete_connections(user, headers, max_repos, skip={"followers", "following"})
+            fresh = [_repo_from_node(n) for n in user["repositories"]["nodes"] if n]
+            merged = _merge_repos(fresh, _still_listed(state.get("repos") or [], fresh))
+    else:
+        merged = fresh
+    if max_repos:
+        merged = merged[:max_repos]
+    user["repositories"]["merged"] = merged
+
+    for name in ("followers", "following"):
+        connections[name]["logins"] = [n["login"] for n in user[name]["nodes"] if n and n.get("login")]
+    return merged, connections
+
+
+def _graphql_user_signals(user, collected_at, fetch_readmes=False, readme_workers=README_WORKERS):
+    source = "GitHub GraphQL"
+    profile = {
+        "name": user.get("name"),
+        "login": user.get("login"),
+        "avatar_url": user.get("avatarUrl"),
+        "bio": user.get("bio"),
+        "email": user.get("email"),
+        "company": user.get("company"),
+        "location": user.get("location"),
+        "blog": user.get("websiteUrl"),
+        "followers": user["followers"]["totalCount"],
+        "following": user["following"]["totalCount"],
+        "public_repos": user["repositories"]["totalCount"],
+    }
+    signals = SignalBatch(_profile_signals(profile, source, collected_at))
+
+    followers = {n["login"] for n in user["followers"]["nodes"] if n and n.get("login")}
+    following = {n["login"] for n in user["following"]["nodes"] if n and n.get("login")}
+    signals.extend(_connection_signals(followers, following, source, collected_at))
+
+    repos = user["repositories"].get("merged")
+    if repos is None:
+        repos = [_repo_from_node(n) for n in user["repositories"]["nodes"] if n]
+    signals.extend(_repo_signals(repos, user["login"], source, collected_at, fetch_readmes, readme_workers))
+
+    history = user.get("contributionHistory")
+    if history is None:
+        from ..contributions import ContributionCalendar
+        history = ContributionCalendar.from_graphql((user.get("contributionsCollection") or {}).get("contributionCalendar"))
+    signals.extend(_contribution_signals(history, collected_at))
+    return signals
+
+
+# Authorization is added per request by http_client from the token pool
+GRAPHQL_HEADERS = {"Content-Type": "application/json", "User-Agent": "git-identity-leak"}
+
+
+def prefetch(usernames):
+    """
+    Fetch the first pages of several users in aliased GraphQL queries ahead
+    of their collect() calls. Used by batch runs; needs a GitHub token.
+    """
+    if not ratelimit.get_pool():
+        return
+    usernames = list(usernames)
+    for i in range(0, len(usernames), GRAPHQL_BATCH_SIZE):
+        chunk = usernames[i:i + GRAPHQL_BATCH_SIZE]
         try:
-            headers_gql = {"Authorization": f"Bearer {token}", "Content-Type": "application/json","User-Agent":"git-identity-leak"}
-            query = """
-            query($login: String!) {
-              user(login: $login) {
-                contributionsCollection {
-                  contributionCalendar {
-                    totalContributions
-                    weeks {
-                      contributionDays {
-                        date
-                        contributionCount
-                      }
-                    }
-                  }
-                }
-              }
-            }"""
-            r = requests.post(GITHUB_GRAPHQL, headers=headers_gql, json={"query":query,"variables":{"login":username}}, timeout=15)
-            if r.status_code==200:
-                data = r.json()
-                calendar = data.get("data",{}).get("user",{}).get("contributionsCollection",{}).get("contributionCalendar",{})
-                total = calendar.get("totalContributions",0)
-                signals.append({
-                    "signal_type":"CONTRIBUTION_TOTAL",
-                    "value": str(total),
-                    "confidence":"HIGH",
-                    "source":"GitHub GraphQL",
-                    "collected_at":collected_at
-                })
-                daily=[]
-                weekday=0
-                weekend=0
-                yearly={}
-                for week in calendar.get("weeks",[]):
-                    for day in week.get("contributionDays",[]):
-                        date=day["date"]
-                        count=day["contributionCount"]
-                        daily.append({"date":date,"count":count})
-                        dt = datetime.strptime(date,"%Y-%m-%d")
-                        year = str(dt.year)
-                        yearly[year]=yearly.get(year,0)+count
-                        if dt.weekday()<5:
-                            weekday+=count
-                        else:
-                            weekend+=count
-                signals.append({
-                    "signal_type":"CONTRIBUTION_TIME_PATTERN",
-                    "value":f"Weekdays: {weekday}, Weekends: {weekend}",
-                    "confidence":"MEDIUM",
-                    "source":"GitHub GraphQL",
-                    "collected_at":collected_at
-                })
-                for year,count in yearly.items():
-                    signals.append({
-                        "signal_type":"CONTRIBUTIONS_YEAR",
-                        "value":year,
-                        "confidence":"HIGH",
-                        "source":"GitHub GraphQL",
-                        "collected_at":collected_at,
-                        "meta":{"year":year,"count":count}
-                    })
-                signals.append({
-                    "signal_type":"CONTRIBUTIONS_YEARLY_DATES",
-                    "value":daily,
-                    "confidence":"HIGH",
-                    "source":"GitHub GraphQL",
-                    "collected_at":collected_at
-                })
+            users = fetch_users_graphql(chunk, GRAPHQL_HEADERS)
         except Exception as e:
-            print("[!] GraphQL contributions error:", e)
+            print("[!] GraphQL prefetch error:", e)
+            continue
+        with _prefetch_lock:
+            _prefetched.update({u: data for u, data in users.items() if data})
+
+
+def collect_graphql(username, max_repos=MAX_REPOS, fetch_readmes=False, readme_workers=README_WORKERS, state=None):
+    """Collect all GitHub signals for one user through GraphQL."""
+    collected_at = datetime.utcnow().isoformat() + "Z"
+    headers = GRAPHQL_HEADERS
+
+    with _prefetch_lock:
+        user = _prefetched.pop(username, None)
+    if user is None:
+        user = fetch_users_graphql([username], headers).get(username)
+    if not user:
+        return []
+
+    # Past contribution years load while the connections are paged
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        history = executor.submit(_contribution_history, user, headers)
+        if state is None:
+            _complete_connections(user, headers, max_repos)
+        else:
+            repos, connections = _complete_incremental(user, headers, max_repos, _usable_state(state))
+        user["contributionHistory"] = history.result()
+
+    if state is None:
+        return _graphql_user_signals(user, collected_at, fetch_readmes, readme_workers)
+
+    signals = _graphql_user_signals(user, collected_at, fetch_readmes, readme_workers)
+    _save_state(state, repos, connections)
+    return signals
+
+
+# ------------------------------------------------------------
+# REST collection
+# ------------------------------------------------------------
+
+def _rest_repos(data, headers, page_workers, max_repos, state):
+    """
+    Repos for the REST path. With state, only repos updated since the last
+    run are paged (sort=updated is newest first) and merged with the stored
+    ones; unchanged follower pages are already cheap through the HTTP
+    cache's ETag revalidation.
+    """
+    url = f"{data['repos_url']}?sort=updated"
+    max_pages = -(-max_repos // PER_PAGE) if max_repos else None
+    stored = state.get("repos") or [] if state is not None else []
+    since = state.get("since") if state is not None else None
 
+    if since:
+        fresh, _ = fetch_pages_since(url, headers, lambda r: (r.get("updated_at") or "") <= since, max_pages)
+        repos = _merge_repos([_slim_repo(r) for r in fresh], stored)
+        expected = data.get("public_repos", 0)
+        if max_repos:
+            expected = min(expected, max_repos)
+            repos = repos[:max_repos]
+        if len(repos) == expected:
+            return repos
+
+    # Most recently updated first so the cap keeps the active ones
+    repos = fetch_all_pages(url, headers, page_workers, max_pages)
+    if max_repos:
+        repos = repos[:max_repos]
+    if state is not None:
+        repos = [_slim_repo(r) for r in repos]
+        repos = _merge_repos(repos, _still_listed(stored, repos))
+    return repos
+
+
+def collect_rest(username, page_workers=PAGE_WORKERS, max_repos=MAX_REPOS,
+                 fetch_readmes=False, readme_workers=README_WORKERS, state=None):
+    """Collect profile, connections and repos through the REST API."""
+    signals = SignalBatch()
+    collected_at = datetime.utcnow().isoformat() + "Z"
+    headers = {}
+
+    try:
+        r = http_client.get(f"https://api.github.com/users/{username}", headers=headers, timeout=10)
+        if r.status_code != 200:
+            return signals
+        data = r.json()
+        signals.extend(_profile_signals(data, "GitHub REST", collected_at))
+
+        # Followers / following usernames, both lists at the same time
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            followers_f = executor.submit(fetch_all_pages, f"https://api.github.com/users/{username}/followers", headers, page_workers)
+            following_f = executor.submit(fetch_all_pages, f"https://api.github.com/users/{username}/following", headers, page_workers)
+            followers = {u["login"] for u in followers_f.result() if u.get("login")}
+            following = {u["login"] for u in following_f.result() if u.get("login")}
+        signals.extend(_connection_signals(followers, following, "GitHub REST", collected_at))
+
+        repos = _rest_repos(data, headers, page_workers, max_repos, _usable_state(state) if state is not None else None)
+        signals.extend(_repo_signals(repos, username, "GitHub REST", collected_at, fetch_readmes, readme_workers))
+        _save_state(state, repos)
+    except Exception as e:
+        print("[!] REST API error:", e)
     return signals
+
+
+def collect(username, page_workers=PAGE_WORKERS, max_repos=MAX_REPOS, fetch_readmes=False, readme_workers=README_WORKERS,
+            state=None):
+    """
+    Collect GitHub signals for a username.
+
+    Args:
+        username (str): GitHub login.
+        page_workers (int): Concurrent page requests for REST list endpoints.
+        max_repos (int): Stop collecting repositories after this many (None for all).
+        fetch_readmes (bool): Also download each repo's README from its default branch.
+        readme_workers (int): Concurrent README downloads.
+        state (dict, optional): Incremental state from an earlier run. Only repositories
+            updated since then are fetched, and the dict is updated in place for the next run.
+    """
+    # With a token everything, including contributions, comes from GraphQL
+    # in a handful of round trips; REST is the fallback.
+    if ratelimit.get_pool():
+        try:
+            return collect_graphql(username, max_repos, fetch_readmes, readme_workers, state)
+        except Exception as e:
+            print("[!] GraphQL error, falling back to REST:", e)
+
+    return collect_rest(username, page_workers, max_repos, fetch_readmes, readme_workers, state)
@@ -1,5 +1,5 @@
 # git_identity_leak/plugins/reddit.py
-import requests
+from .. import http_client
 from datetime import datetime
 
 def collect(username):
@@ -8,7 +8,7 @@ def collect(username):
     headers = {"User-Agent": "git-identity-leak"}
 
     try:
-        r = requests.get(url, headers=headers, timeout=10)
+        r = http_client.get(url, headers=headers, timeout=10)
         if r.status_code == 200 and r.json().get("data"):
             return [{
                 "signal_type": "POST_PLATFORM",
@@ -1,5 +1,5 @@
 # git_identity_leak/plugins/x.py
-import requests
+from .. import http_client
 from datetime import datetime
 
 def collect(username):
@@ -8,7 +8,7 @@ def collect(username):
     url = f"https://nitter.net/{username}"
 
     try:
-        r = requests.get(url, timeout=10)
+        r = http_client.get(url, timeout=10)
         if r.status_code == 200:
             return [{
                 "signal_type": "PROFILE_PLATFORM",
@@ -1,40 +1,55 @@
 import requests
+from . import http_client
 from datetime import datetime
 
 # Public post sources
 POST_SOURCES = {
     "Reddit": "https://www.reddit.com/user/{}/submitted.json",
+    "RedditComments": "https://www.reddit.com/user/{}/comments.json",
     "StackOverflow": "https://api.stackexchange.com/2.3/users?inname={}&site=stackoverflow"
 }
 
 def analyze_posts(username: str):
+    """
+    Collect public posts and profile matches for a username.
+
+    Items with "type": "post" carry text the user wrote (Reddit submissions
+    and comments) and feed stylometry; "profile" items are account matches.
+    """
     signals = []
 
-    # Reddit
-    reddit_url = POST_SOURCES["Reddit"].format(username)
-    try:
-        r = requests.get(reddit_url, headers={"User-Agent": "Mozilla/5.0"}, timeout=5)
-        if r.status_code == 200:
-            data = r.json()
-            for item in data.get("data", {}).get("children", []):
-                signals.append({
-                    "content": item["data"].get("title") or item["data"].get("selftext"),
-                    "confidence": 0.7,
-                    "evidence": item["data"].get("permalink"),
-                    "first_seen": datetime.utcfromtimestamp(item["data"].get("created_utc")).isoformat(),
-                    "last_seen": datetime.utcfromtimestamp(item["data"].get("created_utc")).isoformat()
-                })
-    except requests.RequestException:
-        pass
+    # Reddit submissions (title and body) and comments
+    for source, text_of in (("Reddit", lambda d: "\n".join(filter(None, (d.get("title"), d.get("selftext"))))),
+                            ("RedditComments", lambda d: d.get("body"))):
+        reddit_url = POST_SOURCES[source].format(username)
+        try:
+            r = http_client.get(reddit_url, headers={"User-Agent": "Mozilla/5.0"}, timeout=5)
+            if r.status_code == 200:
+                data = r.json()
+                for item in data.get("data", {}).get("children", []):
+                    created = datetime.utcfromtimestamp(item["data"].get("created_utc")).isoformat()
+                    signals.append({
+                        "type": "post",
+                        "source": "Reddit",
+                        "content": text_of(item["data"]),
+                        "confidence": 0.7,
+                        "evidence": item["data"].get("permalink"),
+                        "first_seen": created,
+                        "last_seen": created
+                    })
+        except (requests.RequestException, ValueError):
+            pass
 
     # StackOverflow
     so_url = POST_SOURCES["StackOverflow"].format(username)
     try:
-        r = requests.get(so_url, timeout=5)
+        r = http_client.get(so_url, timeout=5)
         if r.status_code == 200:
             items = r.json().get("items", [])
             for item in items:
                 signals.append({
+                    "type": "profile",
+                    "source": "StackOverflow",
                     "content": item.get("display_name"),
                     "confidence": 0.6,
                     "evidence": f"https://stackoverflow.com/users/{item.get('user_id')}",
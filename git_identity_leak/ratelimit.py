@@ -0,0 +1,192 @@
+# git_identity_leak/ratelimit.py
+"""
+Rate-limit-aware scheduling across a pool of GitHub tokens.
+
+Every response from api.github.com reports the remaining quota of the
+token that made it (X-RateLimit-Remaining / -Reset / -Resource). The pool
+keeps that state per token and resource ("core" for REST, "graphql"),
+hands out the token with the most quota left, and, once a token is down to
+its last PACE_BELOW share of quota, paces it with a token bucket whose
+refill rate spreads what is left over the time until reset. When every
+token is exhausted it sleeps until the earliest reset instead of running
+into 403s.
+"""
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlparse
+
+GITHUB_API_HOST = "api.github.com"
+RESERVE = 10            # requests kept back per token and resource
+BURST = 20              # token bucket capacity
+PACE_BELOW = 0.2        # start pacing a token below this share of its limit
+MAX_SLEEP = 60          # re-check interval while waiting for a reset
+NO_RESET_BACKOFF = 60   # seconds per request for a token paced to zero with no known reset
+
+
+def _resource_for(url):
+    return "graphql" if urlparse(url).path.startswith("/graphql") else "core"
+
+
+def _mask(token):
+    return f"{token[:4]}...{token[-4:]}" if len(token) > 8 else "****"
+
+
+class TokenPool:
+    def __init__(self, tokens, reserve=RESERVE, burst=BURST):
+        self.tokens = list(dict.fromkeys(t for t in tokens if t))
+        self.reserve = reserve
+        self.burst = burst
+        self._state = {}
+        self._lock = threading.Lock()
+
+    def __bool__(self):
+        return bool(self.tokens)
+
+    def _entry(self, token, resource):
+        key = (token, resource)
+        if key not in self._state:
+            self._state[key] = {
+                "remaining": None,
+                "limit": None,
+                "reset": 0.0,
+                "rate": None,           # requests per second, None until known
+                "level": float(self.burst),
+                "refilled_at": time.monotonic(),
+            }
+        return self._state[key]
+
+    def _pace(self, st):
+        # A token paced to zero without a reset time would never refill; give it one
+        # request per NO_RESET_BACKOFF so its next response can update the state
+        if st["rate"] == 0 and not st["reset"]:
+            return 1 / NO_RESET_BACKOFF
+        return st["rate"]
+
+    def _refill(self, st, now):
+        if st["rate"] is not None:
+            st["level"] = min(self.burst, st["level"] + (now - st["refilled_at"]) * self._pace(st))
+        else:
+            st["level"] = float(self.burst)
+        st["refilled_at"] = now
+
+    def acquire(self, url):
+        """
+        Return the token to use for a request to url, sleeping while every
+        token is either exhausted or has an empty bucket.
+        """
+        resource = _resource_for(url)
+        while True:
+            with self._lock:
+                now, mono = time.time(), time.monotonic()
+                best, best_score, wait = None, None, None
+                for token in self.tokens:
+                    st = self._entry(token, resource)
+                    if st["reset"] and now >= st["reset"]:
+                        # Window rolled over: quota is back, pace again from the next response
+                        st.update(remaining=None, reset=0.0, rate=None)
+                    if st["remaining"] is not None and st["remaining"] <= self.reserve and st["reset"]:
+                        w = st["reset"] - now
+                        wait = w if wait is None else min(wait, w)
+                        continue
+                    self._refill(st, mono)
+                    if st["level"] < 1:
+                        rate = self._pace(st)
+                        w = (1 - st["level"]) / rate if rate else st["reset"] - now
+                        wait = w if wait is None else min(wait, w)
+                        continue
+                    score = st["remaining"] if st["remaining"] is not None else float("inf")
+                    if best is None or score > best_score:
+                        best, best_score = token, score
+
+                if best is not None:
+                    st = self._entry(best, resource)
+                    st["level"] -= 1
+                    if st["remaining"] is not None:
+                        # Count the request now so concurrent callers see it
+                        st["remaining"] -= 1
+                    return best
+
+            wait = max(0.05, min(wait or 1.0, MAX_SLEEP))
+            if wait >= 5:
+                print(f"[!] GitHub {resource} quota exhausted on all tokens, waiting {int(wait)}s")
+            time.sleep(wait)
+
+    def update(self, token, url, resp):
+        """Record the quota reported by a response made with token."""
+        headers = resp.headers
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is None or not remaining.isdigit():
+            return
+        resource = headers.get("X-RateLimit-Resource") or _resource_for(url)
+        with self._lock:
+            st = self._entry(token, resource)
+            st["remaining"] = int(remaining)
+            if headers.get("X-RateLimit-Limit", "").isdigit():
+                st["limit"] = int(headers["X-RateLimit-Limit"])
+            if headers.get("X-RateLimit-Reset", "").isdigit():
+                st["reset"] = float(headers["X-RateLimit-Reset"])
+            if st["limit"] and st["remaining"] > st["limit"] * PACE_BELOW:
+                st["rate"] = None
+            else:
+                seconds_left = max(1.0, st["reset"] - time.time())
+                st["rate"] = max(st["remaining"] - self.reserve, 0) / seconds_left
+
+    def exhausted(self, token, url):
+        with self._lock:
+            st = self._entry(token, _resource_for(url))
+            return st["remaining"] is not None and st["remaining"] <= self.reserve and bool(st["reset"])
+
+    def state(self):
+        """Current quota per token and resource, with tokens masked."""
+        with self._lock:
+            return [
+                {
+                    "token": _mask(token),
+                    "resource": resource,
+                    "remaining": st["remaining"],
+                    "limit": st["limit"],
+                    "reset": datetime.utcfromtimestamp(st["reset"]).isoformat() + "Z" if st["reset"] else None,
+                }
+                for (token, resource), st in sorted(self._state.items(), key=lambda kv: (kv[0][1], kv[0][0]))
+            ]
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def tokens_from_env():
+    """Tokens from GITHUB_TOKENS (comma or whitespace separated) plus GITHUB_TOKEN."""
+    tokens = re.split(r"[,\s]+", os.environ.get("GITHUB_TOKENS", "").strip())
+    tokens.append(os.environ.get("GITHUB_TOKEN", ""))
+    return [t for t in tokens if t]
+
+
+def get_pool():
+    """The shared GitHub token pool, built from the environment on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = TokenPool(tokens_from_env())
+    return _pool
+
+
+def set_pool(pool):
+    global _pool
+    _pool = pool
+
+
+def pool_for(url):
+    """The token pool that should sign a request to url, if any."""
+    if urlparse(url).hostname != GITHUB_API_HOST:
+        return None
+    pool = get_pool()
+    return pool if pool else None
+
+
+def quota_state():
+    return get_pool().state()
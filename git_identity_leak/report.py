@@ -1,6 +1,19 @@
 # git_identity_leak/report.py
+import gzip
+import io
 import json
 
+try:
+    import orjson
+except ImportError:  # optional fast serializer
+    orjson = None
+
+# Report paths ending in one of these are written as streaming NDJSON
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+COMPRESSION_SUFFIXES = {".gz": "gzip", ".zst": "zstd"}
+WRITE_CHUNK = 1000      # signals serialized per write() call
+
+
 def save_report(filepath, signals, temporal_data=None, stylometry_data=None):
     """
     Save a structured JSON report including signals, temporal data, and stylometry.
@@ -12,7 +25,7 @@ def save_report(filepath, signals, temporal_data=None, stylometry_data=None):
         stylometry_data (dict, optional): Stylometry analysis results.
     """
     report = {
-        "signals": signals,
+        "signals": [dict(s) for s in signals],
         "temporal_data": temporal_data if temporal_data else {},
         "stylometry_data": stylometry_data if stylometry_data else {}
     }
@@ -22,3 +35,133 @@ def save_report(filepath, signals, temporal_data=None, stylometry_data=None):
             json.dump(report, f, indent=2, ensure_ascii=False)
     except Exception as e:
         print(f"[!] Failed to save report to {filepath}: {e}")
+
+
+# ============================================================
+# Streaming NDJSON reports
+# ============================================================
+#
+# One JSON object per line. Signal lines are the signal dicts themselves;
+# other records carry a "_record" key: a "header" first, then
+# "temporal_data" / "stylometry_data" at the end.
+
+def dumps_line(obj):
+    """Serialize obj as one NDJSON line (bytes), using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+    return (json.dumps(obj, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+
+
+def is_ndjson_path(path):
+    base = path
+    for suffix in COMPRESSION_SUFFIXES:
+        if base.endswith(suffix):
+            base = base[:-len(suffix)]
+    return base.endswith(NDJSON_SUFFIXES)
+
+
+def _compression_for(path, compression=None):
+    if compression:
+        return compression
+    for suffix, name in COMPRESSION_SUFFIXES.items():
+        if path.endswith(suffix):
+            return name
+    return None
+
+
+def _open_binary(path, mode, compression):
+    if compression is None:
+        return open(path, mode)
+    if compression == "gzip":
+        return gzip.open(path, mode, compresslevel=6)
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise RuntimeError("zstd compression requires the 'zstandard' package")
+        if "w" in mode:
+            return zstandard.ZstdCompressor().stream_writer(open(path, "wb"))
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(path, "rb")))
+    raise ValueError(f"Unknown compression: {compression}")
+
+
+class ReportWriter:
+    """
+    Streaming NDJSON report writer.
+
+    Signals are written as they are produced, so memory use does not
+    grow with the report. Compression is picked from the file suffix
+    (.gz, .zst) unless given explicitly.
+    """
+
+    def __init__(self, filepath, compression=None, username=None):
+        self.filepath = filepath
+        self.count = 0
+        self._f = _open_binary(filepath, "wb", _compression_for(filepath, compression))
+        self._f.write(dumps_line({"_record": "header", "version": 1, "username": username}))
+
+    def write_signals(self, signals):
+        rows = signals.iter_dicts() if hasattr(signals, "iter_dicts") else (dict(s) for s in signals)
+        chunk = []
+        for row in rows:
+            chunk.append(dumps_line(row))
+            if len(chunk) >= WRITE_CHUNK:
+                self._f.write(b"".join(chunk))
+                self.count += len(chunk)
+                chunk = []
+        if chunk:
+            self._f.write(b"".join(chunk))
+            self.count += len(chunk)
+
+    def write_record(self, name, data):
+        self._f.write(dumps_line({"_record": name, "data": data or {}}))
+
+    def close(self, temporal_data=None, stylometry_data=None):
+        self.write_record("temporal_data", temporal_data)
+        self.write_record("stylometry_data", stylometry_data)
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if not self._f.closed:
+            self._f.close()
+
+
+def iter_report(filepath, compression=None):
+    """
+    Lazily read an NDJSON report.
+
+    Yields:
+        tuple: ("signal", signal_dict) or (record_name, record) for other lines
+    """
+    loads = orjson.loads if orjson is not None else json.loads
+    with _open_binary(filepath, "rb", _compression_for(filepath, compression)) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            obj = loads(line)
+            name = obj.pop("_record", None)
+            yield ("signal", obj) if name is None else (name, obj)
+
+
+def read_signals(filepath, compression=None):
+    """Yield only the signals of an NDJSON report, one at a time."""
+    for kind, obj in iter_report(filepath, compression):
+        if kind == "signal":
+            yield obj
+
+
+def load_report(filepath):
+    """Load a report (pretty JSON or NDJSON) into the save_report layout."""
+    if not is_ndjson_path(filepath):
+        with open(filepath, "r", encoding="utf-8") as f:
+            return json.load(f)
+    report = {"signals": [], "temporal_data": {}, "stylometry_data": {}}
+    for kind, obj in iter_report(filepath):
+        if kind == "signal":
+            report["signals"].append(obj)
+        elif kind in ("temporal_data", "stylometry_data"):
+            report[kind] = obj.get("data", {})
+    return report
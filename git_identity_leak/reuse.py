@@ -1,36 +1,337 @@
 # reuse.py
+"""
+Username reuse checks across a catalog of sites.
 
-import requests
+Sites are described in data/sites.json (or any catalog file with the same
+layout). Each entry gives the profile URL, an optional probe URL (often a
+JSON API that answers faster and more reliably than the HTML page) and the
+rule that decides whether the account exists:
 
-USERNAME_SITES = {
-    "GitHub": "https://github.com/{}",
-    "GitLab": "https://gitlab.com/{}",
-    "Bitbucket": "https://bitbucket.org/{}",
-    "Reddit": "https://www.reddit.com/user/{}",
-    "X": "https://nitter.net/{}",
-    "LinkedIn": "https://www.linkedin.com/in/{}"
-}
+    "status"    (default) 2xx means found, absent_status (404, 410) means not found
+    "redirect"  found unless the final URL contains absent_url
+    "body"      not found if the body contains absent, found if it contains present
+
+Probes run on a thread pool with a per-host limit, so one slow or
+rate-limiting site cannot hold up the rest, and "not found" answers are
+remembered for a while in a negative cache so repeated audits skip them.
+"""
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import zip_longest
+from urllib.parse import urlparse
+
+from . import http_client
+
+SITES_FILE = os.path.join(os.path.dirname(__file__), "data", "sites.json")
+REUSE_WORKERS = 64
+HOST_CONCURRENCY = 2        # probes in flight per host (registered domain)
+PROBE_TIMEOUT = 5           # seconds
+PROBE_RETRIES = 0           # a throttled site counts as unknown rather than stalling the scan
+MAX_BODY = 256 * 1024       # bytes read for body rules
+NEGATIVE_TTL = 7 * 24 * 3600
+ABSENT_STATUS = (404, 410)
+HEAD_FALLBACK_STATUS = (403, 405, 501)   # servers that reject HEAD; retried with GET
 
 EMAIL_DOMAINS = {
     "GitHub (noreply)": "https://github.com/{}"  # placeholder for noreply detection
 }
 
-def check_username_reuse(username):
+FOUND, NOT_FOUND, UNKNOWN = "found", "not_found", "unknown"
+_HOSTNAME_LABEL = re.compile(r"[A-Za-z0-9](?:[A-Za-z0-9-]{0,61}[A-Za-z0-9])?")
+
+
+def load_sites(path=SITES_FILE):
+    """Load a site catalog; returns the list of site dicts."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["sites"]
+
+
+@lru_cache(maxsize=1)
+def default_sites():
+    """The bundled catalog, read on first use and then shared."""
+    return load_sites()
+
+
+def __getattr__(name):
+    # USERNAME_SITES is kept for callers that used the old hard-coded mapping; it is
+    # built on first access so importing this module does not read the catalog
+    if name == "USERNAME_SITES":
+        return {s["name"]: s["url"] for s in default_sites()}
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def probe_key(site_name, username):
+    """Key of a (site, username) pair in seen filters and caches."""
+    return f"{site_name}\n{username.lower()}"
+
+
+class NegativeCache:
+    """
+    Remembers (site, username) pairs that were not found, for ttl seconds.
+    Persisted as a small JSON file when a path is given.
+    """
+
+    def __init__(self, path=None, ttl=NEGATIVE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = {}
+        if path:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                pass
+
+    def __contains__(self, pair):
+        key = probe_key(*pair)
+        with self._lock:
+            expires = self._entries.get(key)
+            if expires is None:
+                return False
+            if expires < time.time():
+                del self._entries[key]
+                return False
+            return True
+
+    def add(self, site, username):
+        with self._lock:
+            self._entries[probe_key(site, username)] = time.time() + self.ttl
+
+    def save(self):
+        if not self.path:
+            return
+        now = time.time()
+        with self._lock:
+            data = {k: v for k, v in self._entries.items() if v >= now}
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+
+def _host_key(url):
+    # user.tumblr.com and www.tumblr.com share one limit
+    return ".".join((urlparse(url).hostname or "").split(".")[-2:])
+
+
+def site_applies(site, username):
+    """Whether username can exist on site at all (skips requests that cannot succeed)."""
+    pattern = site.get("pattern")
+    if pattern:
+        return re.fullmatch(pattern, username) is not None
+    if "{}" in urlparse(site.get("probe") or site["url"]).netloc:
+        return _HOSTNAME_LABEL.fullmatch(username) is not None
+    return True
+
+
+def _read_body(resp):
+    chunks, size = [], 0
+    for chunk in resp.iter_content(16 * 1024, decode_unicode=False):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size >= MAX_BODY:
+            break
+    return b"".join(chunks).decode(resp.encoding or "utf-8", errors="replace")
+
+
+def probe_site(site, username, timeout=PROBE_TIMEOUT):
+    """
+    Apply one site's existence rule to username.
+
+    Returns:
+        str: FOUND, NOT_FOUND or UNKNOWN
+    """
+    url = (site.get("probe") or site["url"]).format(username)
+    rule = site.get("rule", "status")
+    absent_status = tuple(site.get("absent_status") or ABSENT_STATUS)
+    method = "GET" if rule == "body" else site.get("method", "HEAD")
+    kwargs = dict(allow_redirects=True, timeout=timeout, retries=PROBE_RETRIES, stream=True)
+
+    resp = http_client.request(method, url, **kwargs)
+    try:
+        if method == "HEAD" and resp.status_code in HEAD_FALLBACK_STATUS:
+            resp.close()
+            resp = http_client.request("GET", url, **kwargs)
+
+        if resp.status_code in absent_status:
+            return NOT_FOUND
+        if rule == "redirect":
+            if resp.status_code >= 400:
+                return UNKNOWN
+            return NOT_FOUND if site.get("absent_url", "\0") in resp.url else FOUND
+        if rule == "body":
+            if resp.status_code >= 400:
+                return UNKNOWN
+            body = _read_body(resp)
+            if site.get("absent") and site["absent"] in body:
+                return NOT_FOUND
+            if site.get("present"):
+                return FOUND if site["present"] in body else NOT_FOUND
+            return FOUND
+        return FOUND if 200 <= resp.status_code < 300 else UNKNOWN
+    finally:
+        resp.close()
+
+
+class ReuseScanner:
+    """
+    Check usernames against a site catalog concurrently.
+
+    Args:
+        sites (list, optional): Site dicts, defaults to the bundled catalog.
+        workers (int): Probes in flight overall.
+        host_concurrency (int): Probes in flight per host.
+        negative_cache (NegativeCache, optional): Skips pairs recently found absent.
+        timeout (float): Per-probe timeout in seconds.
+        seen (BloomFilter or SeenSet, optional): Pairs probed so far in this run or
+            batch; a pair is probed at most once and later checks reuse its result,
+            waiting for it if the probe is still running. A seen pair without a
+            recorded result (a Bloom filter false positive) is reported as unknown.
+    """
+
+    def __init__(self, sites=None, workers=REUSE_WORKERS, host_concurrency=HOST_CONCURRENCY,
+                 negative_cache=None, timeout=PROBE_TIMEOUT, seen=None):
+        self.sites = sites if sites is not None else default_sites()
+        self.workers = workers
+        self.host_concurrency = host_concurrency
+        self.negative_cache = negative_cache
+        self.timeout = timeout
+        self.seen = seen
+        # Final status of every seen pair: found/unknown exactly (few), not found in
+        # a filter like seen; probes still running are events other audits wait on
+        self._outcomes = {}
+        self._absent = seen.empty_like() if seen is not None else None
+        self._inflight = {}
+        self._state_lock = threading.Lock()
+        self._host_slots = {}
+        self._slots_lock = threading.Lock()
+
+    def _slot(self, url):
+        host = _host_key(url)
+        with self._slots_lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.host_concurrency)
+            return self._host_slots[host]
+
+    def _check(self, site, username):
+        result = {
+            "site": site["name"],
+            "username": username,
+            "url": site["url"].format(username),
+            "category": site.get("category"),
+        }
+        key = probe_key(site["name"], username)
+        repeat, pending = False, None
+        if self.seen is not None:
+            with self._state_lock:
+                if self.seen.add(key):
+                    self._inflight[key] = threading.Event()
+                else:
+                    repeat, pending = True, self._inflight.get(key)
+
+        if repeat:
+            # Probed earlier in this run or batch; wait if that probe is still running
+            if pending is not None:
+                pending.wait()
+            status = self._recorded(key)
+            result["deduplicated"] = True
+        else:
+            status = UNKNOWN
+            try:
+                if self.negative_cache is not None and (site["name"], username) in self.negative_cache:
+                    status = NOT_FOUND
+                    result["cached"] = True
+                else:
+                    try:
+                        with self._slot(site.get("probe") or site["url"]):
+                            status = probe_site(site, username, self.timeout)
+                    except Exception as e:
+                        result["error"] = str(e)
+                    if status == NOT_FOUND and self.negative_cache is not None:
+                        self.negative_cache.add(site["name"], username)
+            finally:
+                if self.seen is not None:
+                    self._record(key, status)
+
+        result["status"] = status
+        result["found"] = status == FOUND
+        result["confidence"] = "HIGH" if status == FOUND else "LOW"
+        return result
+
+    def _record(self, key, status):
+        with self._state_lock:
+            if status == NOT_FOUND:
+                self._absent.add(key)
+            else:
+                self._outcomes[key] = status
+            event = self._inflight.pop(key, None)
+        if event is not None:
+            event.set()
+
+    def _recorded(self, key):
+        with self._state_lock:
+            status = self._outcomes.get(key)
+            if status is None:
+                # Seen but never recorded: only a Bloom filter false positive gets here
+                status = NOT_FOUND if key in self._absent else UNKNOWN
+            return status
+
+    def check_pairs(self, pairs):
+        """
+        Probe (site, username) pairs; results are returned in the order given.
+        Pairs whose username cannot exist on the site are skipped.
+        """
+        pairs = [(site, u) for site, u in pairs if site_applies(site, u)]
+        if not pairs:
+            return []
+        # Interleave hosts so workers are not all parked on one host's limit
+        by_host = {}
+        for i, (site, _) in enumerate(pairs):
+            by_host.setdefault(_host_key(site.get("probe") or site["url"]), []).append(i)
+        order = [i for group in zip_longest(*by_host.values()) for i in group if i is not None]
+
+        results = [None] * len(pairs)
+        with ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(pairs))), thread_name_prefix="reuse") as executor:
+            for i, result in zip(order, executor.map(lambda i: self._check(*pairs[i]), order)):
+                results[i] = result
+        return results
+
+    def check(self, username):
+        return self.check_pairs((site, username) for site in self.sites)
+
+
+def check_username_reuse(username, scanner=None):
     """
     Check if the username exists across multiple platforms.
     Returns a list of results with confidence.
     """
-    results = []
-    for platform, url_template in USERNAME_SITES.items():
-        try:
-            url = url_template.format(username)
-            resp = requests.head(url, allow_redirects=True, timeout=5)
-            found = resp.status_code == 200
-            confidence = "HIGH" if found else "LOW"
-            results.append({"site": platform, "found": found, "confidence": confidence})
-        except Exception:
-            results.append({"site": platform, "found": False, "confidence": "LOW"})
-    return results
+    scanner = scanner or ReuseScanner()
+    return scanner.check(username)
+
+
+def reuse_signals(results, collected_at):
+    """USERNAME_REUSE signals for accounts found by a scan."""
+    return [
+        {
+            "signal_type": "USERNAME_REUSE",
+            "value": r["url"],
+            "confidence": r["confidence"],
+            "source": r["site"],
+            "collected_at": collected_at,
+            "meta": {"username": r["username"], "category": r.get("category"),
+                     **({"variant": r["variant"]} if "variant" in r else {})},
+        }
+        for r in results if r["found"]
+    ]
+
 
 def check_email_reuse(email):
     """
@@ -41,7 +342,7 @@ def check_email_reuse(email):
         try:
             username = email.split("@")[0]
             url = url_template.format(username)
-            resp = requests.head(url, allow_redirects=True, timeout=5)
+            resp = http_client.head(url, allow_redirects=True, timeout=5)
             found = resp.status_code == 200
             confidence = "MEDIUM" if found else "LOW"
             results.append({"site": platform, "found": found, "confidence": confidence})
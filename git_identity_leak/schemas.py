@@ -10,3 +10,239 @@ class Signal:
     evidence: Optional[str] = None
     first_seen: Optional[str] = None
     last_seen: Optional[str] = None
+
+
+# ------------------------------------------------------------
+# Compact signal storage
+# ------------------------------------------------------------
+#
+# Collected signals are plain dicts that repeat the same signal_type,
+# confidence, source and collected_at strings. SignalBatch stores them as
+# columns instead: small integer codes for the repeated strings, a list
+# for the values, and a sparse dict for the rarely used extra keys
+# (meta, hash, ...). Rows are read back as SignalRecord views that behave
+# like the original dicts, so graph.py, report.py and risk.py work
+# unchanged.
+
+import threading
+from array import array
+from collections.abc import Mapping, MutableMapping
+
+CORE_KEYS = ("signal_type", "value", "confidence", "source", "collected_at")
+_MISSING = object()
+
+
+class InternTable:
+    """Two-way mapping between strings and small integer codes. Code 0 means "absent"."""
+
+    def __init__(self, values=()):
+        self.values = [_MISSING]
+        self.codes = {}
+        self._lock = threading.Lock()
+        for v in values:
+            self.code(v)
+
+    def code(self, value):
+        c = self.codes.get(value)
+        if c is None:
+            with self._lock:
+                c = self.codes.get(value)
+                if c is None:
+                    c = len(self.values)
+                    self.values.append(value)
+                    self.codes[value] = c
+        return c
+
+    def value(self, code):
+        return self.values[code]
+
+
+# Shared by every batch so codes mean the same thing across users
+SIGNAL_TYPES = InternTable([
+    "NAME", "USERNAME", "IMAGE", "BIO", "EMAIL", "COMPANY", "LOCATION", "URL",
+    "FOLLOWERS", "FOLLOWING", "PUBLIC_REPOS",
+    "FOLLOWER_USERNAME", "FOLLOWING_USERNAME", "MUTUAL_CONNECTION",
+    "REPO_SUMMARY", "INACTIVITY_SCORE",
+    "CONTRIBUTION_TOTAL", "CONTRIBUTION_TIME_PATTERN", "CONTRIBUTIONS_YEAR", "CONTRIBUTIONS_YEARLY_DATES",
+    "CONTRIBUTIONS_HISTORY_DATES",
+    "PROFILE_PLATFORM", "POST_PLATFORM", "IMAGE_FILE", "PLUGIN_TIMEOUT", "PLUGIN_ERROR",
+])
+CONFIDENCES = InternTable(["HIGH", "MEDIUM", "LOW"])
+SOURCES = InternTable(["GitHub REST", "GitHub GraphQL", "Reddit", "X", "LinkedIn", "Image"])
+
+
+class SignalRecord(MutableMapping):
+    """Dict-compatible view of one row of a SignalBatch. Writes go to the batch."""
+
+    __slots__ = ("_batch", "_i")
+
+    def __init__(self, batch, i):
+        self._batch = batch
+        self._i = i
+
+    def _core(self, key):
+        b, i = self._batch, self._i
+        if key == "signal_type":
+            return SIGNAL_TYPES.value(b._types[i])
+        if key == "value":
+            return b._values[i]
+        if key == "confidence":
+            return CONFIDENCES.value(b._confidences[i])
+        if key == "source":
+            return SOURCES.value(b._sources[i])
+        return b._times.value(b._collected[i])
+
+    def __getitem__(self, key):
+        if key in CORE_KEYS:
+            value = self._core(key)
+            if value is not _MISSING:
+                return value
+        else:
+            extra = self._batch._extra.get(self._i)
+            if extra and key in extra:
+                return extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        self._batch._set(self._i, key, value)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self._batch._set(self._i, key, _MISSING)
+
+    def __iter__(self):
+        for key in CORE_KEYS:
+            if self._core(key) is not _MISSING:
+                yield key
+        yield from self._batch._extra.get(self._i, ())
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def copy(self):
+        return dict(self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class SignalBatch:
+    """
+    Columnar container of signals.
+
+    Accepts dicts (or other mappings) through append/extend and hands out
+    SignalRecord views on indexing and iteration. extend_values adds many
+    signals that differ only in value (e.g. follower usernames) without
+    building a dict for each.
+    """
+
+    def __init__(self, signals=()):
+        self._types = array("H")
+        self._confidences = array("H")
+        self._sources = array("H")
+        self._collected = array("I")
+        self._values = []
+        self._extra = {}
+        self._times = InternTable()     # collected_at values are mostly shared per plugin run
+        self.extend(signals)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [SignalRecord(self, j) for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("signal index out of range")
+        return SignalRecord(self, i)
+
+    def __iter__(self):
+        for i in range(len(self._values)):
+            yield SignalRecord(self, i)
+
+    def __bool__(self):
+        return bool(self._values)
+
+    def __repr__(self):
+        return f"SignalBatch({len(self)} signals)"
+
+    @staticmethod
+    def _code(table, value):
+        return 0 if value is _MISSING else table.code(value)
+
+    def _set(self, i, key, value):
+        if key == "signal_type":
+            self._types[i] = self._code(SIGNAL_TYPES, value)
+        elif key == "value":
+            self._values[i] = value
+        elif key == "confidence":
+            self._confidences[i] = self._code(CONFIDENCES, value)
+        elif key == "source":
+            self._sources[i] = self._code(SOURCES, value)
+        elif key == "collected_at":
+            self._collected[i] = self._code(self._times, value)
+        elif value is _MISSING:
+            extra = self._extra.get(i, {})
+            extra.pop(key, None)
+            if not extra:
+                self._extra.pop(i, None)
+        else:
+            self._extra.setdefault(i, {})[key] = value
+
+    def append(self, signal):
+        i = len(self._values)
+        get = signal.get
+        self._types.append(self._code(SIGNAL_TYPES, get("signal_type", _MISSING)))
+        self._values.append(get("value", _MISSING))
+        self._confidences.append(self._code(CONFIDENCES, get("confidence", _MISSING)))
+        self._sources.append(self._code(SOURCES, get("source", _MISSING)))
+        self._collected.append(self._code(self._times, get("collected_at", _MISSING)))
+        if len(signal) > len(CORE_KEYS) or any(k not in CORE_KEYS for k in signal):
+            extra = {k: v for k, v in signal.items() if k not in CORE_KEYS}
+            if extra:
+                self._extra[i] = extra
+
+    def extend(self, signals):
+        if isinstance(signals, SignalBatch):
+            # Column-wise merge; only collected_at codes are batch-local
+            offset = len(self._values)
+            remap = [0] + [self._times.code(v) for v in signals._times.values[1:]]
+            self._types.extend(signals._types)
+            self._confidences.extend(signals._confidences)
+            self._sources.extend(signals._sources)
+            self._collected.extend(array("I", (remap[c] for c in signals._collected)))
+            self._values.extend(signals._values)
+            for i, extra in signals._extra.items():
+                self._extra[offset + i] = dict(extra)
+            return
+        for s in signals:
+            self.append(s)
+
+    def extend_values(self, signal_type, values, confidence, source, collected_at):
+        values = list(values)
+        n = len(values)
+        self._types.extend(array("H", [SIGNAL_TYPES.code(signal_type)]) * n)
+        self._confidences.extend(array("H", [CONFIDENCES.code(confidence)]) * n)
+        self._sources.extend(array("H", [SOURCES.code(source)]) * n)
+        self._collected.extend(array("I", [self._times.code(collected_at)]) * n)
+        self._values.extend(values)
+
+    def iter_dicts(self):
+        """Yield each row as a plain dict, reading the columns directly."""
+        types, confs, sources, times = SIGNAL_TYPES.values, CONFIDENCES.values, SOURCES.values, self._times.values
+        columns = zip(self._types, self._values, self._confidences, self._sources, self._collected)
+        for i, row in enumerate(columns):
+            d = {}
+            for key, value in zip(CORE_KEYS, (types[row[0]], row[1], confs[row[2]], sources[row[3]], times[row[4]])):
+                if value is not _MISSING:
+                    d[key] = value
+            extra = self._extra.get(i)
+            if extra:
+                d.update(extra)
+            yield d
+
+    def to_dicts(self):
+        return list(self.iter_dicts())
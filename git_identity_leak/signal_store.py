@@ -0,0 +1,171 @@
+# git_identity_leak/signal_store.py
+"""
+SQLite store of audited accounts' signals for cross-identity queries.
+
+Every audit's signals are kept in one table indexed on (signal_type, value)
+and on the account, so "which accounts expose this EMAIL" or "what does
+this account share with others" are index lookups instead of a scan over
+per-run report files. The database runs in WAL mode, so lookups are not
+blocked while a batch audit is writing.
+"""
+import sqlite3
+import threading
+from datetime import datetime
+
+INSERT_BATCH = 5000
+CACHE_KIB = 64 * 1024     # SQLite page cache; index inserts slow down sharply once it is exceeded
+# Signal types compared by correlate() unless others are given
+CORRELATION_TYPES = ("EMAIL", "NAME", "COMPANY", "LOCATION", "URL", "BIO", "IMAGE_FILE")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS accounts (
+    id INTEGER PRIMARY KEY,
+    username TEXT NOT NULL UNIQUE COLLATE NOCASE,
+    audited_at TEXT
+);
+CREATE TABLE IF NOT EXISTS signals (
+    account_id INTEGER NOT NULL REFERENCES accounts(id),
+    signal_type TEXT NOT NULL,
+    value TEXT NOT NULL,
+    confidence TEXT,
+    source TEXT,
+    collected_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_signals_type_value ON signals(signal_type, value);
+CREATE INDEX IF NOT EXISTS idx_signals_account ON signals(account_id);
+"""
+
+
+class SignalStore:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"PRAGMA cache_size=-{CACHE_KIB}")
+        self._conn.executescript(SCHEMA)
+
+    def add_signals(self, username, signals, audited_at=None):
+        """
+        Replace username's stored signals with signals, in one transaction.
+
+        Only signals with a scalar value are stored; structured values such
+        as daily contribution lists are not useful for reverse lookups.
+
+        Returns:
+            int: Number of signals stored.
+        """
+        audited_at = audited_at or datetime.utcnow().isoformat() + "Z"
+        rows = (
+            (s.get("signal_type"), s.get("value"), s.get("confidence"), s.get("source"), s.get("collected_at"))
+            for s in signals
+        )
+        stored = 0
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO accounts (username, audited_at) VALUES (?, ?) "
+                "ON CONFLICT(username) DO UPDATE SET audited_at = excluded.audited_at",
+                (username, audited_at),
+            )
+            (account_id,) = self._conn.execute(
+                "SELECT id FROM accounts WHERE username = ?", (username,)
+            ).fetchone()
+            self._conn.execute("DELETE FROM signals WHERE account_id = ?", (account_id,))
+
+            batch = []
+            for stype, value, confidence, source, collected_at in rows:
+                if not stype or value is None or isinstance(value, (dict, list)):
+                    continue
+                batch.append((account_id, stype, str(value), confidence, source, collected_at))
+                if len(batch) >= INSERT_BATCH:
+                    stored += self._insert(batch)
+                    batch = []
+            if batch:
+                stored += self._insert(batch)
+        return stored
+
+    def _insert(self, rows):
+        self._conn.executemany(
+            "INSERT INTO signals (account_id, signal_type, value, confidence, source, collected_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        return len(rows)
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def lookup(self, signal_type, value):
+        """
+        Accounts exposing a signal value.
+
+        Returns:
+            list[dict]: {"username", "source", "confidence", "collected_at"} per match
+        """
+        rows = self._query(
+            "SELECT a.username, s.source, s.confidence, s.collected_at "
+            "FROM signals s JOIN accounts a ON a.id = s.account_id "
+            "WHERE s.signal_type = ? AND s.value = ? ORDER BY a.username",
+            (signal_type, str(value)),
+        )
+        return [dict(zip(("username", "source", "confidence", "collected_at"), r)) for r in rows]
+
+    def shared_with(self, username, signal_types=CORRELATION_TYPES):
+        """
+        Signal values of username that other stored accounts expose as well.
+
+        Returns:
+            list[dict]: {"signal_type", "value", "username"} per other account and value
+        """
+        types = list(signal_types)
+        rows = self._query(
+            "SELECT DISTINCT s.signal_type, s.value, b.username "
+            "FROM accounts a "
+            "JOIN signals s ON s.account_id = a.id "
+            "JOIN signals o ON o.signal_type = s.signal_type AND o.value = s.value AND o.account_id != a.id "
+            "JOIN accounts b ON b.id = o.account_id "
+            f"WHERE a.username = ? AND s.signal_type IN ({', '.join('?' * len(types))}) "
+            "ORDER BY s.signal_type, s.value, b.username",
+            [username] + types,
+        )
+        return [dict(zip(("signal_type", "value", "username"), r)) for r in rows]
+
+    def correlate(self, signal_types=CORRELATION_TYPES, min_accounts=2, limit=None):
+        """
+        Values exposed by at least min_accounts different accounts.
+
+        Returns:
+            list[dict]: {"signal_type", "value", "usernames"}, most shared first
+        """
+        types = list(signal_types)
+        sql = (
+            "SELECT s.signal_type, s.value, group_concat(DISTINCT a.username) "
+            "FROM signals s JOIN accounts a ON a.id = s.account_id "
+            f"WHERE s.signal_type IN ({', '.join('?' * len(types))}) "
+            "GROUP BY s.signal_type, s.value "
+            "HAVING COUNT(DISTINCT s.account_id) >= ? "
+            "ORDER BY COUNT(DISTINCT s.account_id) DESC, s.signal_type, s.value"
+        )
+        params = types + [min_accounts]
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [
+            {"signal_type": t, "value": v, "usernames": sorted(names.split(","))}
+            for t, v, names in self._query(sql, params)
+        ]
+
+    def usernames(self):
+        return [r[0] for r in self._query("SELECT username FROM accounts ORDER BY username")]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,110 @@
+# git_identity_leak/snapshots.py
+"""
+Persistent per-user snapshots for incremental re-audits.
+
+Each username gets a directory with one JSON document per source: "signals"
+holds the last full signal set and plugin names ("github") hold the state a
+plugin needs to fetch only what changed, such as the newest repository
+updated_at seen so far. diff_signals compares two signal sets independent
+of when they were collected.
+"""
+import json
+import os
+import re
+import threading
+
+SIGNALS_SOURCE = "signals"
+
+
+def _safe_name(name):
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", name) or "_"
+
+
+class SnapshotStore:
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def path_for(self, username, source):
+        return os.path.join(self.root, _safe_name(username.lower()), f"{_safe_name(source)}.json")
+
+    def load(self, username, source):
+        """Return the stored snapshot, or None if there is none (or it is unreadable)."""
+        try:
+            with open(self.path_for(username, source), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, username, source, data):
+        path = self.path_for(username, source)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, default=str)
+        os.replace(tmp_path, path)
+
+    def load_signals(self, username):
+        snapshot = self.load(username, SIGNALS_SOURCE)
+        return snapshot.get("signals", []) if snapshot else None
+
+    def save_signals(self, username, signals, collected_at=None, plugin_signals=None):
+        """
+        Save the signal set; plugin_signals (plugin name -> its signals) records
+        which plugin each signal came from, for load_plugin_signals.
+        """
+        unique = {}
+        for s in signals:
+            unique.setdefault(signal_key(s), dict(s))
+        keys = list(unique)
+        position = {k: i for i, k in enumerate(keys)}
+        self.save(username, SIGNALS_SOURCE, {
+            "username": username,
+            "collected_at": collected_at,
+            "signals": list(unique.values()),
+            "plugins": {
+                name: sorted({position[signal_key(s)] for s in plugin if signal_key(s) in position})
+                for name, plugin in (plugin_signals or {}).items()
+            },
+        })
+
+    def load_plugin_signals(self, username, names):
+        """
+        Signals the given plugins contributed to the last snapshot.
+
+        Returns:
+            dict: Plugin name -> signals. Snapshots saved without plugin
+                attribution give every stored signal to each name, which
+                is the safe choice: nothing is treated as removed.
+        """
+        snapshot = self.load(username, SIGNALS_SOURCE)
+        if not snapshot or not names:
+            return {}
+        stored = snapshot.get("signals", [])
+        plugins = snapshot.get("plugins")
+        if plugins is None:
+            return {name: list(stored) for name in names}
+        return {name: [stored[i] for i in plugins.get(name, ()) if i < len(stored)] for name in names}
+
+
+def signal_key(s):
+    """Identity of a signal for diffing: its type, value and source, not its timestamp."""
+    value = s.get("value")
+    if not isinstance(value, str):
+        value = json.dumps(value, sort_keys=True, default=str)
+    return (s.get("signal_type"), value, s.get("source"))
+
+
+def diff_signals(old, new):
+    """
+    Compare two signal sets.
+
+    Returns:
+        dict: {"added": [...], "removed": [...]} with signals from new and old
+    """
+    old_by_key = {signal_key(s): s for s in old or ()}
+    new_by_key = {signal_key(s): s for s in new}
+    return {
+        "added": [dict(s) for k, s in new_by_key.items() if k not in old_by_key],
+        "removed": [dict(s) for k, s in old_by_key.items() if k not in new_by_key],
+    }
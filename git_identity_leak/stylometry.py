@@ -1,17 +1,329 @@
-from collections import Counter
-from schemas import Signal
+# git_identity_leak/stylometry.py
+"""
+Stylometric profiles of collected posts and an index for comparing them
+across accounts.
+
+A profile has four blocks: hashed character n-grams (2-4), hashed word
+uni- and bigrams, relative frequencies of common function words and
+punctuation per character. Character n-grams are hashed as arrays of
+code points with NumPy, and words are hashed once per distinct word, so
+the text is never walked n-gram by n-gram in Python. Each block is
+L2-normalized and weighted, and the whole vector has unit length, so a
+dot product between two vectors is their weighted cosine similarity.
+
+StyleIndex keeps one vector per audited account in a matrix: "who
+writes like this" is one matrix-vector product, and all similar pairs
+across the index come from blocked matrix products.
+"""
+import os
 import re
+import threading
+import zlib
+from collections import Counter
+
+import numpy as np
+
+from .schemas import Signal
+
+CHAR_NGRAMS = (2, 3, 4)
+CHAR_DIM = 2048             # hashed character n-gram buckets
+WORD_DIM = 1024             # hashed word unigram / bigram buckets
+MIN_CHARS = 200             # less text than this gives no usable profile
+MATCH_SIMILARITY = 0.85     # cosine similarity for a SIMILAR_WRITING signal
+TOP_MATCHES = 5
+PAIR_BLOCK = 1024           # index rows compared per matrix product in pairs()
+# Share of each block in the cosine similarity
+BLOCK_WEIGHTS = {"char": 0.45, "word": 0.2, "function": 0.25, "punctuation": 0.1}
+
+FUNCTION_WORDS = (
+    "a", "about", "above", "after", "again", "all", "also", "although", "am", "an", "and", "any", "are",
+    "as", "at", "be", "because", "been", "before", "being", "below", "between", "both", "but", "by",
+    "can", "could", "did", "do", "does", "doing", "down", "during", "each", "either", "enough", "even",
+    "ever", "every", "few", "for", "from", "further", "had", "has", "have", "having", "he", "her",
+    "here", "hers", "him", "his", "how", "however", "i", "if", "in", "into", "is", "it", "its", "just",
+    "least", "less", "like", "may", "me", "might", "more", "most", "much", "must", "my", "neither",
+    "no", "nor", "not", "now", "of", "off", "often", "on", "once", "only", "or", "other", "our", "out",
+    "over", "own", "quite", "rather", "same", "she", "should", "since", "so", "some", "such", "than",
+    "that", "the", "their", "them", "then", "there", "these", "they", "this", "those", "though",
+    "through", "thus", "to", "too", "under", "until", "up", "upon", "us", "very", "was", "we", "were",
+    "what", "when", "where", "whether", "which", "while", "who", "whom", "why", "will", "with",
+    "within", "without", "would", "yet", "you", "your",
+)
+PUNCTUATION = ".,;:!?'\"-()[]/*&%$#@_~`"
+
+_WORD = re.compile(r"[^\W\d_]+(?:'[^\W\d_]+)?")
+_FUNCTION_INDEX = {w: i for i, w in enumerate(FUNCTION_WORDS)}
+_PUNCT_CODES = np.frombuffer(PUNCTUATION.encode("ascii"), dtype=np.uint8).astype(np.int64)
+_PRIME = np.uint64(1099511628211)
+_MIX = np.uint64(0xFF51AFD7ED558CCD)
+_SHIFT = np.uint64(33)
+_WORD_SALT = np.uint64(0x9E3779B97F4A7C15)
+
+VECTOR_SIZE = CHAR_DIM + WORD_DIM + len(FUNCTION_WORDS) + len(PUNCTUATION)
+_BLOCKS = (
+    ("char", slice(0, CHAR_DIM)),
+    ("word", slice(CHAR_DIM, CHAR_DIM + WORD_DIM)),
+    ("function", slice(CHAR_DIM + WORD_DIM, CHAR_DIM + WORD_DIM + len(FUNCTION_WORDS))),
+    ("punctuation", slice(CHAR_DIM + WORD_DIM + len(FUNCTION_WORDS), VECTOR_SIZE)),
+)
+
+
+def post_texts(posts):
+    """
+    Text of collected posts: Signal objects of type "post" and dicts
+    from posts.analyze_posts ("content", or "value" for signal dicts).
+    """
+    texts = []
+    for p in posts:
+        if isinstance(p, Signal):
+            text = p.value if p.type == "post" else None
+        else:
+            text = p.get("content") if p.get("type", "post") == "post" else None
+            if text is None and p.get("signal_type") == "POST":
+                text = p.get("value")
+        if isinstance(text, str) and text.strip():
+            texts.append(text)
+    return texts
 
-def analyze_stylometry(signals: list[Signal]):
+
+def _bucket(hashes, dim):
+    # Murmur3 finalizer, then bucket and sign from different bits (signed feature hashing)
+    with np.errstate(over="ignore"):
+        h = hashes ^ (hashes >> _SHIFT)
+        h = h * _MIX
+        h = h ^ (h >> _SHIFT)
+    index = (h % np.uint64(dim)).astype(np.int64)
+    sign = np.where(h >> np.uint64(63), -1.0, 1.0)
+    return np.bincount(index, weights=sign, minlength=dim)
+
+
+def _char_hashes(codes):
+    parts = []
+    with np.errstate(over="ignore"):
+        for n in CHAR_NGRAMS:
+            count = len(codes) - n + 1
+            if count <= 0:
+                continue
+            h = np.full(count, n, dtype=np.uint64)
+            for k in range(n):
+                h = h * _PRIME + codes[k:k + count]
+            parts.append(h)
+    return np.concatenate(parts) if parts else np.zeros(0, dtype=np.uint64)
+
+
+def _word_hashes(words):
+    if not words:
+        return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.int64), []
+    vocabulary, inverse = np.unique(np.array(words), return_inverse=True)
+    vocabulary = vocabulary.tolist()
+    per_word = np.array([zlib.crc32(w.encode("utf-8")) for w in vocabulary], dtype=np.uint64)[inverse]
+    with np.errstate(over="ignore"):
+        bigrams = (per_word[:-1] * _PRIME + per_word[1:]) ^ _WORD_SALT
+    return np.concatenate((per_word, bigrams)), np.bincount(inverse, minlength=len(vocabulary)), vocabulary
+
+
+def style_features(texts):
     """
-    Basic textual fingerprinting from posts.
+    Raw feature blocks of a body of text.
+
+    Returns:
+        dict: "char", "word" (hashed counts), "function" (per word), "punctuation"
+            (per character) arrays, plus "chars", "words" and "vocabulary" counts
     """
-    word_counter = Counter()
-    for s in signals:
-        if s.type == "post":
-            words = re.findall(r"\w+", s.value.lower())
-            word_counter.update(words)
+    text = "\n".join(texts)
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    words = _WORD.findall(text.lower())
+    hashes, word_counts, vocabulary = _word_hashes(words)
+
+    function = np.zeros(len(FUNCTION_WORDS))
+    for word, count in zip(vocabulary, word_counts.tolist()):
+        i = _FUNCTION_INDEX.get(word)
+        if i is not None:
+            function[i] = count
+    ascii_codes = codes[codes < 128].astype(np.int64)
+    punctuation = np.bincount(ascii_codes, minlength=128)[_PUNCT_CODES].astype(np.float64)
+
     return {
-        "top_words": word_counter.most_common(20),
+        "char": _bucket(_char_hashes(codes.astype(np.uint64)), CHAR_DIM),
+        "word": _bucket(hashes, WORD_DIM),
+        "function": function / max(1, len(words)),
+        "punctuation": punctuation / max(1, len(codes)),
+        "chars": len(codes),
+        "words": len(words),
+        "vocabulary": len(vocabulary),
+    }
+
+
+def style_vector(features):
+    """Unit-length float32 vector of weighted, normalized feature blocks, or None without enough text."""
+    if features["chars"] < MIN_CHARS:
+        return None
+    vector = np.zeros(VECTOR_SIZE, dtype=np.float32)
+    for name, where in _BLOCKS:
+        block = features[name]
+        norm = np.linalg.norm(block)
+        if norm:
+            vector[where] = block / norm * np.sqrt(BLOCK_WEIGHTS[name])
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else None
+
+
+def analyze_stylometry(posts):
+    """
+    Textual fingerprint of posts.
+
+    Args:
+        posts (list): Signal objects of type "post" or dicts from posts.analyze_posts.
+
+    Returns:
+        dict: Word and punctuation habits, suitable for the report
+    """
+    texts = post_texts(posts)
+    features = style_features(texts)
+    words = [w for t in texts for w in _WORD.findall(t.lower())]
+    sentences = [s for t in texts for s in re.split(r"[.!?]+\s", t) if s.strip()]
+    function = sorted(zip(FUNCTION_WORDS, features["function"].tolist()), key=lambda x: -x[1])
+    return {
+        "posts": len(texts),
+        "chars": features["chars"],
+        "words": features["words"],
+        "top_words": Counter(words).most_common(20),
+        "function_words": [(w, round(f, 4)) for w, f in function[:20] if f],
+        "punctuation_per_1000_chars": {
+            p: round(f * 1000, 2) for p, f in zip(PUNCTUATION, features["punctuation"].tolist()) if f
+        },
+        "avg_word_length": round(sum(map(len, words)) / len(words), 2) if words else 0,
+        "avg_sentence_words": round(len(words) / len(sentences), 2) if sentences else 0,
+        "type_token_ratio": round(features["vocabulary"] / features["words"], 4) if features["words"] else 0,
+        "profiled": features["chars"] >= MIN_CHARS,
         "note": "Experimental; do not rely solely on this for identity."
     }
+
+
+class StyleIndex:
+    """
+    Persistent style vectors of audited accounts, one matrix row each.
+
+    Stored as .npz (usernames plus the matrix as float16). Rows are kept
+    in a buffer that grows by doubling, so adding accounts one by one in a
+    batch stays cheap.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.usernames = []
+        self._rows = {}
+        self._matrix = np.zeros((0, VECTOR_SIZE), dtype=np.float32)
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with np.load(path) as data:
+                if int(data["vector_size"]) == VECTOR_SIZE:
+                    self.usernames = data["usernames"].tolist()
+                    self._matrix = data["matrix"].astype(np.float32)
+                    self._rows = {u: i for i, u in enumerate(self.usernames)}
+
+    def __len__(self):
+        return len(self.usernames)
+
+    @property
+    def matrix(self):
+        return self._matrix[:len(self.usernames)]
+
+    def add(self, username, vector):
+        with self._lock:
+            row = self._rows.get(username)
+            if row is None:
+                row = len(self.usernames)
+                if row == len(self._matrix):
+                    grown = np.zeros((max(16, 2 * row), VECTOR_SIZE), dtype=np.float32)
+                    grown[:row] = self._matrix[:row]
+                    self._matrix = grown
+                self.usernames.append(username)
+                self._rows[username] = row
+            self._matrix[row] = vector
+
+    def similar(self, vector, k=TOP_MATCHES, min_similarity=MATCH_SIMILARITY, exclude=()):
+        """
+        Accounts whose style vector is closest to vector.
+
+        Returns:
+            list[(float, str)]: (similarity, username), most similar first
+        """
+        with self._lock:
+            scores = self.matrix @ vector
+            usernames = list(self.usernames)
+        for name in exclude:
+            row = self._rows.get(name)
+            if row is not None and row < len(scores):
+                scores[row] = -np.inf
+        top = np.argpartition(-scores, k)[:k] if len(scores) > k else np.arange(len(scores))
+        top = top[np.argsort(-scores[top])]
+        return [(float(scores[i]), usernames[i]) for i in top.tolist() if scores[i] >= min_similarity]
+
+    def pairs(self, min_similarity=MATCH_SIMILARITY, block=PAIR_BLOCK):
+        """
+        Every pair of accounts at least min_similarity alike, most similar first.
+
+        Compared block by block (block x N matrix products), so memory stays
+        at block * N scores however many accounts are indexed.
+
+        Returns:
+            list[(float, str, str)]
+        """
+        with self._lock:
+            matrix = self.matrix.copy()
+            usernames = list(self.usernames)
+        found = []
+        for start in range(0, len(matrix), block):
+            scores = matrix[start:start + block] @ matrix.T
+            rows, cols = np.nonzero(scores >= min_similarity)
+            upper = cols > rows + start
+            for r, c in zip(rows[upper].tolist(), cols[upper].tolist()):
+                found.append((float(scores[r, c]), usernames[start + r], usernames[c]))
+        found.sort(key=lambda p: -p[0])
+        return found
+
+    def save(self, path=None):
+        path = path or self.path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._lock:
+            usernames = np.array(self.usernames, dtype=str)
+            matrix = self.matrix.astype(np.float16)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, vector_size=VECTOR_SIZE, usernames=usernames, matrix=matrix)
+        os.replace(tmp_path, path)
+
+
+def match_styles(username, posts, index, collected_at=None, min_similarity=None):
+    """
+    Compare an account's posts against the index and add its style vector.
+
+    Args:
+        username (str): Account the posts belong to.
+        posts (list): As for analyze_stylometry.
+        index (StyleIndex): Earlier audits' style vectors.
+        collected_at (str, optional): Timestamp for the signals.
+        min_similarity (float, optional): Defaults to MATCH_SIMILARITY.
+
+    Returns:
+        list[dict]: SIMILAR_WRITING signals for other indexed accounts
+    """
+    min_similarity = MATCH_SIMILARITY if min_similarity is None else min_similarity
+    vector = style_vector(style_features(post_texts(posts)))
+    if vector is None:
+        return []
+    matches = [
+        {
+            "signal_type": "SIMILAR_WRITING",
+            "value": other,
+            "confidence": "MEDIUM" if score >= (1 + min_similarity) / 2 else "LOW",
+            "source": "Stylometry",
+            "collected_at": collected_at,
+            "meta": {"similarity": round(score, 4)},
+        }
+        for score, other in index.similar(vector, min_similarity=min_similarity, exclude=[username])
+    ]
+    index.add(username, vector)
+    return matches
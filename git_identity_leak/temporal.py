@@ -1,5 +1,5 @@
 from datetime import datetime
-from schemas import Signal
+from .schemas import Signal
 
 def analyze_temporal(signals: list[Signal]):
     """
@@ -0,0 +1,238 @@
+# git_identity_leak/variants.py
+"""
+Username variants for reuse probing.
+
+People rarely use exactly one handle. Variants are built from the
+collected USERNAME, NAME and EMAIL (local part) signals and yielded lazily
+in rank order: the handles themselves first, then separator changes
+(j.doe -> jdoe, j_doe), then handles derived from the name (jdoe, johnd,
+john.doe), then digit suffixes. probe_variants hands them to a
+ReuseScanner until a probe budget is spent, and a seen filter keeps any
+(site, handle) pair from being probed twice in a run or a batch.
+"""
+import hashlib
+import math
+import re
+import threading
+import unicodedata
+
+PROBE_BUDGET = 400          # probes spent on variants per audit
+MAX_VARIANTS = 50
+MIN_LENGTH, MAX_LENGTH = 2, 39
+SEPARATORS = ("", ".", "_", "-")
+DIGIT_SUFFIXES = ("1", "01", "123")
+BLOOM_CAPACITY = 1_000_000
+BLOOM_ERROR_RATE = 1e-4
+
+_VALID = re.compile(r"[a-z0-9](?:[a-z0-9._-]*[a-z0-9])?")
+_SPLIT = re.compile(r"[._\-\s]+")
+_TRAILING_DIGITS = re.compile(r"^(.*?[a-z])(\d+)$")
+
+
+def _ascii_fold(text):
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+
+
+def _clean(handle):
+    handle = _ascii_fold(handle).lower().strip()
+    if MIN_LENGTH <= len(handle) <= MAX_LENGTH and _VALID.fullmatch(handle):
+        return handle
+    return None
+
+
+def _name_parts(name):
+    return [p for p in re.split(r"[^a-z]+", _ascii_fold(name).lower()) if p]
+
+
+def _seeds(signals):
+    usernames, names, locals_ = [], [], []
+    for s in signals:
+        stype, value = s.get("signal_type"), s.get("value")
+        if not isinstance(value, str) or not value:
+            continue
+        if stype == "USERNAME":
+            usernames.append(value)
+        elif stype == "NAME":
+            names.append(value)
+        elif stype == "EMAIL" and "@" in value:
+            local = value.split("@", 1)[0].split("+", 1)[0]
+            # GitHub noreply addresses look like 12345+login@users.noreply.github.com
+            if value.endswith("users.noreply.github.com") and "+" in value.split("@", 1)[0]:
+                local = value.split("@", 1)[0].split("+", 1)[1]
+            locals_.append(local)
+    return usernames, names, locals_
+
+
+def _separator_variants(handle):
+    parts = [p for p in _SPLIT.split(handle) if p]
+    if len(parts) > 1:
+        for sep in SEPARATORS:
+            yield sep.join(parts)
+    match = _TRAILING_DIGITS.match(handle)
+    if match:
+        yield match.group(1)
+
+
+def _name_variants(parts):
+    if len(parts) < 2:
+        if parts:
+            yield parts[0]
+        return
+    first, last = parts[0], parts[-1]
+    for sep in SEPARATORS:
+        yield f"{first}{sep}{last}"
+        yield f"{first[0]}{sep}{last}"
+    yield f"{first}{last[0]}"
+    for sep in SEPARATORS:
+        yield f"{last}{sep}{first}"
+    yield f"{last}{first[0]}"
+
+
+def iter_variants(signals, limit=MAX_VARIANTS):
+    """
+    Yield (handle, rank, origin) tuples, best guesses first, without duplicates.
+
+    Rank 0 is a collected handle, 1 a separator change of one, 2 a handle
+    derived from a NAME and 3 a digit-suffixed form of a higher-ranked one.
+    Later tiers are only built when the earlier ones have been consumed.
+    """
+    usernames, names, locals_ = _seeds(signals)
+    seen = set()
+    ordered = []
+    count = 0
+    digits = {m.group(2) for h in usernames + locals_ for m in [_TRAILING_DIGITS.match(h.lower())] if m}
+
+    def tiers():
+        for h in usernames + locals_:
+            yield h, 0, "handle"
+        for h in usernames + locals_:
+            for v in _separator_variants(h.lower()):
+                yield v, 1, "separator"
+        for name in names:
+            for v in _name_variants(_name_parts(name)):
+                yield v, 2, "name"
+        # Digits the person already uses elsewhere first, then common ones
+        suffixes = sorted(digits) + [d for d in DIGIT_SUFFIXES if d not in digits]
+        for base in [h for h in ordered if not h[-1].isdigit()]:
+            for d in suffixes:
+                yield f"{base}{d}", 3, "suffix"
+
+    for handle, rank, origin in tiers():
+        handle = _clean(handle)
+        if handle is None or handle in seen:
+            continue
+        seen.add(handle)
+        ordered.append(handle)
+        yield handle, rank, origin
+        count += 1
+        if limit and count >= limit:
+            return
+
+
+class BloomFilter:
+    """
+    Fixed-size set membership with a false-positive rate of about
+    error_rate at capacity and no false negatives. A false positive only
+    means a pair is treated as already probed.
+    """
+
+    def __init__(self, capacity=BLOOM_CAPACITY, error_rate=BLOOM_ERROR_RATE):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_batch(cls, accounts, probes_per_account, error_rate=BLOOM_ERROR_RATE):
+        """Filter sized for accounts audits of up to probes_per_account pairs each."""
+        return cls(max(BLOOM_CAPACITY, accounts * probes_per_account), error_rate)
+
+    def empty_like(self):
+        """Empty filter with the same capacity and error rate."""
+        return type(self)(self.capacity, self.error_rate)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def __contains__(self, key):
+        return all(self._bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+    def add(self, key):
+        """Add key; returns True if it was not present before."""
+        positions = self._positions(key)
+        with self._lock:
+            new = False
+            for p in positions:
+                mask = 1 << (p & 7)
+                if not self._bits[p >> 3] & mask:
+                    self._bits[p >> 3] |= mask
+                    new = True
+            return new
+
+
+class SeenSet:
+    """Exact seen filter for a single run; same interface as BloomFilter."""
+
+    def __init__(self):
+        self._keys = set()
+        self._lock = threading.Lock()
+
+    def empty_like(self):
+        return type(self)()
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def add(self, key):
+        with self._lock:
+            if key in self._keys:
+                return False
+            self._keys.add(key)
+            return True
+
+
+def probe_variants(scanner, signals, budget=PROBE_BUDGET, exclude=()):
+    """
+    Probe ranked variants on the scanner's sites until budget probes are used.
+
+    Pairs already in the scanner's seen filter do not count against the
+    budget and are answered without a request. Handles in exclude (e.g.
+    the audited username, already checked) are skipped.
+
+    Returns:
+        list[dict]: Scanner results for found accounts, each with "variant"
+            {"rank", "origin"}; variants are reported with MEDIUM confidence.
+    """
+    from .reuse import probe_key, site_applies
+
+    exclude = {h.lower() for h in exclude}
+    seen = scanner.seen
+    pairs, ranks = [], {}
+    spent = 0
+    for handle, rank, origin in iter_variants(signals):
+        if handle in exclude:
+            continue
+        for site in scanner.sites:
+            if spent >= budget:
+                break
+            if not site_applies(site, handle):
+                continue
+            # Seen pairs cost nothing: the scanner answers them from memory
+            if seen is None or probe_key(site["name"], handle) not in seen:
+                spent += 1
+            pairs.append((site, handle))
+            ranks[handle] = {"rank": rank, "origin": origin}
+        if spent >= budget:
+            break
+
+    found = []
+    for result in scanner.check_pairs(pairs):
+        if result["found"]:
+            result["variant"] = ranks[result["username"]]
+            result["confidence"] = "MEDIUM"
+            found.append(result)
+    return found
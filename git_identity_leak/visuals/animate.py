@@ -1,8 +1,236 @@
-import imageio
+# git_identity_leak/visuals/animate.py
+"""
+Contribution timeline animation.
+
+Frames are built in memory from a ContributionCalendar: each frame is a
+window of the heatmap grid (a year by default) sliding forward a week at
+a time, with a bar along the bottom showing where the window sits in the
+whole history. Frames are palette indices, so GIFs are encoded one frame
+at a time straight to the file with Pillow's GIF helpers, without
+quantizing; other formats (.mp4, ...) go through imageio's streaming
+ffmpeg writer. Only the frames in flight are held in memory, however
+long the history is, and frames can be built on a thread pool while
+earlier ones are encoded.
+"""
 import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PIL import GifImagePlugin, Image
+
+from ..contributions import ContributionCalendar
+from .github_svg import COLORS, LEVELS
+
+WINDOW_WEEKS = 53
+STEP_WEEKS = 1
+CELL = 10                   # pixels
+GAP = 2
+BAR_HEIGHT = 4              # timeline position bar under the grid
+FRAME_DURATION = 150        # milliseconds per GIF frame
+FPS = 8                     # frames per second for video formats
+LOOP = 0                    # GIF repeats forever
+MACRO_BLOCK = 16            # video encoders want frame sizes in multiples of this
+BACKGROUND = "#ffffff"
+
+
+def _rgb(color):
+    return [int(color[i:i + 2], 16) for i in (1, 3, 5)]
+
+
+# Indices 0-4 are the contribution levels (0 also draws the bar track), then the background
+PALETTE = np.array([_rgb(c) for c in COLORS] + [_rgb(BACKGROUND)], dtype=np.uint8)
+BACKGROUND_INDEX = len(COLORS)
+BAR_INDEX = len(COLORS) - 1
+
+
+class TimelineFrames:
+    """
+    Frames of a sliding heatmap window over a contribution history.
+
+    Frame i shows weeks i * step ... i * step + window - 1 (the last frame
+    ends at the last week) as a (height, width) uint8 array of PALETTE
+    indices. Frames are built on access, so any number of them can be
+    produced in any order without keeping earlier ones.
+
+    Args:
+        days (ContributionCalendar or list[dict]): Calendar, or a
+            CONTRIBUTIONS_YEARLY_DATES value.
+        window (int): Weeks shown per frame.
+        step (int): Weeks the window moves between frames.
+        cell (int): Cell size in pixels.
+        gap (int): Space between cells in pixels.
+    """
+
+    def __init__(self, days, window=WINDOW_WEEKS, step=STEP_WEEKS, cell=CELL, gap=GAP):
+        if not isinstance(days, ContributionCalendar):
+            days = ContributionCalendar.from_days(days)
+        grid, _ = days.heatmap_grid()
+        self.levels = np.searchsorted(LEVELS, grid, side="right").astype(np.uint8)
+        self.weeks = self.levels.shape[1]
+        self.window = max(1, min(window, self.weeks))
+        self.step = max(1, step)
+
+        self._pitch = pitch = cell + gap
+        # Which pixels of a (row, pixel row, column, pixel column) cell block are
+        # cell rather than gap; broadcast against the window's levels per frame
+        inside = np.arange(pitch) < cell
+        self._cells = inside[None, :, None, None] & inside[None, None, None, :]
+        self.width = self.window * pitch
+        self.height = 7 * pitch + gap + BAR_HEIGHT
+
+    def __len__(self):
+        if not self.weeks:
+            return 0
+        return -(-(self.weeks - self.window) // self.step) + 1
+
+    def __getitem__(self, i):
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        first = min(i * self.step, self.weeks - self.window)
+        window = self.levels[:, first:first + self.window]
+
+        frame = np.full((self.height, self.width), BACKGROUND_INDEX, dtype=np.uint8)
+        cells = np.where(self._cells, window[:, None, :, None], np.uint8(BACKGROUND_INDEX))
+        frame[:7 * self._pitch] = cells.reshape(7 * self._pitch, self.width)
+        bar = frame[-BAR_HEIGHT:]
+        bar[:] = 0
+        bar[:, first * self.width // self.weeks:-(-(first + self.window) * self.width // self.weeks)] = BAR_INDEX
+        return frame
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+class GifStream:
+    """
+    Animated GIF written to path one frame at a time.
+
+    append() takes either an array of PALETTE indices, encoded as is
+    against the global palette, or any PIL image, which is quantized and
+    written with its own color table.
+    """
+
+    def __init__(self, path, duration=FRAME_DURATION, loop=LOOP):
+        self.path = path
+        self.duration = duration
+        self.loop = loop
+        self.count = 0
+        self._palette = PALETTE.tobytes()
+        self._file = open(path, "wb")
+
+    def append(self, frame):
+        if isinstance(frame, Image.Image):
+            im = frame.convert("RGB").quantize()
+            params = {"include_color_table": True}
+        else:
+            im = Image.fromarray(frame, "P")
+            im.putpalette(self._palette)
+            params = {}
+        if self.count == 0:
+            header, _ = GifImagePlugin.getheader(im, info={"loop": self.loop})
+            self._file.write(b"".join(header))
+        self._file.write(b"".join(GifImagePlugin.getdata(im, duration=self.duration, disposal=1, **params)))
+        self.count += 1
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._file.write(b";")
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class VideoStream:
+    """Video (.mp4, ...) written one frame at a time through imageio's ffmpeg writer."""
+
+    def __init__(self, path, fps=FPS):
+        import imageio
+
+        self.path = path
+        self.count = 0
+        self._writer = imageio.get_writer(path, mode="I", fps=fps, macro_block_size=MACRO_BLOCK)
+
+    def append(self, frame):
+        if isinstance(frame, Image.Image):
+            rgb = np.asarray(frame.convert("RGB"))
+        else:
+            # Pad with background rather than letting the encoder rescale
+            height, width = frame.shape
+            frame = np.pad(frame, ((0, -height % MACRO_BLOCK), (0, -width % MACRO_BLOCK)),
+                           constant_values=BACKGROUND_INDEX)
+            rgb = PALETTE[frame]
+        self._writer.append_data(rgb)
+        self.count += 1
+
+    def close(self):
+        self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_stream(path, duration=FRAME_DURATION, fps=FPS):
+    """GifStream for .gif paths, VideoStream for anything else."""
+    if path.lower().endswith(".gif"):
+        return GifStream(path, duration)
+    return VideoStream(path, fps)
+
+
+def _generate(frames, workers):
+    # Frames in order, at most 2 * workers built ahead of the writer
+    if not workers:
+        yield from frames
+        return
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="frames") as executor:
+        pending = deque()
+        for i in range(len(frames)):
+            pending.append(executor.submit(frames.__getitem__, i))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def animate_contributions(days, out="timeline.gif", window=WINDOW_WEEKS, step=STEP_WEEKS, workers=0,
+                          duration=FRAME_DURATION, fps=FPS):
+    """
+    Render a sliding contribution heatmap to an animation.
+
+    Args:
+        days (ContributionCalendar or list[dict]): Contribution history.
+        out (str): .gif, or a video path such as .mp4 (needs imageio-ffmpeg).
+        window (int): Weeks shown per frame.
+        step (int): Weeks the window moves between frames.
+        workers (int): Threads building frames ahead of the encoder; 0 builds them inline.
+        duration (int): Milliseconds per GIF frame.
+        fps (float): Frames per second for video.
+
+    Returns:
+        int: Number of frames written (0, and no file, for an empty history)
+    """
+    frames = TimelineFrames(days, window, step)
+    if not len(frames):
+        return 0
+    with open_stream(out, duration, fps) as stream:
+        for frame in _generate(frames, workers):
+            stream.append(frame)
+    return stream.count
+
 
-def animate(frames_dir, out="timeline.gif"):
-    images = []
-    for f in sorted(os.listdir(frames_dir)):
-        images.append(imageio.imread(os.path.join(frames_dir, f)))
-    imageio.mimsave(out, images, duration=0.15)
+def animate(frames_dir, out="timeline.gif", duration=FRAME_DURATION, fps=FPS):
+    """Animate the image files in frames_dir (in name order), reading one at a time."""
+    with open_stream(out, duration, fps) as stream:
+        for f in sorted(os.listdir(frames_dir)):
+            with Image.open(os.path.join(frames_dir, f)) as im:
+                stream.append(im)
+    return stream.count
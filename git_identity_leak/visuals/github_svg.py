@@ -1,34 +1,154 @@
+# git_identity_leak/visuals/github_svg.py
+"""
+Contribution calendar SVG rendering.
+
+render_svg goes from a ContributionCalendar's heatmap grid to an SVG
+string in one pass: cell levels are computed for the whole grid with
+NumPy, and each cell's markup is a cached "<rect x=.. y=.. class=" prefix
+joined with its level, so no per-cell formatting or DOM objects are
+involved. Colors live in one <style> block instead of on every cell.
+Paths ending in .svgz are written gzip-compressed.
+"""
+import gzip
+import os
+import re
+import threading
+from functools import lru_cache
+
+import numpy as np
+
+from ..contributions import ContributionCalendar
+
+CELL = 11
+GAP = 2
+LEFT = 28                   # room for weekday labels
+TOP = 15                    # room for month labels
+COLORS = ("#ebedf0", "#9be9a8", "#40c463", "#30a14e", "#216e39")
+LEVELS = (1, 5, 10, 20)     # lowest count of levels 1-4
+WEEKDAY_LABELS = ((1, "Mon"), (3, "Wed"), (5, "Fri"))
+SVGZ_LEVEL = 6
+
+_STYLE = (
+    "<style>text{font:9px sans-serif;fill:#767676}"
+    + "".join(f".l{i}{{fill:{c}}}" for i, c in enumerate(COLORS))
+    + "</style>"
+)
+_LEVEL_SUFFIXES = np.array([f'{i}"/>' for i in range(len(COLORS))], dtype=object)
+
+
+@lru_cache(maxsize=16)
+def _cell_prefixes(weeks, cell, gap):
+    # Column-major like the flattened grid: week 0 Sun..Sat, week 1 Sun..Sat, ...
+    step = cell + gap
+    return np.array(
+        [
+            f'<rect x="{LEFT + w * step}" y="{TOP + d * step}" width="{cell}" height="{cell}" class="l'
+            for w in range(weeks) for d in range(7)
+        ],
+        dtype=object,
+    )
+
+
+def _calendar(days):
+    if isinstance(days, ContributionCalendar):
+        return days
+    return ContributionCalendar.from_days(days)
+
+
+def render_svg(days, cell=CELL, gap=GAP, labels=True):
+    """
+    Render a contribution calendar as an SVG document.
+
+    Args:
+        days (ContributionCalendar or list[dict]): Calendar, or a
+            CONTRIBUTIONS_YEARLY_DATES value ([{"date", "count"}, ...]).
+        cell (int): Cell size in pixels.
+        gap (int): Space between cells in pixels.
+        labels (bool): Draw month and weekday labels.
+
+    Returns:
+        str: SVG markup
+    """
+    days = _calendar(days)
+    grid, _ = days.heatmap_grid()
+    weeks = grid.shape[1]
+    step = cell + gap
+    width, height = LEFT + weeks * step, TOP + 7 * step
+
+    cells = ""
+    if weeks:
+        flat = grid.T.ravel()
+        levels = np.searchsorted(LEVELS, flat, side="right")
+        # Padding before the first and after the last day is left blank, as on GitHub
+        valid = slice(days.lead, days.lead + len(days))
+        cells = "".join((_cell_prefixes(weeks, cell, gap)[valid] + _LEVEL_SUFFIXES[levels[valid]]).tolist())
+
+    text = ""
+    if labels:
+        text = "".join(
+            f'<text x="0" y="{TOP + row * step + cell - 2}">{label}</text>' for row, label in WEEKDAY_LABELS
+        ) + "".join(
+            f'<text x="{LEFT + col * step}" y="{TOP - 4}">{month}</text>' for col, month in days.month_ticks()
+        )
+
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}">{_STYLE}{text}{cells}</svg>'
+    )
+
+
+def save_svg(svg, path):
+    """Write SVG markup to path, gzip-compressed when it ends in .svgz."""
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    data = svg.encode("utf-8")
+    if path.endswith(".svgz"):
+        data = gzip.compress(data, compresslevel=SVGZ_LEVEL, mtime=0)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return path
+
+
+def render_batch(calendars, out_dir=None, compress=False, **render_kwargs):
+    """
+    Render many calendars.
+
+    Args:
+        calendars (iterable): (name, days) pairs, days as accepted by render_svg.
+        out_dir (str, optional): Write each calendar to out_dir/<name>.svg
+            (.svgz with compress) instead of returning the markup.
+        compress (bool): gzip the files written to out_dir.
+        **render_kwargs: Passed on to render_svg.
+
+    Yields:
+        (name, svg) pairs, or (name, path) pairs when out_dir is given
+    """
+    ext = ".svgz" if compress else ".svg"
+    for name, days in calendars:
+        svg = render_svg(days, **render_kwargs)
+        if out_dir is None:
+            yield name, svg
+        else:
+            yield name, save_svg(svg, os.path.join(out_dir, f"{name}{ext}"))
+
+
+def save_calendar_svg(username, signals, out_dir, compress=False):
+    """
+    Render the CONTRIBUTIONS_YEARLY_DATES signal of one audit to
+    out_dir/<username>.svg (.svgz with compress).
+
+    Returns:
+        str: Path written, or None if the signals have no contribution calendar
+    """
+    days = ContributionCalendar.from_signals(signals)
+    if days is None:
+        return None
+    name = re.sub(r"[^A-Za-z0-9_.-]", "_", username) or "_"
+    return save_svg(render_svg(days), os.path.join(out_dir, f"{name}{'.svgz' if compress else '.svg'}"))
+
+
 def generate_github_svg(days, out="contributions.svg"):
-    CELL = 11
-    GAP = 2
-
-    weeks = {}
-    for d in days:
-        week = d["date"][:7]
-        weeks.setdefault(week, []).append(d)
-
-    def color(c):
-        if c == 0: return "#ebedf0"
-        if c < 5: return "#9be9a8"
-        if c < 10: return "#40c463"
-        if c < 20: return "#30a14e"
-        return "#216e39"
-
-    width = len(weeks) * (CELL + GAP)
-    height = 7 * (CELL + GAP)
-
-    svg = [f'<svg width="{width}" height="{height}" xmlns="http://www.w3.org/2000/svg">']
-
-    x = 0
-    for week in weeks.values():
-        for d in week:
-            y = datetime.strptime(d["date"], "%Y-%m-%d").weekday()
-            svg.append(
-                f'<rect x="{x}" y="{y*(CELL+GAP)}" width="{CELL}" height="{CELL}" fill="{color(d["count"])}"/>'
-            )
-        x += CELL + GAP
-
-    svg.append("</svg>")
-
-    with open(out, "w") as f:
-        f.write("\n".join(svg))
+    """Render a CONTRIBUTIONS_YEARLY_DATES value to out (.svg or .svgz)."""
+    return save_svg(render_svg(days), out)
@@ -0,0 +1,40 @@
+# tests/test_import_time.py
+"""
+Startup cost of the CLI: importing it must stay under a time budget and
+must not pull in heavy or network dependencies, or any plugin module.
+"""
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+IMPORT_BUDGET = 0.5         # seconds, best of REPEAT fresh interpreters
+REPEAT = 3
+LAZY_MODULES = ("numpy", "PIL", "requests", "networkx", "matplotlib", "seaborn", "imageio", "bs4")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import git_identity_leak.cli
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def _import_cli():
+    out = subprocess.run([sys.executable, "-c", PROBE], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+def test_cli_import_is_within_budget():
+    best = min(_import_cli()["elapsed"] for _ in range(REPEAT))
+    assert best < IMPORT_BUDGET, f"importing the CLI took {best:.3f}s (budget {IMPORT_BUDGET}s)"
+
+
+def test_cli_import_is_lazy():
+    modules = set(_import_cli()["modules"])
+    loaded = [m for m in LAZY_MODULES if m in modules]
+    plugins = [m for m in modules if m.startswith("git_identity_leak.plugins.")]
+    assert not loaded, f"imported at startup: {loaded}"
+    assert not plugins, f"plugins imported at startup: {plugins}"
@@ -0,0 +1,76 @@
+# tests/test_incremental.py
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+from git_identity_leak import plugins
+from git_identity_leak.analysis import incremental_analysis
+from git_identity_leak.snapshots import SnapshotStore
+
+PLUGIN_TIMEOUT = 0.2
+
+
+def _signal(signal_type, value, source):
+    return {"signal_type": signal_type, "value": value, "confidence": "HIGH", "source": source,
+            "collected_at": "2025-01-01T00:00:00Z"}
+
+
+@pytest.fixture
+def fake_plugins(monkeypatch):
+    """A fake "github" plugin whose behavior the test switches, and a healthy "other" plugin."""
+    mode = {"github": "ok"}
+    straggler_done = threading.Event()
+
+    def collect_github(username, state=None):
+        if mode["github"] == "error":
+            raise RuntimeError("API down")
+        if mode["github"] == "timeout":
+            time.sleep(PLUGIN_TIMEOUT * 3)
+            # Keeps writing to its state after being abandoned
+            state["since"] = "straggler"
+            straggler_done.set()
+            return [_signal("NAME", "Late Result", "GitHub GraphQL")]
+        state["since"] = "2025-01-01"
+        return [_signal("NAME", "Jane Doe", "GitHub GraphQL"), _signal("EMAIL", "jane@example.com", "GitHub GraphQL")]
+
+    github = types.ModuleType("fake_github_plugin")
+    github.collect = collect_github
+    other = types.ModuleType("fake_other_plugin")
+    other.collect = lambda username: [_signal("PROFILE_PLATFORM", "Reddit", "Reddit")]
+    for name, module in (("github", github), ("other", other)):
+        monkeypatch.setitem(sys.modules, module.__name__, module)
+        monkeypatch.setitem(plugins.PLUGIN_REGISTRY, name, module.__name__)
+        monkeypatch.setitem(plugins._loaded, name, module)
+        monkeypatch.setitem(plugins._names, module.__name__, name)
+    return mode, straggler_done
+
+
+def _audit(store):
+    return incremental_analysis("jane", store, plugin_names=["github", "other"],
+                                plugin_timeout=PLUGIN_TIMEOUT, global_timeout=5)
+
+
+@pytest.mark.parametrize("failure", ["timeout", "error"])
+def test_failed_plugin_is_not_reported_as_removed(tmp_path, fake_plugins, failure):
+    mode, straggler_done = fake_plugins
+    store = SnapshotStore(str(tmp_path))
+
+    _, _, _, delta = _audit(store)
+    assert len(delta["added"]) == 3 and not delta["removed"]
+    assert store.load("jane", "github") == {"since": "2025-01-01"}
+
+    mode["github"] = failure
+    signals, _, _, delta = _audit(store)
+    assert delta == {"added": [], "removed": []}
+    assert any(s["signal_type"] in plugins.FAILURE_SIGNAL_TYPES for s in signals)
+    if failure == "timeout":
+        assert straggler_done.wait(5)
+    # The abandoned or failed plugin's state is not saved
+    assert store.load("jane", "github") == {"since": "2025-01-01"}
+
+    mode["github"] = "ok"
+    _, _, _, delta = _audit(store)
+    assert delta == {"added": [], "removed": []}